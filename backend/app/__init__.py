@@ -4,9 +4,10 @@ SubOS Backend Application Factory
 from flask import Flask
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from app.utils.database import RoutingSession
 
-# Initialize SQLAlchemy
-db = SQLAlchemy()
+# Initialize SQLAlchemy (reads from @read_only endpoints may use the reader pool)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Initialize Notification Scheduler (will be set up after app creation)
 notification_scheduler = None
@@ -27,19 +28,67 @@ def create_app(config_name='default'):
     # Create Flask app
     app = Flask(__name__)
 
+    # Let upload endpoints spool files where they will be stored
+    from app.utils.uploads import StreamingRequest
+    app.request_class = StreamingRequest
+
     # Load configuration
     app.config.from_object(config[config_name])
 
+    # Select JSON provider (orjson when available)
+    from app.utils.serialization import get_json_provider
+    app.json = get_json_provider(app.config.get('JSON_PROVIDER'))(app)
+
     # Initialize extensions
+    from app.utils.database import configure_sqlite_engine, create_read_engine, get_engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = get_engine_options(app.config)
     db.init_app(app)
 
+    # Bump per-user data versions on writes (drives ETags)
+    from app.utils.data_version import register_data_version_events
+    register_data_version_events(RoutingSession)
+
+    # Record subscription price changes (price history for insights)
+    from app.utils.price_history import register_price_history_events
+    register_price_history_events(RoutingSession)
+
+    # Log subscription, currency and budget changes (drives incremental batch jobs)
+    from app.utils.change_feed import register_change_feed_events
+    register_change_feed_events(RoutingSession)
+
+    # Apply SQLite connection pragmas (WAL, busy timeout, mmap, cache)
+    # and set up the read-only connection pool
+    with app.app_context():
+        configure_sqlite_engine(db.engine, app.config)
+        create_read_engine(app, db.engine)
+
+    # Size auth caches from config
+    from app.services.auth_service import AuthService
+    AuthService.init_cache(app.config)
+
+    # Configure password hashing pool
+    from app.services.password_hasher import password_hasher
+    password_hasher.init_app(app)
+
+    # Configure token revocation denylist
+    from app.services.session_manager import token_denylist
+    token_denylist.init_app(app)
+
+    # Configure receipt OCR worker pool
+    from app.services.receipts import ocr_pool
+    ocr_pool.init_app(app)
+
+    # Configure AI recommendation worker pool
+    from app.services.recommendations import recommendation_service
+    recommendation_service.init_app(app)
+
     # Configure CORS
     CORS(app,
          supports_credentials=True,
          origins=app.config['CORS_ORIGINS'])
 
     # Initialize notification scheduler (only in production/development, not testing)
-    if config_name != 'testing':
+    if config_name != 'testing' and app.config.get('SCHEDULER_ENABLED', True):
         from app.services.notification_scheduler import NotificationScheduler
         global notification_scheduler
         notification_scheduler = NotificationScheduler(app)
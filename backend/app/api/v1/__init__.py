@@ -17,6 +17,10 @@ from app.api.v1.payment_methods import payment_methods_bp
 from app.api.v1.currencies import currencies_bp
 from app.api.v1.statistics import statistics_bp
 from app.api.v1.calendar import calendar_bp
+from app.api.v1.export import export_bp
+from app.api.v1.dashboard import dashboard_bp
+from app.api.v1.ocr import ocr_bp
+from app.api.v1.insights import insights_bp
 
 api_v1.register_blueprint(auth_bp, url_prefix='/auth')
 api_v1.register_blueprint(subscriptions_bp, url_prefix='/subscriptions')
@@ -28,6 +32,10 @@ api_v1.register_blueprint(payment_methods_bp, url_prefix='/payment-methods')
 api_v1.register_blueprint(currencies_bp, url_prefix='/currencies')
 api_v1.register_blueprint(statistics_bp, url_prefix='/statistics')
 api_v1.register_blueprint(calendar_bp, url_prefix='/calendar')
+api_v1.register_blueprint(export_bp, url_prefix='/export')
+api_v1.register_blueprint(dashboard_bp, url_prefix='/dashboard')
+api_v1.register_blueprint(ocr_bp, url_prefix='/ocr')
+api_v1.register_blueprint(insights_bp, url_prefix='/insights')
 
 
 @api_v1.route('/status')
@@ -47,6 +55,10 @@ def status():
             'payment_methods': '/api/v1/payment-methods',
             'currencies': '/api/v1/currencies',
             'statistics': '/api/v1/statistics',
-            'calendar': '/api/v1/calendar'
+            'calendar': '/api/v1/calendar',
+            'export': '/api/v1/export/*',
+            'dashboard': '/api/v1/dashboard',
+            'ocr': '/api/v1/ocr/*',
+            'insights': '/api/v1/insights'
         }
     }, 200
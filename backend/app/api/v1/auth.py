@@ -6,12 +6,25 @@ from app import db
 from app.models.user import User
 from app.models.currency import Currency
 from app.services.auth_service import AuthService
+from app.services.password_hasher import password_hasher, HasherBusyError
+from app.services.session_manager import SessionManager
 from app.utils.validators import validate_email, validate_password, validate_username
 from app.utils.decorators import require_auth
 
 auth_bp = Blueprint('auth', __name__)
 
 
+@auth_bp.errorhandler(HasherBusyError)
+def hasher_busy(error):
+    """Reject requests while the password hashing pool is saturated"""
+    response = jsonify({
+        'status': 'error',
+        'message': 'Server busy, please retry shortly'
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """
@@ -65,11 +78,15 @@ def register():
     if db.session.query(User).filter_by(email=email).first():
         return jsonify({'status': 'error', 'message': 'Email already registered'}), 409
 
+    # Don't hold a database connection while waiting on the hashing pool
+    db.session.commit()
+    password_hash = password_hasher.hash(password)
+
     # Create user
     user = User(
         username=username,
         email=email,
-        password=AuthService.hash_password(password),
+        password=password_hash,
         firstname=firstname
     )
 
@@ -121,27 +138,55 @@ def login():
     if not username or not password:
         return jsonify({'status': 'error', 'message': 'Username and password are required'}), 400
 
-    # Find user
+    # Find user, then release the database connection before hashing
     user = db.session.query(User).filter_by(username=username).first()
+    if user:
+        user_id, password_hash = user.id, user.password
+        totp_enabled, totp_secret = user.totp_enabled, user.totp_secret
+    db.session.commit()
 
-    if not user or not AuthService.verify_password(password, user.password):
+    if not user or not password_hasher.verify(password, password_hash):
         return jsonify({'status': 'error', 'message': 'Invalid credentials'}), 401
 
     # Check 2FA if enabled
-    if user.totp_enabled:
+    if totp_enabled:
         totp_code = data.get('totp_code', '').strip()
 
         if not totp_code:
             return jsonify({'status': 'error', 'message': '2FA code required'}), 401
 
-        if not AuthService.verify_totp(user.totp_secret, totp_code):
+        if not AuthService.verify_totp(totp_secret, totp_code):
             return jsonify({'status': 'error', 'message': 'Invalid 2FA code'}), 401
 
-    # Generate JWT token
+    # Transparently upgrade hashes made with a different cost factor
+    new_hash = None
+    if password_hasher.needs_rehash(password_hash):
+        try:
+            new_hash = password_hasher.hash(password)
+        except HasherBusyError:
+            pass
+
+    user = db.session.get(User, user_id)
+    if new_hash:
+        user.password = new_hash
+
+    # Generate JWT token and record the session for revocation
+    expires_in = current_app.config['PERMANENT_SESSION_LIFETIME']
+    jti = SessionManager.new_jti()
+    SessionManager.create_session(
+        user.id,
+        jti,
+        expires_in,
+        user_agent=request.headers.get('User-Agent'),
+        ip_address=request.remote_addr
+    )
+    db.session.commit()
+
     token = AuthService.generate_token(
         user.id,
         current_app.config['SECRET_KEY'],
-        current_app.config['PERMANENT_SESSION_LIFETIME']
+        expires_in,
+        jti=jti
     )
 
     return jsonify({
@@ -155,8 +200,15 @@ def login():
 @require_auth
 def logout():
     """
-    Logout user (client should delete token)
+    Logout user (revokes the current token)
     """
+    from flask import g
+
+    if g.token_jti:
+        SessionManager.revoke_jti(g.token_jti)
+    AuthService.invalidate_token(g.token)
+    AuthService.user_cache.pop(g.user_id)
+
     return jsonify({
         'status': 'success',
         'message': 'Logged out successfully'
@@ -175,6 +227,120 @@ def get_current_user():
     }), 200
 
 
+@auth_bp.route('/sessions', methods=['GET'])
+@require_auth
+def list_sessions():
+    """List active sessions for current user"""
+    from flask import g
+
+    sessions = SessionManager.list_sessions(g.user_id)
+
+    data = []
+    for session in sessions:
+        item = session.to_dict()
+        item['current'] = session.jti == g.token_jti
+        data.append(item)
+
+    return jsonify({
+        'status': 'success',
+        'data': data,
+        'total': len(data)
+    }), 200
+
+
+@auth_bp.route('/sessions/<int:session_id>', methods=['DELETE'])
+@require_auth
+def revoke_session(session_id):
+    """Revoke one of the current user's sessions"""
+    from flask import g
+    from app.models.session import UserSession
+
+    session = db.session.query(UserSession).filter_by(
+        id=session_id,
+        user_id=g.user_id
+    ).first()
+
+    if not session:
+        return jsonify({'status': 'error', 'message': 'Session not found'}), 404
+
+    SessionManager.revoke_jti(session.jti)
+    AuthService.invalidate_user(g.user_id)
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Session revoked successfully'
+    }), 200
+
+
+@auth_bp.route('/sessions', methods=['DELETE'])
+@require_auth
+def revoke_other_sessions():
+    """Revoke all sessions except the current one"""
+    from flask import g
+
+    count = SessionManager.revoke_user_sessions(g.user_id, except_jti=g.token_jti)
+    AuthService.invalidate_user(g.user_id)
+
+    return jsonify({
+        'status': 'success',
+        'revoked': count,
+        'message': f'Revoked {count} session(s)'
+    }), 200
+
+
+@auth_bp.route('/change-password', methods=['POST'])
+@require_auth
+def change_password():
+    """
+    Change password for current user
+
+    Request body:
+    {
+        "current_password": "string",
+        "new_password": "string"
+    }
+    """
+    from flask import g
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'status': 'error', 'message': 'No data provided'}), 400
+
+    current_password = data.get('current_password', '')
+    new_password = data.get('new_password', '')
+
+    if not current_password or not new_password:
+        return jsonify({'status': 'error', 'message': 'Current and new password required'}), 400
+
+    # Release the database connection before hashing
+    password_hash = g.user.password
+    db.session.commit()
+
+    if not password_hasher.verify(current_password, password_hash):
+        return jsonify({'status': 'error', 'message': 'Invalid password'}), 401
+
+    if not validate_password(new_password):
+        return jsonify({
+            'status': 'error',
+            'message': 'Password must be at least 8 characters with uppercase, lowercase, and number'
+        }), 400
+
+    new_hash = password_hasher.hash(new_password)
+
+    user = db.session.get(User, g.user_id)
+    user.password = new_hash
+    db.session.commit()
+
+    # Sign out every other session
+    SessionManager.revoke_user_sessions(user.id, except_jti=g.token_jti)
+    AuthService.invalidate_user(user.id)
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Password changed successfully'
+    }), 200
+
+
 @auth_bp.route('/setup-2fa', methods=['POST'])
 @require_auth
 def setup_2fa():
@@ -202,6 +368,7 @@ def setup_2fa():
     # Save secret (not enabled yet)
     user.totp_secret = secret
     db.session.commit()
+    AuthService.invalidate_user(user.id)
 
     return jsonify({
         'status': 'success',
@@ -245,6 +412,8 @@ def verify_2fa():
     # Enable 2FA
     user.totp_enabled = True
     db.session.commit()
+    SessionManager.revoke_user_sessions(user.id, except_jti=g.token_jti)
+    AuthService.invalidate_user(user.id)
 
     return jsonify({
         'status': 'success',
@@ -278,10 +447,14 @@ def disable_2fa():
     if not password or not code:
         return jsonify({'status': 'error', 'message': 'Password and code required'}), 400
 
-    # Verify password
-    if not AuthService.verify_password(password, user.password):
+    # Verify password (without holding a database connection)
+    password_hash = user.password
+    db.session.commit()
+    if not password_hasher.verify(password, password_hash):
         return jsonify({'status': 'error', 'message': 'Invalid password'}), 401
 
+    user = db.session.get(User, g.user_id)
+
     # Verify code
     if not AuthService.verify_totp(user.totp_secret, code):
         return jsonify({'status': 'error', 'message': 'Invalid code'}), 401
@@ -290,6 +463,8 @@ def disable_2fa():
     user.totp_enabled = False
     user.totp_secret = None
     db.session.commit()
+    SessionManager.revoke_user_sessions(user.id, except_jti=g.token_jti)
+    AuthService.invalidate_user(user.id)
 
     return jsonify({
         'status': 'success',
@@ -4,14 +4,18 @@ Budget API Endpoints
 from flask import Blueprint, request, jsonify, g
 from app import db
 from app.models.user import User
+from app.services.auth_service import AuthService
 from app.services.budget_analyzer import BudgetAnalyzer
-from app.utils.decorators import require_auth
+from app.services.insights import SpendingForecast
+from app.utils.decorators import require_auth, read_only, etag
 
 budget_bp = Blueprint('budget', __name__)
 
 
 @budget_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_budget():
     """
     Get budget status for current user
@@ -57,6 +61,7 @@ def update_budget():
     user = db.session.get(User, g.user_id)
     user.budget = budget
     db.session.commit()
+    AuthService.user_cache.pop(g.user_id)
 
     # Return updated budget status
     budget_status = BudgetAnalyzer.get_budget_status(g.user_id)
@@ -69,7 +74,9 @@ def update_budget():
 
 
 @budget_bp.route('/breakdown', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_breakdown():
     """
     Get spending breakdown by category
@@ -90,7 +97,9 @@ def get_breakdown():
 
 
 @budget_bp.route('/upcoming', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_upcoming():
     """
     Get upcoming payments
@@ -110,3 +119,42 @@ def get_upcoming():
         'data': upcoming,
         'count': len(upcoming)
     }), 200
+
+
+@budget_bp.route('/forecast', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def get_forecast():
+    """
+    Get month-by-month spending forecast
+
+    Payments are projected from each subscription's next payment date and
+    billing cycle, stop at known cancellation dates and follow the user's
+    historical price changes. Amounts are in the user's main currency.
+
+    Query parameters:
+    - months: Number of calendar months, starting with the current one (default: 12, max: 24)
+
+    Returns:
+    {
+        "months": [{"month": "2024-03", "expected": 85.97, "low": 85.10, "high": 86.90,
+                    "baseline": 85.50, "payments": 6}, ...],
+        "total": {...},
+        "assumptions": {"confidence": 0.8, "annual_price_drift_pct": 2.1, ...}
+    }
+    """
+    months = request.args.get('months', SpendingForecast.DEFAULT_MONTHS, type=int)
+
+    if months < 1 or months > SpendingForecast.MAX_MONTHS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Months must be between 1 and {SpendingForecast.MAX_MONTHS}'
+        }), 400
+
+    forecast = SpendingForecast.for_user(g.user_id, months)
+
+    return jsonify({
+        'status': 'success',
+        'data': forecast
+    }), 200
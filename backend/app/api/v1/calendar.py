@@ -6,13 +6,15 @@ from datetime import datetime, timedelta
 from calendar import monthrange
 from app import db
 from app.models.subscription import Subscription
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
 
 calendar_bp = Blueprint('calendar', __name__)
 
 
 @calendar_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_calendar():
     """
     Get calendar view of subscription payments
@@ -96,7 +98,9 @@ def get_calendar():
 
 
 @calendar_bp.route('/upcoming', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_upcoming():
     """
     Get upcoming payments in next N days
@@ -146,7 +150,9 @@ def get_upcoming():
 
 
 @calendar_bp.route('/year-view', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_year_view():
     """
     Get year view with monthly totals
@@ -4,13 +4,15 @@ Category API Endpoints
 from flask import Blueprint, request, jsonify, g
 from app import db
 from app.models.category import Category
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
 
 categories_bp = Blueprint('categories', __name__)
 
 
 @categories_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def list_categories():
     """
     List all categories for current user
@@ -42,7 +44,9 @@ def list_categories():
 
 
 @categories_bp.route('/<int:category_id>', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_category(category_id):
     """Get category by ID"""
     category = db.session.query(Category).filter_by(
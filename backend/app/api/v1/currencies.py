@@ -2,17 +2,21 @@
 Currency API Endpoints
 """
 from flask import Blueprint, request, jsonify, g
+from datetime import datetime
 from app import db
 from app.models.currency import Currency
+from app.models.exchange_rate import ExchangeRate
 from app.models.user import User
 from app.services.currency_converter import CurrencyConverter
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, require_admin, read_only, etag
 
 currencies_bp = Blueprint('currencies', __name__)
 
 
 @currencies_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def list_currencies():
     """
     List all currencies for current user
@@ -59,7 +63,9 @@ def get_supported_currencies():
 
 
 @currencies_bp.route('/<int:currency_id>', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_currency(currency_id):
     """Get currency by ID"""
     currency = db.session.query(Currency).filter_by(
@@ -237,7 +243,8 @@ def convert_currency():
     {
         "amount": 100,
         "from_currency_id": 1,
-        "to_currency_id": 2
+        "to_currency_id": 2,
+        "date": "2025-01-15" (optional, convert at historical rates)
     }
     """
     data = request.get_json()
@@ -251,12 +258,20 @@ def convert_currency():
         if field not in data:
             return jsonify({'status': 'error', 'message': f'Missing required field: {field}'}), 400
 
+    at = None
+    if data.get('date'):
+        try:
+            at = datetime.strptime(data['date'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'status': 'error', 'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
     try:
         amount = float(data['amount'])
         converted = CurrencyConverter.convert(
             amount,
             data['from_currency_id'],
-            data['to_currency_id']
+            data['to_currency_id'],
+            at=at
         )
 
         from_currency = db.session.get(Currency, data['from_currency_id'])
@@ -268,7 +283,8 @@ def convert_currency():
                 'original_amount': amount,
                 'converted_amount': round(converted, 2),
                 'from_currency': from_currency.to_dict() if from_currency else None,
-                'to_currency': to_currency.to_dict() if to_currency else None
+                'to_currency': to_currency.to_dict() if to_currency else None,
+                'date': at.isoformat() if at else None
             }
         }), 200
 
@@ -276,3 +292,77 @@ def convert_currency():
         return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'Conversion failed: {str(e)}'}), 500
+
+
+@currencies_bp.route('/history/<code>', methods=['GET'])
+@read_only
+@require_auth
+def get_rate_history(code):
+    """
+    Get daily exchange rate history for a currency code
+
+    Query parameters:
+    - start: Start date (YYYY-MM-DD, optional)
+    - end: End date (YYYY-MM-DD, optional)
+    """
+    query = db.session.query(ExchangeRate).filter_by(code=code.upper())
+
+    try:
+        if request.args.get('start'):
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+            query = query.filter(ExchangeRate.date >= start)
+        if request.args.get('end'):
+            end = datetime.strptime(request.args['end'], '%Y-%m-%d').date()
+            query = query.filter(ExchangeRate.date <= end)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+    rates = query.order_by(ExchangeRate.date).all()
+
+    return jsonify({
+        'status': 'success',
+        'data': [rate.to_dict() for rate in rates],
+        'total': len(rates)
+    }), 200
+
+
+@currencies_bp.route('/history/import', methods=['POST'])
+@require_auth
+@require_admin
+def import_rate_history():
+    """
+    Bulk import historical exchange rates (admin only)
+
+    Request body:
+    {
+        "source": "ecb" (optional),
+        "rates": [
+            {"code": "EUR", "date": "2025-01-15", "rate": 0.97},
+            ...
+        ]
+    }
+
+    Rates are relative to USD base. Existing rows for the same
+    code and date are overwritten.
+    """
+    data = request.get_json()
+
+    if not data or not isinstance(data.get('rates'), list):
+        return jsonify({'status': 'error', 'message': 'rates list is required'}), 400
+
+    if not isinstance(data.get('source', 'import'), str):
+        return jsonify({'status': 'error', 'message': 'source must be a string'}), 400
+
+    try:
+        count = CurrencyConverter.import_rate_history(
+            data['rates'],
+            source=data.get('source', 'import')
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    return jsonify({
+        'status': 'success',
+        'imported': count,
+        'message': f'Imported {count} exchange rate(s)'
+    }), 200
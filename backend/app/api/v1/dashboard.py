@@ -0,0 +1,49 @@
+"""
+Dashboard API Endpoints
+"""
+from flask import Blueprint, request, jsonify, g
+from app.services.dashboard_service import DashboardService
+from app.utils.decorators import require_auth, read_only, etag
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+
+@dashboard_bp.route('', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def get_dashboard():
+    """
+    Get dashboard widgets in one request
+
+    Query parameters:
+    - include: Comma-separated widgets (default: all)
+      overview, by-category, by-payment-method, by-payer, settlement,
+      upcoming, most-expensive, budget
+    - days: Look-ahead for upcoming renewals (default: 30)
+    - limit: Number of most expensive subscriptions (default: 5)
+
+    Each widget has the same shape as its /statistics/* or /budget counterpart
+    """
+    try:
+        include = DashboardService.parse_include(request.args.get('include', ''))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    days = request.args.get('days', 30, type=int)
+    if days < 1 or days > DashboardService.MAX_UPCOMING_DAYS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Days must be between 1 and {DashboardService.MAX_UPCOMING_DAYS}'
+        }), 400
+
+    limit = request.args.get('limit', 5, type=int)
+    if limit < 1 or limit > DashboardService.MAX_LIMIT:
+        return jsonify({'status': 'error', 'message': f'Limit must be between 1 and {DashboardService.MAX_LIMIT}'}), 400
+
+    data = DashboardService.build(g.user_id, include, upcoming_days=days, limit=limit)
+
+    return jsonify({
+        'status': 'success',
+        'data': data
+    }), 200
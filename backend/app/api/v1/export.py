@@ -0,0 +1,100 @@
+"""
+Export API Endpoints
+"""
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, g, stream_with_context
+from app.services.data_exporter import DataExporter
+from app.utils.decorators import require_auth, read_only
+
+export_bp = Blueprint('export', __name__)
+
+
+def _stream_export(name: str, columns: list, rows):
+    """
+    Build a streaming download response
+
+    Query parameters:
+    - format: csv, ndjson or json (default: csv)
+    - gzip: Compress the response (true/false, default: false)
+    """
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in DataExporter.FORMATS:
+        return jsonify({'status': 'error', 'message': "Invalid format. Use 'csv', 'ndjson' or 'json'"}), 400
+
+    compress = request.args.get('gzip', 'false').lower() == 'true'
+
+    chunks = DataExporter.encode(fmt, columns, rows)
+    if compress:
+        chunks = DataExporter.gzip_stream(chunks)
+
+    filename = f"subos-{name}-{datetime.now().strftime('%Y%m%d')}.{fmt}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=DataExporter.FORMATS[fmt],
+        headers=headers
+    )
+
+
+@export_bp.route('/subscriptions', methods=['GET'])
+@read_only
+@require_auth
+def export_subscriptions():
+    """
+    Export all subscriptions
+
+    Query parameters:
+    - format: csv, ndjson or json (default: csv)
+    - inactive: Include inactive subscriptions (true/false, default: true)
+    - gzip: Compress the response (true/false, default: false)
+
+    CSV columns match the import format (POST /subscriptions/import)
+    """
+    include_inactive = request.args.get('inactive', 'true').lower() == 'true'
+
+    return _stream_export(
+        'subscriptions',
+        DataExporter.SUBSCRIPTION_COLUMNS,
+        DataExporter.iter_subscriptions(g.user_id, include_inactive)
+    )
+
+
+@export_bp.route('/notifications', methods=['GET'])
+@read_only
+@require_auth
+def export_notifications():
+    """
+    Export notification history
+
+    Query parameters:
+    - format: csv, ndjson or json (default: csv)
+    - channel: Filter by channel
+    - gzip: Compress the response (true/false, default: false)
+    """
+    return _stream_export(
+        'notifications',
+        DataExporter.NOTIFICATION_COLUMNS,
+        DataExporter.iter_notifications(g.user_id, request.args.get('channel'))
+    )
+
+
+@export_bp.route('/statistics', methods=['GET'])
+@read_only
+@require_auth
+def export_statistics():
+    """
+    Export spending report (overview, by category, by payment method)
+
+    Query parameters:
+    - format: csv, ndjson or json (default: csv)
+    - gzip: Compress the response (true/false, default: false)
+    """
+    return _stream_export(
+        'statistics',
+        DataExporter.STATISTICS_COLUMNS,
+        DataExporter.iter_statistics(g.user_id)
+    )
@@ -4,13 +4,15 @@ Household Member API Endpoints
 from flask import Blueprint, request, jsonify, g
 from app import db
 from app.models.household import HouseholdMember
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
 
 household_bp = Blueprint('household', __name__)
 
 
 @household_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def list_household_members():
     """
     List all household members for current user
@@ -42,7 +44,9 @@ def list_household_members():
 
 
 @household_bp.route('/<int:member_id>', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_household_member(member_id):
     """Get household member by ID"""
     member = db.session.query(HouseholdMember).filter_by(
@@ -0,0 +1,150 @@
+"""
+ML Insight API Endpoints
+"""
+from flask import Blueprint, request, jsonify, g
+from app import db
+from app.models.ai_recommendation import AIRecommendation
+from app.models.ml_insight import MLInsight
+from app.services.recommendations import RecommendationRules, recommendation_service
+from app.utils.decorators import require_auth, read_only, etag
+
+insights_bp = Blueprint('insights', __name__)
+
+
+@insights_bp.route('', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def get_insights():
+    """
+    Get ML insights for current user (newest first)
+
+    Query parameters:
+    - type: Filter by insight type (anomaly, pattern, prediction, recommendation)
+    - kind: Filter by detector (price_jump, duplicate_service, unused_subscription, spend_spike)
+    - include_dismissed: Include dismissed insights (default: false)
+    - limit: Number of records to return (default: 50)
+    """
+    limit = request.args.get('limit', 50, type=int)
+    insight_type = request.args.get('type')
+    kind = request.args.get('kind')
+    include_dismissed = request.args.get('include_dismissed', 'false').lower() == 'true'
+
+    query = db.session.query(MLInsight).filter_by(user_id=g.user_id)
+
+    if insight_type:
+        query = query.filter_by(insight_type=insight_type)
+    if kind:
+        query = query.filter_by(kind=kind)
+    if not include_dismissed:
+        query = query.filter(MLInsight.dismissed.is_(False))
+
+    insights = query.order_by(MLInsight.created_at.desc(), MLInsight.id.desc()).limit(limit).all()
+
+    return jsonify({
+        'status': 'success',
+        'data': [insight.to_dict() for insight in insights],
+        'total': len(insights)
+    }), 200
+
+
+@insights_bp.route('/<int:insight_id>/dismiss', methods=['POST'])
+@require_auth
+def dismiss_insight(insight_id):
+    """
+    Dismiss an insight
+
+    Dismissed insights of a kind let the nightly job report that kind again.
+    """
+    insight = db.session.query(MLInsight).filter_by(id=insight_id, user_id=g.user_id).first()
+
+    if not insight:
+        return jsonify({'status': 'error', 'message': 'Insight not found'}), 404
+
+    insight.dismissed = True
+    db.session.commit()
+
+    return jsonify({
+        'status': 'success',
+        'data': insight.to_dict(),
+        'message': 'Insight dismissed'
+    }), 200
+
+
+@insights_bp.route('/analyze', methods=['POST'])
+@require_auth
+def analyze():
+    """
+    Generate recommendations for current user
+
+    Rule-based recommendations (duplicates, cheaper yearly plans) are
+    stored right away. If the rules leave subscriptions the AI provider
+    should look at, it runs in the background (202); poll
+    GET /insights/recommendations.
+    """
+    result = RecommendationRules().run([g.user_id])
+    escalated = bool(result['escalated']) and recommendation_service.enabled
+
+    if escalated:
+        recommendation_service.submit([g.user_id])
+
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'new_recommendations': result['recommendations'],
+            'ai_pending': escalated
+        },
+        'message': 'AI analysis started' if escalated else 'Analysis complete'
+    }), 202 if escalated else 200
+
+
+@insights_bp.route('/recommendations', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def get_recommendations():
+    """
+    Get AI recommendations for current user (newest first)
+
+    Query parameters:
+    - type: Filter by type (duplicate, alternative, bundle, cancel, optimize)
+    - include_dismissed: Include dismissed recommendations (default: false)
+    """
+    recommendation_type = request.args.get('type')
+    include_dismissed = request.args.get('include_dismissed', 'false').lower() == 'true'
+
+    query = db.session.query(AIRecommendation).filter_by(user_id=g.user_id)
+
+    if recommendation_type:
+        query = query.filter_by(recommendation_type=recommendation_type)
+    if not include_dismissed:
+        query = query.filter(AIRecommendation.dismissed.is_(False))
+
+    recommendations = query.order_by(AIRecommendation.created_at.desc(), AIRecommendation.id.desc()).all()
+
+    return jsonify({
+        'status': 'success',
+        'data': [recommendation.to_dict() for recommendation in recommendations],
+        'total': len(recommendations)
+    }), 200
+
+
+@insights_bp.route('/recommendations/<int:recommendation_id>/dismiss', methods=['POST'])
+@require_auth
+def dismiss_recommendation(recommendation_id):
+    """Dismiss a recommendation (it won't be suggested again for the same subscriptions)"""
+    recommendation = db.session.query(AIRecommendation).filter_by(
+        id=recommendation_id, user_id=g.user_id
+    ).first()
+
+    if not recommendation:
+        return jsonify({'status': 'error', 'message': 'Recommendation not found'}), 404
+
+    recommendation.dismissed = True
+    db.session.commit()
+
+    return jsonify({
+        'status': 'success',
+        'data': recommendation.to_dict(),
+        'message': 'Recommendation dismissed'
+    }), 200
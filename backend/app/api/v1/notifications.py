@@ -12,7 +12,8 @@ from app.models.notification import (
     NotificationLog
 )
 from app.services.notifications.notification_manager import NotificationManager
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
+from app.utils.row_encoder import NotificationLogEncoder
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -367,7 +368,9 @@ def send_notification():
 
 
 @notifications_bp.route('/log', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_notification_log():
     """
     Get notification history
@@ -384,10 +387,12 @@ def get_notification_log():
     if channel:
         query = query.filter_by(channel=channel)
 
-    logs = query.order_by(NotificationLog.created_at.desc()).limit(limit).all()
+    logs = NotificationLogEncoder.encode_query(
+        query.order_by(NotificationLog.sent_at.desc()).limit(limit)
+    )
 
     return jsonify({
         'status': 'success',
-        'data': [log.to_dict() for log in logs],
+        'data': logs,
         'total': len(logs)
     }), 200
@@ -0,0 +1,249 @@
+"""
+Receipt OCR API Endpoints
+"""
+import os
+from flask import Blueprint, request, jsonify, g, current_app
+from werkzeug.utils import secure_filename
+from app import db
+from app.models.receipt import Receipt
+from app.models.subscription import Subscription
+from app.services.receipts import ocr_pool
+from app.utils.decorators import require_auth, read_only, etag, stage_uploads
+
+ocr_bp = Blueprint('ocr', __name__)
+
+MAX_WAIT = 30  # seconds
+
+
+def _get_receipt(receipt_id: int):
+    """Get one of the current user's receipts"""
+    return db.session.query(Receipt).filter_by(id=receipt_id, user_id=g.user_id).first()
+
+
+@ocr_bp.route('/upload', methods=['POST'])
+@require_auth
+@stage_uploads(lambda: ocr_pool.store.stage())
+def upload_receipt():
+    """
+    Upload a receipt for OCR processing
+
+    Form data:
+    - receipt: Image or PDF file (png, jpg, jpeg, pdf)
+    - subscription_id: Subscription the receipt belongs to (optional)
+
+    The file is streamed to disk and hashed while the request is parsed,
+    then stored and queued (202); poll GET /ocr/receipts/<id>?wait=30
+    for the result. Files recognized before complete immediately (201).
+    """
+    file = request.files.get('receipt')
+    if file is None or not file.filename:
+        return jsonify({'status': 'error', 'message': 'No receipt file provided'}), 400
+
+    filename = secure_filename(file.filename) or 'receipt'
+    extension = os.path.splitext(filename)[1].lstrip('.').lower()
+    if extension not in current_app.config['RECEIPT_EXTENSIONS']:
+        allowed = ', '.join(sorted(current_app.config['RECEIPT_EXTENSIONS']))
+        return jsonify({'status': 'error', 'message': f'Invalid file type. Allowed: {allowed}'}), 400
+
+    subscription_id = request.form.get('subscription_id', type=int)
+    if subscription_id is not None and not db.session.query(Subscription.id).filter_by(
+        id=subscription_id, user_id=g.user_id
+    ).first():
+        return jsonify({'status': 'error', 'message': 'Subscription not found'}), 404
+
+    # Content-addressed: identical files are stored once
+    stored = ocr_pool.store.save(file.stream, extension)
+
+    receipt = Receipt(
+        user_id=g.user_id,
+        subscription_id=subscription_id,
+        filename=filename,
+        file_path=stored['file_path'],
+        content_hash=stored['content_hash'],
+        content_type=file.mimetype,
+        file_size=stored['size'],
+        status='pending'
+    )
+
+    cached = ocr_pool.cached_result(stored['content_hash'])
+    if cached:
+        ocr_pool.apply_result(receipt, cached)
+        ocr_pool.match_receipts([receipt])
+
+    try:
+        db.session.add(receipt)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Failed to store receipt')
+        if stored['created']:
+            ocr_pool.store.release(stored['content_hash'], stored['file_path'], grace_period=0)
+        return jsonify({'status': 'error', 'message': 'Failed to store receipt'}), 500
+
+    if cached:
+        return jsonify({
+            'status': 'success',
+            'message': 'Receipt recognized from cache',
+            'data': receipt.to_dict()
+        }), 201
+
+    ocr_pool.submit(receipt.id)
+    db.session.refresh(receipt)
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Receipt queued for processing',
+        'data': receipt.to_dict()
+    }), 202
+
+
+@ocr_bp.route('/receipts', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def list_receipts():
+    """
+    List receipts
+
+    Query parameters:
+    - status: Filter by status (pending, processing, done, failed)
+    - subscription_id: Filter by subscription
+    """
+    query = db.session.query(Receipt).filter_by(user_id=g.user_id)
+
+    status = request.args.get('status')
+    if status:
+        query = query.filter_by(status=status)
+
+    subscription_id = request.args.get('subscription_id', type=int)
+    if subscription_id:
+        query = query.filter_by(subscription_id=subscription_id)
+
+    receipts = query.order_by(Receipt.id.desc()).all()
+
+    return jsonify({
+        'status': 'success',
+        'data': [receipt.to_dict() for receipt in receipts],
+        'total': len(receipts)
+    }), 200
+
+
+@ocr_bp.route('/receipts/<int:receipt_id>', methods=['GET'])
+@read_only
+@require_auth
+def get_receipt(receipt_id):
+    """
+    Get a receipt and its processing status
+
+    Query parameters:
+    - wait: Seconds to wait for processing to finish (0-30, default: 0)
+    """
+    wait = request.args.get('wait', 0, type=float)
+    if wait < 0 or wait > MAX_WAIT:
+        return jsonify({'status': 'error', 'message': f'Wait must be between 0 and {MAX_WAIT} seconds'}), 400
+
+    if wait:
+        receipt = ocr_pool.wait(receipt_id, g.user_id, wait)
+    else:
+        receipt = _get_receipt(receipt_id)
+
+    if not receipt:
+        return jsonify({'status': 'error', 'message': 'Receipt not found'}), 404
+
+    return jsonify({
+        'status': 'success',
+        'data': receipt.to_dict()
+    }), 200
+
+
+@ocr_bp.route('/receipts/match', methods=['POST'])
+@require_auth
+def match_receipts():
+    """
+    Match recognized receipts to subscriptions
+
+    Recognized receipts are matched automatically; use this after adding
+    subscriptions or to re-run matching for older receipts.
+
+    Request body (all optional):
+    {
+        "receipt_ids": [1, 2, 3],  // default: all recognized receipts
+        "relink": false            // replace existing subscription links
+    }
+    """
+    data = request.get_json(silent=True) or {}
+
+    receipt_ids = data.get('receipt_ids')
+    if receipt_ids is not None and (
+        not isinstance(receipt_ids, list)
+        or not all(isinstance(receipt_id, int) and not isinstance(receipt_id, bool) for receipt_id in receipt_ids)
+    ):
+        return jsonify({'status': 'error', 'message': 'receipt_ids must be a list of integers'}), 400
+
+    relink = bool(data.get('relink', False))
+
+    query = db.session.query(Receipt).filter_by(user_id=g.user_id, status='done')
+    if receipt_ids is not None:
+        query = query.filter(Receipt.id.in_(receipt_ids))
+    elif not relink:
+        query = query.filter(Receipt.subscription_id.is_(None))
+
+    receipts = query.all()
+    result = ocr_pool.match_receipts(receipts, relink=relink)
+    db.session.commit()
+
+    return jsonify({
+        'status': 'success',
+        'data': {'receipts': len(receipts), **result}
+    }), 200
+
+
+@ocr_bp.route('/receipts/<int:receipt_id>/retry', methods=['POST'])
+@require_auth
+def retry_receipt(receipt_id):
+    """Queue a failed receipt for processing again"""
+    receipt = _get_receipt(receipt_id)
+
+    if not receipt:
+        return jsonify({'status': 'error', 'message': 'Receipt not found'}), 404
+
+    if receipt.status != 'failed':
+        return jsonify({'status': 'error', 'message': 'Only failed receipts can be retried'}), 409
+
+    receipt.status = 'pending'
+    receipt.attempts = 0
+    receipt.error_message = None
+    db.session.commit()
+
+    ocr_pool.submit(receipt.id)
+    db.session.refresh(receipt)
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Receipt queued for processing',
+        'data': receipt.to_dict()
+    }), 202
+
+
+@ocr_bp.route('/receipts/<int:receipt_id>', methods=['DELETE'])
+@require_auth
+def delete_receipt(receipt_id):
+    """Delete a receipt and its file"""
+    receipt = _get_receipt(receipt_id)
+
+    if not receipt:
+        return jsonify({'status': 'error', 'message': 'Receipt not found'}), 404
+
+    content_hash = receipt.content_hash
+    file_path = receipt.file_path
+
+    db.session.delete(receipt)
+    db.session.commit()
+
+    # Shared files are kept while other receipts reference them
+    ocr_pool.store.release(content_hash, file_path)
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Receipt deleted successfully'
+    }), 200
@@ -4,13 +4,15 @@ Payment Method API Endpoints
 from flask import Blueprint, request, jsonify, g
 from app import db
 from app.models.payment_method import PaymentMethod
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
 
 payment_methods_bp = Blueprint('payment_methods', __name__)
 
 
 @payment_methods_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def list_payment_methods():
     """
     List all payment methods for current user
@@ -42,7 +44,9 @@ def list_payment_methods():
 
 
 @payment_methods_bp.route('/<int:payment_method_id>', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_payment_method(payment_method_id):
     """Get payment method by ID"""
     payment_method = db.session.query(PaymentMethod).filter_by(
@@ -3,13 +3,15 @@ Statistics and Analytics API Endpoints
 """
 from flask import Blueprint, request, jsonify, g
 from app.services.statistics_service import StatisticsService
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
 
 statistics_bp = Blueprint('statistics', __name__)
 
 
 @statistics_bp.route('/overview', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_overview():
     """
     Get overview statistics
@@ -28,7 +30,9 @@ def get_overview():
 
 
 @statistics_bp.route('/by-category', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_by_category():
     """
     Get spending breakdown by category
@@ -45,7 +49,9 @@ def get_by_category():
 
 
 @statistics_bp.route('/by-payment-method', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_by_payment_method():
     """
     Get spending breakdown by payment method
@@ -61,8 +67,49 @@ def get_by_payment_method():
     }), 200
 
 
+@statistics_bp.route('/by-payer', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def get_by_payer():
+    """
+    Get spending breakdown by payer
+
+    Returns spending data grouped by household member paying
+    """
+    data = StatisticsService.get_by_payer(g.user_id)
+
+    return jsonify({
+        'status': 'success',
+        'data': data,
+        'total': len(data)
+    }), 200
+
+
+@statistics_bp.route('/settlement', methods=['GET'])
+@read_only
+@require_auth
+@etag
+def get_settlement():
+    """
+    Get household settlement for shared subscriptions
+
+    Shared subscriptions are split equally among household members.
+    Returns each member's monthly paid amount, share and balance, and the
+    transfers that settle them (who owes whom).
+    """
+    settlement = StatisticsService.get_settlement(g.user_id)
+
+    return jsonify({
+        'status': 'success',
+        'data': settlement
+    }), 200
+
+
 @statistics_bp.route('/trends', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_trends():
     """
     Get spending trends over time
@@ -84,7 +131,9 @@ def get_trends():
 
 
 @statistics_bp.route('/upcoming-renewals', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_upcoming_renewals():
     """
     Get upcoming subscription renewals
@@ -107,7 +156,9 @@ def get_upcoming_renewals():
 
 
 @statistics_bp.route('/most-expensive', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_most_expensive():
     """
     Get most expensive subscriptions
@@ -6,13 +6,16 @@ from datetime import datetime
 from app import db
 from app.models.subscription import Subscription
 from app.services.billing_cycle import BillingCycleCalculator
-from app.utils.decorators import require_auth
+from app.utils.decorators import require_auth, read_only, etag
+from app.utils.row_encoder import SubscriptionEncoder
 
 subscriptions_bp = Blueprint('subscriptions', __name__)
 
 
 @subscriptions_bp.route('', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def list_subscriptions():
     """
     List all subscriptions for current user
@@ -60,17 +63,19 @@ def list_subscriptions():
         else:
             query = query.order_by(sort_column.asc())
 
-    subscriptions = query.all()
+    subscriptions = SubscriptionEncoder.encode_query(query)
 
     return jsonify({
         'status': 'success',
-        'data': [sub.to_dict() for sub in subscriptions],
+        'data': subscriptions,
         'total': len(subscriptions)
     }), 200
 
 
 @subscriptions_bp.route('/<int:subscription_id>', methods=['GET'])
+@read_only
 @require_auth
+@etag
 def get_subscription(subscription_id):
     """Get subscription by ID"""
     subscription = db.session.query(Subscription).filter_by(
@@ -107,6 +112,7 @@ def create_subscription():
         "category_id": 1,
         "payment_method_id": 2,
         "payer_user_id": null,
+        "shared": false,  // split among household members
         "notify_days_before": 7
     }
     """
@@ -160,6 +166,7 @@ def create_subscription():
         notes=data.get('notes'),
         category_id=data.get('category_id'),
         payer_user_id=data.get('payer_user_id'),
+        shared=data.get('shared', False),
         payment_method_id=data.get('payment_method_id'),
         notify_days_before=data.get('notify_days_before', 7)
     )
@@ -174,6 +181,134 @@ def create_subscription():
     }), 201
 
 
+@subscriptions_bp.route('/import', methods=['POST'])
+@require_auth
+def import_subscriptions():
+    """
+    Bulk import subscriptions from a CSV or NDJSON upload
+
+    Send the file as multipart/form-data ("file" field) or as the raw
+    request body (Content-Type: text/csv or application/x-ndjson).
+
+    Columns / keys: name, price, cycle (1-4 or days/weeks/months/years),
+    frequency, currency (code) or currency_id, next_payment, auto_renew,
+    category or category_id, payment_method or payment_method_id,
+    payer or payer_user_id, shared, url, logo, notes, notify_days_before,
+    inactive, cancellation_date
+
+    Query parameters:
+    - format: csv or ndjson (default: detected from filename or content type)
+    - create_missing: Create unknown currencies, categories and payment
+      methods (true/false, default: true)
+
+    Returns import summary with per-row errors
+    """
+    from app.services.subscription_importer import SubscriptionImporter, ImportFormatError
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream = upload.stream
+        fmt = request.args.get('format') or SubscriptionImporter.detect_format(
+            upload.filename, upload.mimetype
+        )
+    elif request.mimetype and not request.mimetype.startswith('multipart/'):
+        stream = request.stream
+        fmt = request.args.get('format') or SubscriptionImporter.detect_format(None, request.mimetype)
+    else:
+        return jsonify({'status': 'error', 'message': 'No file provided'}), 400
+
+    if not fmt:
+        return jsonify({'status': 'error', 'message': "Unknown format. Use ?format=csv or ?format=ndjson"}), 400
+
+    create_missing = request.args.get('create_missing', 'true').lower() == 'true'
+    importer = SubscriptionImporter(g.user_id, create_missing=create_missing)
+
+    try:
+        report = importer.run(stream, fmt.lower())
+    except ImportFormatError as e:
+        db.session.rollback()
+        report = importer.report()
+        return jsonify({'status': 'error', 'message': str(e), 'data': report}), 400
+
+    return jsonify({
+        'status': 'success',
+        'data': report,
+        'message': f"Imported {report['imported']} of {report['total_rows']} rows"
+    }), 200
+
+
+def _bulk_response(action: str, data: dict):
+    """Run a bulk action and build the response"""
+    from app.services.subscription_bulk import SubscriptionBulkService, BulkOperationError
+
+    try:
+        result = SubscriptionBulkService.apply(g.user_id, action, data)
+    except BulkOperationError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    if result['failed'] and not result['succeeded']:
+        status, code = 'error', 400
+    elif result['failed']:
+        status, code = 'partial', 207
+    else:
+        status, code = 'success', 200
+
+    return jsonify({
+        'status': status,
+        'data': result,
+        'message': f"{result['affected']} subscriptions affected, {len(result['failed'])} failed"
+    }), code
+
+
+@subscriptions_bp.route('/bulk', methods=['PATCH'])
+@require_auth
+def bulk_update_subscriptions():
+    """
+    Apply the same field updates to many subscriptions
+
+    Request body:
+    {
+        "ids": [1, 2, 3],                    // or "filter": {"category_id": 4}
+        "fields": {"category_id": 2, "payment_method_id": 1}
+    }
+
+    Filter fields: category_id, payment_method_id, payer_id, currency_id,
+    inactive, cycle, next_payment_before, next_payment_after, name_contains
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'status': 'error', 'message': 'No data provided'}), 400
+
+    return _bulk_response('update', data)
+
+
+@subscriptions_bp.route('/bulk-action', methods=['POST'])
+@require_auth
+def bulk_action_subscriptions():
+    """
+    Update, inactivate, renew or delete many subscriptions
+
+    Request body:
+    {
+        "action": "inactivate",              // update, inactivate, renew, delete
+        "ids": [1, 2, 3],                    // or "filter": {...} (see PATCH /bulk)
+        "fields": {...},                     // update only
+        "cancellation_date": "2025-10-20",   // inactivate only (default: today)
+        "replacement_subscription_id": 5     // inactivate only (optional)
+    }
+
+    Returns succeeded IDs and per-ID failures (207 on partial failure)
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'status': 'error', 'message': 'No data provided'}), 400
+
+    return _bulk_response(data.get('action') if isinstance(data, dict) else None, data)
+
+
 @subscriptions_bp.route('/<int:subscription_id>', methods=['PUT'])
 @require_auth
 def update_subscription(subscription_id):
@@ -195,7 +330,7 @@ def update_subscription(subscription_id):
     allowed_fields = [
         'name', 'price', 'currency_id', 'cycle', 'frequency', 'next_payment',
         'auto_renew', 'logo', 'url', 'notes', 'category_id', 'payer_user_id',
-        'payment_method_id', 'notify_days_before'
+        'shared', 'payment_method_id', 'notify_days_before'
     ]
 
     for field in allowed_fields:
@@ -221,7 +356,7 @@ def update_subscription(subscription_id):
 @subscriptions_bp.route('/<int:subscription_id>', methods=['DELETE'])
 @require_auth
 def delete_subscription(subscription_id):
-    """Delete subscription"""
+    """Delete subscription (its receipts are kept, detached)"""
     subscription = db.session.query(Subscription).filter_by(
         id=subscription_id,
         user_id=g.user_id
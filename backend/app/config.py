@@ -16,32 +16,110 @@ class Config:
 
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{BASE_DIR}/subos.db')
+    if DATABASE_URL.startswith('postgres://'):
+        DATABASE_URL = 'postgresql://' + DATABASE_URL[len('postgres://'):]
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool for server databases (PostgreSQL); not used for SQLite
+    DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', 10))
+    DATABASE_MAX_OVERFLOW = int(os.getenv('DATABASE_MAX_OVERFLOW', 20))
+    DATABASE_POOL_TIMEOUT = int(os.getenv('DATABASE_POOL_TIMEOUT', 30))  # seconds
+    DATABASE_POOL_RECYCLE = int(os.getenv('DATABASE_POOL_RECYCLE', 1800))  # seconds, -1 disables
+    DATABASE_POOL_PRE_PING = os.getenv('DATABASE_POOL_PRE_PING', 'True').lower() == 'true'
+
+    # SQLite tuning profile (pragmas applied on every connection)
+    SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True').lower() == 'true'
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # milliseconds
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 268435456))  # 256MB
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -65536))  # negative = KiB (64MB)
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+
+    # Read/write split: read-only endpoints use a pool of read-only
+    # connections, everything else the writer pool (0 disables)
+    SQLITE_READ_POOL_SIZE = int(os.getenv('SQLITE_READ_POOL_SIZE', 4))
+
     # Application
     PORT = int(os.getenv('PORT', 3038))
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
+    # JSON responses: auto (orjson if installed), orjson or stdlib
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+
     # Session
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Strict'
     SESSION_COOKIE_SECURE = not DEBUG
     PERMANENT_SESSION_LIFETIME = int(os.getenv('SESSION_LIFETIME', 2592000))  # 30 days
 
+    # Password hashing (bcrypt cost and dedicated worker pool)
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH', 0))  # 0 = 4 x workers
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))  # seconds
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', 1))  # seconds
+
+    # Token revocation (in-memory denylist synced from user_sessions)
+    TOKEN_DENYLIST_CAPACITY = int(os.getenv('TOKEN_DENYLIST_CAPACITY', 100000))
+    TOKEN_DENYLIST_SYNC_INTERVAL = int(os.getenv('TOKEN_DENYLIST_SYNC_INTERVAL', 5))  # seconds
+    TOKEN_DENYLIST_REBUILD_INTERVAL = int(os.getenv('TOKEN_DENYLIST_REBUILD_INTERVAL', 3600))  # seconds
+
+    # Auth caches (verified token claims and user rows, per process)
+    AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', 300))  # seconds, 0 disables
+    AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', 10000))
+
+    # Scheduler (jobs are claimed per run through scheduler_jobs, so every
+    # API node can run the scheduler against a shared database)
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'True').lower() == 'true'
+    SCHEDULER_NODE_ID = os.getenv('SCHEDULER_NODE_ID')  # Defaults to host:pid
+
+    # Incremental batch jobs (recompute users found in the change feed)
+    INSIGHTS_FULL_RUN_DAYS = int(os.getenv('INSIGHTS_FULL_RUN_DAYS', 7))  # days between runs over all users (0 = first run only)
+    CHANGE_FEED_RETENTION_DAYS = int(os.getenv('CHANGE_FEED_RETENTION_DAYS', 7))
+
     # File Upload
     UPLOAD_FOLDER = BASE_DIR / 'uploads'
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_UPLOAD_SIZE', 16777216))  # 16MB
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'svg'}
+    RECEIPT_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
+
+    # Receipt OCR (local Tesseract in a process pool; 0 workers = inline)
+    OCR_WORKERS = int(os.getenv('OCR_WORKERS', os.cpu_count() or 1))
+    OCR_LANGUAGE = os.getenv('OCR_LANGUAGE', 'eng')
+    OCR_TESSERACT_TIMEOUT = int(os.getenv('OCR_TESSERACT_TIMEOUT', 120))  # seconds per page
+    OCR_JOB_TIMEOUT = int(os.getenv('OCR_JOB_TIMEOUT', 600))  # seconds before a stalled job is requeued
+    OCR_MAX_ATTEMPTS = int(os.getenv('OCR_MAX_ATTEMPTS', 3))
+    OCR_PDF_DPI = int(os.getenv('OCR_PDF_DPI', 200))
+    OCR_MAX_PAGES = int(os.getenv('OCR_MAX_PAGES', 10))
+    OCR_MAX_IMAGE_SIDE = int(os.getenv('OCR_MAX_IMAGE_SIDE', 3000))  # pixels
+    OCR_MAX_IMAGE_PIXELS = int(os.getenv('OCR_MAX_IMAGE_PIXELS', 50000000))  # non-JPEG images, before decoding
+    OCR_DATE_DAY_FIRST = os.getenv('OCR_DATE_DAY_FIRST', 'False').lower() == 'true'  # 03/04 = 3 April
+    OCR_MEMORY_LIMIT_MB = int(os.getenv('OCR_MEMORY_LIMIT_MB', 768))  # address space per worker (0 = unlimited)
 
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:5173').split(',')
 
     # API Keys (Optional)
     FIXER_API_KEY = os.getenv('FIXER_API_KEY')
+
+    # Exchange Rates
+    EXCHANGE_RATE_PROVIDER = os.getenv('EXCHANGE_RATE_PROVIDER', 'fixer')  # fixer, http, file
+    EXCHANGE_RATE_URL = os.getenv('EXCHANGE_RATE_URL')  # ECB XML/CSV or JSON endpoint
+    EXCHANGE_RATE_FILE = os.getenv('EXCHANGE_RATE_FILE')  # Local ECB XML/CSV file
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     GOOGLE_GEMINI_API_KEY = os.getenv('GOOGLE_GEMINI_API_KEY')
+    OLLAMA_HOST = os.getenv('OLLAMA_HOST', 'http://localhost:11434')
+
+    # AI Recommendations (openai, gemini or ollama; empty disables)
+    AI_PROVIDER = os.getenv('AI_PROVIDER', '')
+    AI_MODEL = os.getenv('AI_MODEL')  # Defaults per provider
+    AI_BASE_URL = os.getenv('AI_BASE_URL')  # Compatible endpoint or local stub
+    AI_WORKERS = int(os.getenv('AI_WORKERS', 4))  # concurrent requests
+    AI_REQUESTS_PER_MINUTE = int(os.getenv('AI_REQUESTS_PER_MINUTE', -1))  # -1 = provider default, 0 = unlimited
+    AI_REQUEST_TIMEOUT = int(os.getenv('AI_REQUEST_TIMEOUT', 60))  # seconds
     GOOGLE_VISION_API_KEY = os.getenv('GOOGLE_VISION_API_KEY')
 
     # SMTP (Optional)
@@ -64,6 +142,9 @@ class TestingConfig(Config):
     TESTING = True
     DATABASE_URL = 'sqlite:///:memory:'
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    PASSWORD_HASH_WORKERS = 0  # Hash inline
+    OCR_WORKERS = 0  # Recognize inline
+    BCRYPT_ROUNDS = 4
 
 
 class ProductionConfig(Config):
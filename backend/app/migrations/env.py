@@ -5,6 +5,7 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import make_url
 
 from alembic import context
 
@@ -37,6 +38,21 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def dialect_options(dialect_name: str) -> dict:
+    """Context options for the target database dialect.
+
+    SQLite can't ALTER most column or constraint properties, so
+    migrations run in batch mode (copy and move the table) there.
+    PostgreSQL alters in place and compares column types and server
+    defaults during autogenerate.
+
+    """
+    if dialect_name == 'sqlite':
+        return {'render_as_batch': True}
+
+    return {'compare_type': True, 'compare_server_default': True}
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -55,6 +71,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        **dialect_options(make_url(url).get_backend_name()),
     )
 
     with context.begin_transaction():
@@ -76,7 +93,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            **dialect_options(connection.dialect.name),
         )
 
         with context.begin_transaction():
@@ -0,0 +1,44 @@
+"""keep receipts of deleted subscriptions
+
+Revision ID: 041711447034
+Revises: a9abe5a9eba9
+Create Date: 2026-10-19 03:15:41.962370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '041711447034'
+down_revision: Union[str, None] = 'a9abe5a9eba9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The receipts.subscription_id foreign key was created unnamed: PostgreSQL
+# named it receipts_subscription_id_fkey, SQLite has no name (batch mode
+# recreates the table, so give it one through a naming convention)
+SQLITE_NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _replace_foreign_key(ondelete: str) -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        name = 'fk_receipts_subscription_id_subscriptions'
+        options = {'naming_convention': SQLITE_NAMING}
+    else:
+        name = 'receipts_subscription_id_fkey'
+        options = {}
+
+    with op.batch_alter_table('receipts', schema=None, **options) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, 'subscriptions', ['subscription_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _replace_foreign_key('SET NULL')
+
+
+def downgrade() -> None:
+    _replace_foreign_key('CASCADE')
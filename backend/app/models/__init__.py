@@ -8,7 +8,9 @@ Base = declarative_base()
 # Import all models here for Alembic to discover
 from app.models.user import User
 from app.models.subscription import Subscription
+from app.models.price_change import SubscriptionPriceChange
 from app.models.currency import Currency
+from app.models.exchange_rate import ExchangeRate
 from app.models.category import Category
 from app.models.household import HouseholdMember
 from app.models.payment_method import PaymentMethod
@@ -22,14 +24,21 @@ from app.models.notification import (
     NotificationLog
 )
 from app.models.ai_recommendation import AIRecommendation
+from app.models.ai_response import AIResponse
 from app.models.ml_insight import MLInsight
 from app.models.receipt import Receipt
+from app.models.ocr_result import OCRResult
+from app.models.session import UserSession
+from app.models.scheduler_job import SchedulerJob
+from app.models.change_feed import ChangeFeedEntry
 
 __all__ = [
     'Base',
     'User',
     'Subscription',
+    'SubscriptionPriceChange',
     'Currency',
+    'ExchangeRate',
     'Category',
     'HouseholdMember',
     'PaymentMethod',
@@ -41,6 +50,11 @@ __all__ = [
     'WebhookNotification',
     'NotificationLog',
     'AIRecommendation',
+    'AIResponse',
     'MLInsight',
-    'Receipt'
+    'Receipt',
+    'OCRResult',
+    'UserSession',
+    'SchedulerJob',
+    'ChangeFeedEntry'
 ]
@@ -5,6 +5,7 @@ from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey,
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models import Base
+from app.utils.serialization import ParsedJSON
 
 
 class AIRecommendation(Base):
@@ -24,6 +25,8 @@ class AIRecommendation(Base):
     savings = Column(String(50))  # e.g., "$15.00/month"
     recommendation_type = Column(String(50))  # duplicate, alternative, bundle, cancel, optimize
     related_subscription_ids = Column(Text)  # JSON array
+    source = Column(String(50))  # Provider that produced it (openai, gemini, ollama)
+    input_hash = Column(String(64))  # Normalized subscription set it was generated from
 
     # Status
     dismissed = Column(Boolean, default=False, index=True)
@@ -34,16 +37,19 @@ class AIRecommendation(Base):
     # Relationships
     user = relationship('User', back_populates='ai_recommendations')
 
+    # Parsed JSON (cached per stored value)
+    related_subscriptions = ParsedJSON('related_subscription_ids', list)
+
     def to_dict(self):
         """Convert AI recommendation to dictionary"""
-        import json
         return {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'savings': self.savings,
             'type': self.recommendation_type,
-            'related_subscriptions': json.loads(self.related_subscription_ids) if self.related_subscription_ids else [],
+            'related_subscriptions': self.related_subscriptions,
+            'source': self.source,
             'dismissed': self.dismissed,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
@@ -0,0 +1,29 @@
+"""
+AI Response Cache Model
+"""
+from sqlalchemy import Column, String, TIMESTAMP, Text
+from sqlalchemy.sql import func
+from app.models import Base
+from app.utils.serialization import ParsedJSON
+
+
+class AIResponse(Base):
+    """Parsed AI recommendations cached by normalized subscription set and provider version"""
+
+    __tablename__ = 'ai_responses'
+
+    # Primary Key
+    input_hash = Column(String(64), primary_key=True)  # SHA-256 of the normalized subscription set
+    provider_version = Column(String(100), primary_key=True)  # e.g. openai:gpt-4o-mini
+
+    # Response
+    recommendations = Column(Text)  # JSON list; items refer to lines of the prompt
+
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Parsed JSON (cached per stored value)
+    entries = ParsedJSON('recommendations', list)
+
+    def __repr__(self):
+        return f'<AIResponse {self.input_hash[:12]} {self.provider_version}>'
@@ -0,0 +1,36 @@
+"""
+Change Feed Model
+"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
+from sqlalchemy.sql import func
+from app.models import Base
+
+
+class ChangeFeedEntry(Base):
+    """Append-only log of users whose subscriptions, currencies or budget changed"""
+
+    __tablename__ = 'change_feed'
+
+    # Primary Key (increasing; batch jobs keep the last ID they processed as a watermark)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Owner
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    # Change
+    source = Column(String(20), nullable=False)  # subscription, currency, budget
+
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    def to_dict(self):
+        """Convert change feed entry to dictionary"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'source': self.source,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def __repr__(self):
+        return f'<ChangeFeedEntry {self.id}: user {self.user_id} {self.source}>'
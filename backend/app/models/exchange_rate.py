@@ -0,0 +1,39 @@
+"""
+Exchange Rate History Model
+"""
+from sqlalchemy import Column, Integer, String, Float, Date, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models import Base
+
+
+class ExchangeRate(Base):
+    """Daily exchange rate snapshot (one row per currency code and date)"""
+
+    __tablename__ = 'exchange_rates'
+    __table_args__ = (
+        UniqueConstraint('code', 'date', name='uq_exchange_rates_code_date'),
+    )
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Rate Details
+    code = Column(String(10), nullable=False)  # e.g., "EUR"
+    date = Column(Date, nullable=False)
+    rate = Column(Float, nullable=False)  # Exchange rate to USD base
+    source = Column(String(50))  # fixer, import, manual
+
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    def to_dict(self):
+        """Convert exchange rate to dictionary"""
+        return {
+            'code': self.code,
+            'date': self.date.isoformat() if self.date else None,
+            'rate': self.rate,
+            'source': self.source
+        }
+
+    def __repr__(self):
+        return f'<ExchangeRate {self.code} {self.date}>'
@@ -1,16 +1,21 @@
 """
 ML Insight Model
 """
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models import Base
+from app.utils.serialization import ParsedJSON
 
 
 class MLInsight(Base):
     """ML-powered insights (anomalies, predictions, patterns)"""
 
     __tablename__ = 'ml_insights'
+    __table_args__ = (
+        # Batch jobs skip users with an open insight of the same kind
+        Index('ix_ml_insights_user_kind_dismissed', 'user_id', 'kind', 'dismissed'),
+    )
 
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -20,6 +25,7 @@ class MLInsight(Base):
 
     # Insight Details
     insight_type = Column(String(50), nullable=False, index=True)  # anomaly, pattern, prediction, recommendation
+    kind = Column(String(50))  # Detector that produced it (price_jump, duplicate_service, ...)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     data = Column(Text)  # JSON with insight details
@@ -34,15 +40,18 @@ class MLInsight(Base):
     # Relationships
     user = relationship('User', back_populates='ml_insights')
 
+    # Parsed JSON (cached per stored value)
+    details = ParsedJSON('data', dict)
+
     def to_dict(self):
         """Convert ML insight to dictionary"""
-        import json
         return {
             'id': self.id,
             'type': self.insight_type,
+            'kind': self.kind,
             'title': self.title,
             'description': self.description,
-            'data': json.loads(self.data) if self.data else {},
+            'data': self.details,
             'severity': self.severity,
             'dismissed': self.dismissed,
             'created_at': self.created_at.isoformat() if self.created_at else None
@@ -1,7 +1,7 @@
 """
 Notification Models
 """
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models import Base
@@ -167,9 +167,13 @@ class NotificationLog(Base):
     """Notification log for tracking sent notifications"""
 
     __tablename__ = 'notification_log'
+    __table_args__ = (
+        # Per-user log, filtered by channel, newest first
+        Index('ix_notification_log_user_channel_sent_at', 'user_id', 'channel', 'sent_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     subscription_id = Column(Integer, ForeignKey('subscriptions.id', ondelete='CASCADE'))
 
     channel = Column(String(50), nullable=False)  # email, discord, etc.
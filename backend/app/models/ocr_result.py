@@ -0,0 +1,33 @@
+"""
+OCR Result Cache Model
+"""
+from sqlalchemy import Column, Integer, String, Float, TIMESTAMP, Text
+from sqlalchemy.sql import func
+from app.models import Base
+from app.utils.serialization import ParsedJSON
+
+
+class OCRResult(Base):
+    """OCR output cached by file content hash and OCR provider version"""
+
+    __tablename__ = 'ocr_results'
+
+    # Primary Key
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the file
+    provider_version = Column(String(100), primary_key=True)  # e.g. tesseract:5.3.0:eng:1
+
+    # OCR Results
+    extracted_text = Column(Text)
+    extracted_data = Column(Text)  # JSON of parsed fields
+    confidence_score = Column(Float)
+    ocr_provider = Column(String(50))
+    pages = Column(Integer)
+
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Parsed JSON (cached per stored value)
+    extracted_fields = ParsedJSON('extracted_data', dict)
+
+    def __repr__(self):
+        return f'<OCRResult {self.content_hash[:12]} {self.provider_version}>'
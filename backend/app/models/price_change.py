@@ -0,0 +1,51 @@
+"""
+Subscription Price Change Model
+"""
+from sqlalchemy import Column, Integer, Float, TIMESTAMP, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.models import Base
+
+
+class SubscriptionPriceChange(Base):
+    """Price history: one row per change of a subscription's price or currency"""
+
+    __tablename__ = 'subscription_price_changes'
+    __table_args__ = (
+        # Price history per subscription, oldest first
+        Index('ix_subscription_price_changes_subscription_changed', 'subscription_id', 'changed_at'),
+    )
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Owner
+    subscription_id = Column(Integer, ForeignKey('subscriptions.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # Change
+    old_price = Column(Float, nullable=False)
+    old_currency_id = Column(Integer, ForeignKey('currencies.id', ondelete='SET NULL'))
+    new_price = Column(Float, nullable=False)
+    new_currency_id = Column(Integer, ForeignKey('currencies.id', ondelete='SET NULL'))
+
+    # Timestamps
+    changed_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    # Relationships
+    subscription = relationship('Subscription', back_populates='price_changes')
+
+    def to_dict(self):
+        """Convert price change to dictionary"""
+        return {
+            'id': self.id,
+            'subscription_id': self.subscription_id,
+            'old_price': self.old_price,
+            'old_currency_id': self.old_currency_id,
+            'new_price': self.new_price,
+            'new_currency_id': self.new_currency_id,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None
+        }
+
+    def __repr__(self):
+        return f'<SubscriptionPriceChange {self.subscription_id}: {self.old_price} -> {self.new_price}>'
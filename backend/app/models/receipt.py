@@ -1,26 +1,45 @@
 """
 Receipt Model
 """
-from sqlalchemy import Column, Integer, String, Float, TIMESTAMP, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, TIMESTAMP, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models import Base
+from app.utils.serialization import ParsedJSON
 
 
 class Receipt(Base):
     """Receipt model for OCR-processed receipts"""
 
     __tablename__ = 'receipts'
+    __table_args__ = (
+        # OCR queue: oldest pending receipt first
+        Index('ix_receipts_status_id', 'status', 'id'),
+        # Shared stored files: reference checks on delete, cache fill on completion
+        Index('ix_receipts_content_hash', 'content_hash'),
+    )
 
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     # Owner
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
-    subscription_id = Column(Integer, ForeignKey('subscriptions.id', ondelete='CASCADE'), nullable=False)
+    subscription_id = Column(Integer, ForeignKey('subscriptions.id', ondelete='SET NULL'))  # Set once matched, cleared if deleted
 
     # Receipt File
     filename = Column(String(255), nullable=False)  # Original file
+    file_path = Column(String(500))  # Stored file, relative to UPLOAD_FOLDER
+    content_hash = Column(String(64))  # SHA-256 of the file (content-addressed storage)
+    content_type = Column(String(100))
+    file_size = Column(Integer)
+
+    # Processing
+    status = Column(String(20), nullable=False, default='pending', server_default=text("'pending'"))  # pending, processing, done, failed
+    attempts = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    error_message = Column(Text)
+    claimed_by = Column(String(255))  # Node ID (host:pid) processing the receipt
+    claimed_at = Column(TIMESTAMP)
+    processed_at = Column(TIMESTAMP)
 
     # OCR Results
     extracted_text = Column(Text)  # Full OCR text
@@ -35,17 +54,24 @@ class Receipt(Base):
     user = relationship('User', back_populates='receipts')
     subscription = relationship('Subscription', back_populates='receipts')
 
+    # Parsed JSON (cached per stored value)
+    extracted_fields = ParsedJSON('extracted_data', dict)
+
     def to_dict(self):
         """Convert receipt to dictionary"""
-        import json
         return {
             'id': self.id,
             'subscription_id': self.subscription_id,
             'filename': self.filename,
             'extracted_text': self.extracted_text,
-            'extracted_data': json.loads(self.extracted_data) if self.extracted_data else {},
+            'extracted_data': self.extracted_fields,
             'confidence_score': self.confidence_score,
             'ocr_provider': self.ocr_provider,
+            'content_type': self.content_type,
+            'file_size': self.file_size,
+            'status': self.status,
+            'error_message': self.error_message,
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
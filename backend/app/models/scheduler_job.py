@@ -0,0 +1,55 @@
+"""
+Scheduler Job Model
+"""
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP
+from sqlalchemy.sql import func
+from app.models import Base
+from app.utils.serialization import ParsedJSON
+
+
+class SchedulerJob(Base):
+    """Shared run state of a scheduled job, claimed by one node per run"""
+
+    __tablename__ = 'scheduler_jobs'
+
+    # Primary Key (APScheduler job id)
+    name = Column(String(100), primary_key=True)
+
+    # Claim
+    last_run_key = Column(String(50))  # Scheduled fire time of the last claimed run
+    claimed_by = Column(String(255))  # Node ID (host:pid)
+    claimed_at = Column(TIMESTAMP)
+
+    # Result
+    finished_at = Column(TIMESTAMP)
+    last_status = Column(String(20))  # running, success, failed
+    last_error = Column(Text)
+
+    # Change feed progress (incremental jobs)
+    watermark = Column(Integer)  # Last change_feed ID processed
+    full_run_at = Column(TIMESTAMP)  # Last run over all users
+    retry_user_ids = Column(Text)  # JSON list of users to process again on the next run
+
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Parsed JSON (cached per stored value)
+    retry_users = ParsedJSON('retry_user_ids', list)
+
+    def to_dict(self):
+        """Convert job state to dictionary"""
+        return {
+            'name': self.name,
+            'last_run_key': self.last_run_key,
+            'claimed_by': self.claimed_by,
+            'claimed_at': self.claimed_at.isoformat() if self.claimed_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'last_status': self.last_status,
+            'last_error': self.last_error,
+            'watermark': self.watermark,
+            'full_run_at': self.full_run_at.isoformat() if self.full_run_at else None,
+            'retry_user_ids': self.retry_users
+        }
+
+    def __repr__(self):
+        return f'<SchedulerJob {self.name}>'
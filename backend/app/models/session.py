@@ -0,0 +1,49 @@
+"""
+User Session Model
+"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.models import Base
+
+
+class UserSession(Base):
+    """Issued login token (by JWT ID), used for revocation"""
+
+    __tablename__ = 'user_sessions'
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Owner
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # Token Details
+    jti = Column(String(64), unique=True, nullable=False)  # JWT ID claim
+    user_agent = Column(String(255))
+    ip_address = Column(String(45))
+    expires_at = Column(TIMESTAMP, nullable=False)
+
+    # Status
+    revoked_at = Column(TIMESTAMP, index=True)  # Watermark for denylist sync
+
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Relationships
+    user = relationship('User', back_populates='sessions')
+
+    def to_dict(self):
+        """Convert session to dictionary"""
+        return {
+            'id': self.id,
+            'user_agent': self.user_agent,
+            'ip_address': self.ip_address,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'revoked': self.revoked_at is not None,
+            'revoked_at': self.revoked_at.isoformat() if self.revoked_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def __repr__(self):
+        return f'<UserSession {self.jti}>'
@@ -1,7 +1,7 @@
 """
 Subscription Model
 """
-from sqlalchemy import Column, Integer, String, Float, Date, Boolean, TIMESTAMP, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Date, Boolean, TIMESTAMP, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models import Base
@@ -11,12 +11,23 @@ class Subscription(Base):
     """Subscription model for tracking recurring expenses"""
 
     __tablename__ = 'subscriptions'
+    __table_args__ = (
+        # Calendar, upcoming renewals and per-user statistics
+        Index('ix_subscriptions_user_inactive_next_payment', 'user_id', 'inactive', 'next_payment'),
+        # Overdue scan across all users (active rows only)
+        Index('ix_subscriptions_active_next_payment', 'next_payment',
+              sqlite_where=text('inactive = 0'), postgresql_where=text('inactive = false')),
+        # Cancellation reminders (only rows with a cancellation date)
+        Index('ix_subscriptions_cancellation_date', 'cancellation_date',
+              sqlite_where=text('cancellation_date IS NOT NULL'),
+              postgresql_where=text('cancellation_date IS NOT NULL')),
+    )
 
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     # Owner
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
 
     # Basic Info
     name = Column(String(255), nullable=False)
@@ -38,10 +49,11 @@ class Subscription(Base):
     # Organization
     category_id = Column(Integer, ForeignKey('categories.id', ondelete='SET NULL'))
     payer_user_id = Column(Integer, ForeignKey('household.id', ondelete='SET NULL'))
+    shared = Column(Boolean, default=False)  # Split equally among household members
     payment_method_id = Column(Integer, ForeignKey('payment_methods.id', ondelete='SET NULL'))
 
     # Status
-    inactive = Column(Boolean, default=False, index=True)
+    inactive = Column(Boolean, default=False)
     cancellation_date = Column(Date)
     replacement_subscription_id = Column(Integer, ForeignKey('subscriptions.id'))
 
@@ -58,7 +70,8 @@ class Subscription(Base):
     category = relationship('Category')
     payer = relationship('HouseholdMember')
     payment_method = relationship('PaymentMethod')
-    receipts = relationship('Receipt', back_populates='subscription', cascade='all, delete-orphan')
+    receipts = relationship('Receipt', back_populates='subscription')  # Kept (detached) on delete
+    price_changes = relationship('SubscriptionPriceChange', back_populates='subscription', cascade='all, delete-orphan')
 
     def to_dict(self):
         """Convert subscription to dictionary"""
@@ -76,6 +89,7 @@ class Subscription(Base):
             'notes': self.notes,
             'category': self.category.to_dict() if self.category else None,
             'payer': self.payer.to_dict() if self.payer else None,
+            'shared': self.shared,
             'payment_method': self.payment_method.to_dict() if self.payment_method else None,
             'inactive': self.inactive,
             'cancellation_date': self.cancellation_date.isoformat() if self.cancellation_date else None,
@@ -1,7 +1,7 @@
 """
 User Model
 """
-from sqlalchemy import Column, Integer, String, Boolean, Float, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Boolean, Float, TIMESTAMP, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models import Base
@@ -36,6 +36,9 @@ class User(Base):
     # Authorization
     is_admin = Column(Boolean, default=False)
 
+    # Cache validation (bumped on every write to the user's data, drives ETags)
+    data_version = Column(Integer, nullable=False, default=0, server_default=text('0'))
+
     # Timestamps
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -49,6 +52,7 @@ class User(Base):
     ai_recommendations = relationship('AIRecommendation', back_populates='user', cascade='all, delete-orphan')
     ml_insights = relationship('MLInsight', back_populates='user', cascade='all, delete-orphan')
     receipts = relationship('Receipt', back_populates='user', cascade='all, delete-orphan')
+    sessions = relationship('UserSession', back_populates='user', cascade='all, delete-orphan')
 
     def to_dict(self):
         """Convert user to dictionary (excluding sensitive data)"""
@@ -5,27 +5,68 @@ Handles password hashing, JWT tokens, and TOTP 2FA
 import bcrypt
 import pyotp
 import jwt
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+from app.utils.cache import TTLCache
 
 
 class AuthService:
     """Authentication service for user management"""
 
+    # Verified token -> claims, and user ID -> True for users known to exist
+    token_cache = TTLCache(maxsize=10000, ttl=300)
+    user_cache = TTLCache(maxsize=10000, ttl=300)
+
+    @staticmethod
+    def init_cache(config):
+        """
+        Size the auth caches from app config
+
+        Args:
+            config: Flask app config (AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+        """
+        maxsize = config.get('AUTH_CACHE_SIZE', 10000)
+        ttl = config.get('AUTH_CACHE_TTL', 300)
+        AuthService.token_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        AuthService.user_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    # Default bcrypt cost factor (overridden by BCRYPT_ROUNDS)
+    BCRYPT_ROUNDS = 12
+
     @staticmethod
-    def hash_password(password: str) -> str:
+    def hash_password(password: str, rounds: Optional[int] = None) -> str:
         """
         Hash password using bcrypt
 
         Args:
             password: Plain text password
+            rounds: Optional bcrypt cost factor (defaults to BCRYPT_ROUNDS)
 
         Returns:
             Hashed password
         """
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=rounds or AuthService.BCRYPT_ROUNDS)
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
+    @staticmethod
+    def needs_rehash(hashed: str, rounds: Optional[int] = None) -> bool:
+        """
+        Check whether a hash was made with a different cost factor
+
+        Args:
+            hashed: bcrypt hash ($2b$<cost>$...)
+            rounds: Target cost factor (defaults to BCRYPT_ROUNDS)
+
+        Returns:
+            True if the hash should be regenerated
+        """
+        try:
+            cost = int(hashed.split('$')[2])
+        except (IndexError, ValueError):
+            return True
+        return cost != (rounds or AuthService.BCRYPT_ROUNDS)
+
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
         """
@@ -82,7 +123,8 @@ class AuthService:
         return totp.verify(code, valid_window=1)
 
     @staticmethod
-    def generate_token(user_id: int, secret_key: str, expires_in: int = 2592000) -> str:
+    def generate_token(user_id: int, secret_key: str, expires_in: int = 2592000,
+                       jti: Optional[str] = None) -> str:
         """
         Generate JWT token
 
@@ -90,6 +132,7 @@ class AuthService:
             user_id: User ID to encode
             secret_key: JWT secret key
             expires_in: Token expiration in seconds (default 30 days)
+            jti: Optional JWT ID used to revoke the token
 
         Returns:
             JWT token
@@ -99,6 +142,8 @@ class AuthService:
             'exp': datetime.utcnow() + timedelta(seconds=expires_in),
             'iat': datetime.utcnow()
         }
+        if jti:
+            payload['jti'] = jti
         return jwt.encode(payload, secret_key, algorithm='HS256')
 
     @staticmethod
@@ -113,14 +158,79 @@ class AuthService:
         Returns:
             User ID if token is valid, None otherwise
         """
+        payload = AuthService.decode_token(token, secret_key)
+        return payload.get('user_id') if payload else None
+
+    @staticmethod
+    def decode_token(token: str, secret_key: str) -> Optional[dict]:
+        """
+        Verify JWT token and return its claims
+
+        Args:
+            token: JWT token
+            secret_key: JWT secret key
+
+        Returns:
+            Claims dictionary if token is valid, None otherwise
+        """
         try:
-            payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-            return payload.get('user_id')
+            return jwt.decode(token, secret_key, algorithms=['HS256'])
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
 
+    @staticmethod
+    def get_token_claims(token: str, secret_key: str) -> Optional[dict]:
+        """
+        Verify JWT token, answering from the verified-claims cache when possible
+
+        Cached entries never outlive the token's own expiry.
+
+        Args:
+            token: JWT token
+            secret_key: JWT secret key
+
+        Returns:
+            Claims dictionary if token is valid, None otherwise
+        """
+        claims = AuthService.token_cache.get(token)
+        if claims is not None:
+            return claims
+
+        claims = AuthService.decode_token(token, secret_key)
+        if not claims:
+            return None
+
+        ttl = min(AuthService.token_cache.ttl, claims.get('exp', 0) - time.time())
+        AuthService.token_cache.set(token, claims, ttl=ttl)
+        return claims
+
+    @staticmethod
+    def invalidate_token(token: str):
+        """
+        Drop a token from the verified-claims cache
+
+        Args:
+            token: JWT token
+        """
+        AuthService.token_cache.pop(token)
+
+    @staticmethod
+    def invalidate_user(user_id: int):
+        """
+        Drop a user's cached row and all of their cached token claims
+
+        Call after logout, password change and 2FA changes.
+
+        Args:
+            user_id: User ID
+        """
+        AuthService.user_cache.pop(user_id)
+        AuthService.token_cache.discard_where(
+            lambda token, claims: claims.get('user_id') == user_id
+        )
+
     @staticmethod
     def generate_qr_code_data_uri(totp_uri: str) -> str:
         """
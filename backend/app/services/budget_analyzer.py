@@ -7,6 +7,7 @@ from app.models.subscription import Subscription
 from app.models.user import User
 from app.services.billing_cycle import BillingCycleCalculator
 from app.services.currency_converter import CurrencyConverter
+from app.services.insights.forecast import SpendingForecast
 
 
 class BudgetAnalyzer:
@@ -86,7 +87,9 @@ class BudgetAnalyzer:
 
         utilization = (monthly_spending / budget * 100) if budget > 0 else 0
         remaining = budget - monthly_spending
-        projected_yearly = monthly_spending * 12
+
+        # Actual payments over the next 12 calendar months (renewal dates, cancellations, price drift)
+        projected_yearly = SpendingForecast.for_user(user_id)['total']['expected']
 
         return {
             'monthly_budget': round(budget, 2),
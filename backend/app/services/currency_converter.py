@@ -2,63 +2,230 @@
 Currency Converter Service
 Handles currency exchange rates and conversions
 """
-import requests
-from datetime import datetime
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime, date
+from typing import Iterable, Optional
+from sqlalchemy import func
 from app import db
 from app.models.currency import Currency
+from app.models.exchange_rate import ExchangeRate
+
+
+# Display symbol per currency code (also used to spot currencies in receipt text)
+CURRENCY_SYMBOLS = {
+    'USD': '$',
+    'EUR': '€',
+    'GBP': '£',
+    'JPY': '¥',
+    'AUD': 'A$',
+    'CAD': 'C$',
+    'CHF': 'CHF',
+    'CNY': '¥',
+    'SEK': 'kr',
+    'NZD': 'NZ$',
+    'MXN': 'MX$',
+    'SGD': 'S$',
+    'HKD': 'HK$',
+    'NOK': 'kr',
+    'KRW': '₩',
+    'TRY': '₺',
+    'RUB': '₽',
+    'INR': '₹',
+    'BRL': 'R$',
+    'ZAR': 'R'
+}
+
+
+class RateHistory:
+    """
+    In-memory daily exchange rate series
+
+    Rates are stored per currency code as two packed arrays (date ordinals
+    and rates) sorted by date, so a point-in-time lookup is a bisect.
+
+    Writes from other processes are picked up by comparing a cheap
+    fingerprint of the table (row count, highest ID, sum of rates) at most
+    every VERSION_CHECK_SECONDS; the series is reloaded when it changed.
+    """
+
+    VERSION_CHECK_SECONDS = 30
+
+    def __init__(self):
+        self._series = {}
+        self._loaded = False
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop the in-memory series so the next lookup reloads it"""
+        with self._lock:
+            self._series = {}
+            self._loaded = False
+            self._version = None
+
+    @staticmethod
+    def _current_version() -> tuple:
+        """Fingerprint of the rate history table"""
+        return tuple(db.session.query(
+            func.count(ExchangeRate.id),
+            func.max(ExchangeRate.id),
+            func.sum(ExchangeRate.rate)
+        ).one())
+
+    def _refresh(self):
+        """Load the series on first use, and again when the table changed"""
+        if self._loaded and time.monotonic() - self._checked_at < self.VERSION_CHECK_SECONDS:
+            return
+
+        with self._lock:
+            if self._loaded and time.monotonic() - self._checked_at < self.VERSION_CHECK_SECONDS:
+                return
+
+            version = self._current_version()
+            if not self._loaded or version != self._version:
+                self._load()
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def _load(self):
+        """Load all rate history rows from the database"""
+        series = {}
+        rows = db.session.query(
+            ExchangeRate.code,
+            ExchangeRate.date,
+            ExchangeRate.rate
+        ).order_by(ExchangeRate.code, ExchangeRate.date).all()
+
+        for code, rate_date, rate in rows:
+            if code not in series:
+                series[code] = (array('l'), array('d'))
+            ordinals, rates = series[code]
+            ordinals.append(rate_date.toordinal())
+            rates.append(rate)
+
+        self._series = series
+        self._loaded = True
+
+    def rate_at(self, code: str, at: date) -> Optional[float]:
+        """
+        Get the most recent known rate for a currency on or before a date
+
+        Args:
+            code: Currency code
+            at: Point in time
+
+        Returns:
+            Rate to USD base, or None if no rate is known for that date
+        """
+        self._refresh()
+
+        entry = self._series.get(code)
+        if not entry:
+            return None
+
+        ordinals, rates = entry
+        index = bisect_right(ordinals, at.toordinal())
+        if index == 0:
+            return None
+
+        return rates[index - 1]
 
 
 class CurrencyConverter:
     """Currency conversion and exchange rate management"""
 
-    FIXER_API_URL = 'https://api.fixer.io/latest'
+    # Rows per statement when bulk importing rate history
+    IMPORT_CHUNK_SIZE = 1000
+
+    history = RateHistory()
+
+    @staticmethod
+    def _rebase_to_usd(base: str, rates: dict) -> dict:
+        """
+        Convert a rate table to USD base
+
+        Args:
+            base: Base currency code of the table
+            rates: Currency code -> rate relative to base
+
+        Returns:
+            Currency code -> rate relative to USD
+        """
+        rates = dict(rates)
+        rates.setdefault(base, 1.0)
+
+        if base != 'USD' and 'USD' in rates:
+            usd_rate = rates['USD']
+            rates = {code: rate / usd_rate for code, rate in rates.items()}
+
+        return rates
 
     @staticmethod
-    def update_exchange_rates(api_key: str) -> bool:
+    def update_exchange_rates(api_key: Optional[str] = None, provider=None) -> bool:
         """
-        Fetch and update exchange rates from Fixer.io
+        Fetch and update exchange rates from a rate provider
+
+        Uses the Fixer.io provider with api_key when no provider is given.
+        If the provider reports the source unchanged (HTTP 304 or same
+        file), nothing is written.
 
         Args:
             api_key: Fixer.io API key
+            provider: Optional BaseRateProvider instance
 
         Returns:
-            True if successful, False otherwise
+            True if successful (including not modified), False otherwise
         """
+        from app.services.exchange_rates import FixerRateProvider, RateProviderError
+
+        if provider is None:
+            provider = FixerRateProvider({'api_key': api_key})
+
         try:
-            response = requests.get(
-                CurrencyConverter.FIXER_API_URL,
-                params={'access_key': api_key},
-                timeout=10
-            )
+            snapshots = provider.fetch()
 
-            data = response.json()
+            if snapshots is None:
+                print("Exchange rates not modified, skipping update")
+                return True
 
-            if not data.get('success'):
-                print(f"Fixer API error: {data.get('error', {}).get('info', 'Unknown error')}")
+            if not snapshots:
+                print("Exchange rate provider returned no rates")
                 return False
 
-            # Update rates in database
-            base = data.get('base', 'EUR')
-            rates = data.get('rates', {})
+            # Record every snapshot in the history (historical files may hold years)
+            history_rows = []
+            for snapshot in snapshots:
+                usd_rates = CurrencyConverter._rebase_to_usd(snapshot['base'], snapshot['rates'])
+                history_rows.extend(
+                    (code, snapshot['date'], rate) for code, rate in usd_rates.items()
+                )
+
+            CurrencyConverter._upsert_rate_history(history_rows, source=provider.name)
 
-            # If base is not USD, convert all rates to USD base
-            if base != 'USD' and 'USD' in rates:
-                usd_rate = rates['USD']
-                for code in rates:
-                    rates[code] = rates[code] / usd_rate
+            # Update all currencies with matching codes from the latest snapshot
+            latest = snapshots[-1]
+            rates = CurrencyConverter._rebase_to_usd(latest['base'], latest['rates'])
+            now = datetime.now()
 
-            # Update all currencies with matching codes
-            for code, rate in rates.items():
-                currencies = db.session.query(Currency).filter_by(code=code).all()
-                for currency in currencies:
-                    currency.rate = rate
-                    currency.last_updated = datetime.now()
+            currencies = db.session.query(Currency).filter(
+                Currency.code.in_(list(rates.keys()))
+            ).all()
+            for currency in currencies:
+                if currency.rate != rates[currency.code]:
+                    currency.rate = rates[currency.code]
+                currency.last_updated = now
 
             db.session.commit()
+            provider.confirm_validators()
+            CurrencyConverter.history.invalidate()
             print(f"Updated {len(rates)} exchange rates")
             return True
 
-        except requests.RequestException as e:
+        except RateProviderError as e:
             print(f"Error fetching exchange rates: {e}")
             return False
         except Exception as e:
@@ -67,7 +234,124 @@ class CurrencyConverter:
             return False
 
     @staticmethod
-    def convert(amount: float, from_currency_id: int, to_currency_id: int) -> float:
+    def _upsert_rate_history(rows: list, source: str) -> int:
+        """
+        Insert or overwrite (code, date) rate history rows in chunks
+
+        Args:
+            rows: List of (code, date, rate) tuples
+            source: Source label stored with each row
+
+        Returns:
+            Number of rows written
+        """
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # Last value wins for duplicate (code, date) pairs within the batch
+        deduped = {}
+        for code, rate_date, rate in rows:
+            deduped[(code.upper(), rate_date)] = float(rate)
+
+        mappings = [
+            {'code': code, 'date': rate_date, 'rate': rate, 'source': source}
+            for (code, rate_date), rate in deduped.items()
+        ]
+
+        chunk_size = CurrencyConverter.IMPORT_CHUNK_SIZE
+        for start in range(0, len(mappings), chunk_size):
+            stmt = insert(ExchangeRate).values(mappings[start:start + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['code', 'date'],
+                set_={'rate': stmt.excluded.rate, 'source': stmt.excluded.source}
+            )
+            db.session.execute(stmt)
+
+        return len(mappings)
+
+    @staticmethod
+    def import_rate_history(rows: Iterable, source: str = 'import') -> int:
+        """
+        Bulk import historical exchange rates for backfilling
+
+        Existing rows for the same code and date are overwritten.
+
+        Args:
+            rows: Iterable of (code, date, rate) tuples or dicts with
+                  code, date and rate keys; dates may be date objects or
+                  YYYY-MM-DD strings, rates are relative to USD base
+            source: Source label stored with each row
+
+        Returns:
+            Number of rows imported
+
+        Raises:
+            ValueError: If a row is malformed
+        """
+        parsed = []
+        for row in rows:
+            if isinstance(row, dict):
+                code, rate_date, rate = row.get('code'), row.get('date'), row.get('rate')
+            else:
+                code, rate_date, rate = row
+
+            if not isinstance(code, str) or not code.strip() or len(code.strip()) > 10:
+                raise ValueError(f"Invalid currency code: {row}")
+
+            if isinstance(rate_date, str):
+                rate_date = datetime.strptime(rate_date, '%Y-%m-%d').date()
+            elif isinstance(rate_date, datetime):
+                rate_date = rate_date.date()
+            elif not isinstance(rate_date, date):
+                raise ValueError(f"Invalid date: {row}")
+
+            if isinstance(rate, bool) or not isinstance(rate, (int, float, str)):
+                raise ValueError(f"Invalid rate: {row}")
+            rate = float(rate)
+            if not rate > 0 or rate == float('inf'):
+                raise ValueError(f"Rate must be positive: {row}")
+
+            parsed.append((code.strip(), rate_date, rate))
+
+        try:
+            count = CurrencyConverter._upsert_rate_history(parsed, source)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        CurrencyConverter.history.invalidate()
+        return count
+
+    @staticmethod
+    def get_rate(currency: Currency, at: Optional[date] = None) -> float:
+        """
+        Get a currency's rate to USD base, optionally at a point in time
+
+        Falls back to the current rate when no history exists for the date.
+
+        Args:
+            currency: Currency instance
+            at: Optional date for historical lookup
+
+        Returns:
+            Exchange rate to USD base
+        """
+        if at is not None:
+            if isinstance(at, datetime):
+                at = at.date()
+            rate = CurrencyConverter.history.rate_at(currency.code, at)
+            if rate is not None:
+                return rate
+
+        return currency.rate
+
+    @staticmethod
+    def convert(amount: float, from_currency_id: int, to_currency_id: int,
+                at: Optional[date] = None) -> float:
         """
         Convert amount from one currency to another
 
@@ -75,6 +359,7 @@ class CurrencyConverter:
             amount: Amount to convert
             from_currency_id: Source currency ID
             to_currency_id: Target currency ID
+            at: Optional date to convert at that day's rates
 
         Returns:
             Converted amount
@@ -92,8 +377,8 @@ class CurrencyConverter:
             raise ValueError(f"Target currency not found: {to_currency_id}")
 
         # Convert to USD first, then to target currency
-        amount_in_usd = amount / from_currency.rate
-        return amount_in_usd * to_currency.rate
+        amount_in_usd = amount / CurrencyConverter.get_rate(from_currency, at)
+        return amount_in_usd * CurrencyConverter.get_rate(to_currency, at)
 
     @staticmethod
     def get_supported_currencies() -> dict:
@@ -137,26 +422,4 @@ class CurrencyConverter:
         Returns:
             Currency symbol
         """
-        symbols = {
-            'USD': '$',
-            'EUR': '€',
-            'GBP': '£',
-            'JPY': '¥',
-            'AUD': 'A$',
-            'CAD': 'C$',
-            'CHF': 'CHF',
-            'CNY': '¥',
-            'SEK': 'kr',
-            'NZD': 'NZ$',
-            'MXN': 'MX$',
-            'SGD': 'S$',
-            'HKD': 'HK$',
-            'NOK': 'kr',
-            'KRW': '₩',
-            'TRY': '₺',
-            'RUB': '₽',
-            'INR': '₹',
-            'BRL': 'R$',
-            'ZAR': 'R'
-        }
-        return symbols.get(code, code)
+        return CURRENCY_SYMBOLS.get(code, code)
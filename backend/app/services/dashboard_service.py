@@ -0,0 +1,405 @@
+"""
+Dashboard Service
+Computes all dashboard widgets from one snapshot of a user's data
+"""
+from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models.household import HouseholdMember
+from app.models.subscription import Subscription
+from app.models.currency import Currency
+from app.models.user import User
+from app.services.billing_cycle import BillingCycleCalculator
+from app.services.currency_converter import CurrencyConverter
+from app.services.insights.forecast import SpendingForecast
+from app.utils.cache import TTLCache
+from app.utils.data_version import get_data_version
+
+
+class DashboardService:
+    """
+    Build dashboard widgets in a single aggregation pass
+
+    Loads the user, their currencies and all their subscriptions (with
+    lookups) once, then walks the subscriptions one time, feeding every
+    requested widget. Widget payloads match the corresponding
+    /statistics/* and /budget endpoints, which are served from here too.
+
+    Each widget is cached per user data version and day. A request
+    computes only the widgets missing from the cache, in one pass, and
+    slices what it needs out of the cached payloads, so repeated or
+    differently-filtered requests don't reload anything.
+    """
+
+    WIDGETS = ('overview', 'by_category', 'by_payment_method', 'by_payer', 'settlement',
+               'upcoming', 'most_expensive', 'budget')
+
+    # Largest look-ahead and most_expensive length a request can ask for
+    MAX_UPCOMING_DAYS = 365
+    MAX_LIMIT = 50
+
+    cache = TTLCache(maxsize=4096, ttl=3600)
+
+    @staticmethod
+    def parse_include(value: str) -> list:
+        """
+        Parse the include parameter (comma-separated, dashes or underscores)
+
+        Args:
+            value: e.g. "overview,by-category,budget" (empty = all widgets)
+
+        Returns:
+            List of widget names
+
+        Raises:
+            ValueError: If a widget name is unknown
+        """
+        if not value:
+            return list(DashboardService.WIDGETS)
+
+        widgets = []
+        for name in value.split(','):
+            name = name.strip().lower().replace('-', '_')
+            if not name:
+                continue
+            if name not in DashboardService.WIDGETS:
+                raise ValueError(
+                    f"Unknown widget: {name}. Must be one of: {', '.join(DashboardService.WIDGETS)}"
+                )
+            if name not in widgets:
+                widgets.append(name)
+
+        return widgets
+
+    @staticmethod
+    def build(user_id: int, include: list, upcoming_days: int = 30, limit: int = 5) -> dict:
+        """
+        Get the requested widgets, computing the ones not cached for the user's data version
+
+        Args:
+            user_id: User ID
+            include: Widget names (see WIDGETS)
+            upcoming_days: Look-ahead for the upcoming widget (at most MAX_UPCOMING_DAYS)
+            limit: Number of entries in the most_expensive widget (at most MAX_LIMIT)
+
+        Returns:
+            Dictionary of widget name -> payload (shared; don't modify)
+        """
+        key = (user_id, get_data_version(db.session, user_id), datetime.now().date().isoformat())
+        widgets = {}
+        for name in include:
+            payload = DashboardService.cache.get((*key, name))
+            if payload is not None:
+                widgets[name] = payload
+
+        missing = [name for name in include if name not in widgets]
+        if missing:
+            for name, payload in DashboardService.compute(user_id, missing).items():
+                DashboardService.cache.set((*key, name), payload)
+                widgets[name] = payload
+
+        data = {}
+        for name in include:
+            if name == 'upcoming':
+                data[name] = [entry for entry in widgets[name] if entry['days_until_renewal'] <= upcoming_days]
+            elif name == 'most_expensive':
+                data[name] = widgets[name][:limit]
+            else:
+                data[name] = widgets[name]
+        return data
+
+    @staticmethod
+    def compute(user_id: int, include: list = WIDGETS) -> dict:
+        """
+        Compute widgets
+
+        The upcoming widget covers MAX_UPCOMING_DAYS and most_expensive
+        holds MAX_LIMIT entries; build() narrows them per request.
+
+        Args:
+            user_id: User ID
+            include: Widget names (default: all)
+
+        Returns:
+            Dictionary of widget name -> payload, for the included widgets
+        """
+        include = set(include)
+        user = db.session.get(User, user_id)
+        main_currency_id = user.main_currency if user else None
+
+        currencies = {
+            currency.id: currency
+            for currency in db.session.query(Currency).filter_by(user_id=user_id).all()
+        }
+
+        subscriptions = db.session.query(Subscription).options(
+            joinedload(Subscription.currency),
+            joinedload(Subscription.category),
+            joinedload(Subscription.payment_method),
+            joinedload(Subscription.payer)
+        ).filter(Subscription.user_id == user_id).order_by(Subscription.id).all()
+
+        today = datetime.now().date()
+        upcoming_end = today + timedelta(days=DashboardService.MAX_UPCOMING_DAYS)
+
+        active_count = 0
+        inactive_count = 0
+        total_monthly = 0.0
+        savings = 0.0
+        categories = {}
+        payment_methods = {}
+        payers = {}
+        shared = []
+        upcoming = []
+        costs = []
+
+        for sub in subscriptions:
+            monthly_cost = BillingCycleCalculator.calculate_monthly_cost(
+                sub.price,
+                sub.cycle,
+                sub.frequency
+            )
+
+            # Convert to main currency
+            if main_currency_id and sub.currency_id != main_currency_id:
+                monthly_cost = DashboardService._convert(
+                    monthly_cost, sub.currency_id, main_currency_id, currencies
+                )
+
+            if sub.inactive:
+                inactive_count += 1
+                savings += monthly_cost
+                continue
+
+            active_count += 1
+            total_monthly += monthly_cost
+
+            # Category breakdown
+            if 'by_category' in include:
+                category_name = sub.category.name if sub.category else 'Uncategorized'
+                entry = categories.get(category_name)
+                if entry is None:
+                    entry = categories[category_name] = {
+                        'category_id': sub.category_id if sub.category else None,
+                        'category_name': category_name,
+                        'monthly_cost': 0.0,
+                        'yearly_cost': 0.0,
+                        'subscription_count': 0
+                    }
+                entry['monthly_cost'] += monthly_cost
+                entry['yearly_cost'] += monthly_cost * 12
+                entry['subscription_count'] += 1
+
+            # Payment method breakdown
+            if 'by_payment_method' in include:
+                pm_name = sub.payment_method.name if sub.payment_method else 'No Payment Method'
+                entry = payment_methods.get(pm_name)
+                if entry is None:
+                    entry = payment_methods[pm_name] = {
+                        'payment_method_id': sub.payment_method_id if sub.payment_method else None,
+                        'payment_method_name': pm_name,
+                        'monthly_cost': 0.0,
+                        'yearly_cost': 0.0,
+                        'subscription_count': 0
+                    }
+                entry['monthly_cost'] += monthly_cost
+                entry['yearly_cost'] += monthly_cost * 12
+                entry['subscription_count'] += 1
+
+            # Payer breakdown
+            payer_id = sub.payer_user_id if sub.payer else None
+            if 'by_payer' in include:
+                entry = payers.get(payer_id)
+                if entry is None:
+                    entry = payers[payer_id] = {
+                        'payer_id': payer_id,
+                        'payer_name': sub.payer.name if sub.payer else 'No Payer',
+                        'monthly_cost': 0.0,
+                        'yearly_cost': 0.0,
+                        'subscription_count': 0
+                    }
+                entry['monthly_cost'] += monthly_cost
+                entry['yearly_cost'] += monthly_cost * 12
+                entry['subscription_count'] += 1
+
+            if sub.shared:
+                shared.append((monthly_cost, payer_id))
+
+            if sub.next_payment and today <= sub.next_payment <= upcoming_end:
+                upcoming.append(sub)
+
+            costs.append((monthly_cost, sub))
+
+        widgets = {}
+
+        if 'overview' in include:
+            currency_symbol = '$'
+            if main_currency_id and main_currency_id in currencies:
+                currency_symbol = currencies[main_currency_id].symbol
+
+            widgets['overview'] = {
+                'active_subscriptions': active_count,
+                'inactive_subscriptions': inactive_count,
+                'total_subscriptions': active_count + inactive_count,
+                'total_monthly_cost': round(total_monthly, 2),
+                'total_yearly_cost': round(total_monthly * 12, 2),
+                'average_subscription_cost': round(total_monthly / active_count if active_count else 0, 2),
+                'currency_symbol': currency_symbol
+            }
+
+        if 'by_category' in include:
+            widgets['by_category'] = DashboardService._breakdown(categories)
+        if 'by_payment_method' in include:
+            widgets['by_payment_method'] = DashboardService._breakdown(payment_methods)
+        if 'by_payer' in include:
+            widgets['by_payer'] = DashboardService._breakdown(payers)
+
+        if 'settlement' in include:
+            members = db.session.query(HouseholdMember).filter_by(
+                user_id=user_id
+            ).order_by(HouseholdMember.id).all()
+            widgets['settlement'] = DashboardService._settlement(shared, members)
+
+        if 'upcoming' in include:
+            upcoming.sort(key=lambda sub: (sub.next_payment, sub.id))
+            widgets['upcoming'] = [
+                {
+                    'subscription': sub.to_dict(),
+                    'days_until_renewal': (sub.next_payment - today).days
+                }
+                for sub in upcoming
+            ]
+
+        if 'most_expensive' in include:
+            costs.sort(key=lambda item: round(item[0], 2), reverse=True)
+            widgets['most_expensive'] = [
+                {
+                    'subscription': sub.to_dict(),
+                    'monthly_cost': round(monthly_cost, 2),
+                    'yearly_cost': round(monthly_cost * 12, 2)
+                }
+                for monthly_cost, sub in costs[:DashboardService.MAX_LIMIT]
+            ]
+
+        if 'budget' in include:
+            budget = (user.budget if user else 0) or 0
+            spending = round(total_monthly, 2)
+            widgets['budget'] = {
+                'monthly_budget': round(budget, 2),
+                'current_spending': spending,
+                'utilization': round((spending / budget * 100) if budget > 0 else 0, 2),
+                'remaining': round(budget - spending, 2),
+                'projected_yearly': round(SpendingForecast.for_user(user_id)['total']['expected'], 2),
+                'savings_from_inactive': round(savings, 2)
+            }
+
+        return widgets
+
+    @staticmethod
+    def _convert(amount: float, from_id: int, to_id: int, currencies: dict) -> float:
+        """Convert with the preloaded currencies, keeping the amount if a currency is missing"""
+        from_currency = currencies.get(from_id)
+        to_currency = currencies.get(to_id)
+
+        if from_currency is None or to_currency is None:
+            try:
+                return CurrencyConverter.convert(amount, from_id, to_id)
+            except ValueError:
+                return amount
+
+        return amount / CurrencyConverter.get_rate(from_currency) * CurrencyConverter.get_rate(to_currency)
+
+    @staticmethod
+    def _settlement(shared: list, members: list) -> dict:
+        """
+        Who owes whom for shared subscriptions (monthly, in the main currency)
+
+        Each shared subscription is split equally among all household
+        members; its payer covers the full price. Amounts are settled in
+        whole cents: the total is divided evenly and the cents left over go
+        one each to the first members by ID, so shares add up to the total
+        and balances to zero. Members' balances are settled greedily (largest
+        debtor pays largest creditor first), in at most n-1 transfers for n
+        members.
+        Shared subscriptions without a payer can't be settled and are only
+        counted.
+
+        Args:
+            shared: (monthly cost, payer ID or None) per active shared subscription
+            members: Household members
+
+        Returns:
+            Dictionary with members' paid/share/balance, transfers and totals
+        """
+        paid = {member.id: 0.0 for member in members}
+        unassigned = 0
+
+        for monthly_cost, payer_id in shared:
+            if payer_id not in paid:
+                unassigned += 1
+                continue
+            paid[payer_id] += monthly_cost
+
+        paid = {member_id: round(amount * 100) for member_id, amount in paid.items()}
+        total = sum(paid.values())
+
+        # Even split; the remainder cents go to the first members by ID
+        base, remainder = divmod(total, len(members)) if members else (0, 0)
+        shares = {member.id: base + (1 if index < remainder else 0)
+                  for index, member in enumerate(sorted(members, key=lambda member: member.id))}
+
+        balances = {member.id: paid[member.id] - shares[member.id] for member in members}
+        names = {member.id: member.name for member in members}
+        creditors = sorted((member_id for member_id in balances if balances[member_id] > 0),
+                           key=lambda member_id: -balances[member_id])
+        debtors = sorted((member_id for member_id in balances if balances[member_id] < 0),
+                         key=lambda member_id: balances[member_id])
+
+        owed = {member_id: balances[member_id] for member_id in creditors}
+        owing = {member_id: -balances[member_id] for member_id in debtors}
+        transfers = []
+        creditor_index = 0
+        for debtor in debtors:
+            while owing[debtor] > 0 and creditor_index < len(creditors):
+                creditor = creditors[creditor_index]
+                amount = min(owing[debtor], owed[creditor])
+                transfers.append({
+                    'from_member_id': debtor,
+                    'from_name': names[debtor],
+                    'to_member_id': creditor,
+                    'to_name': names[creditor],
+                    'amount': amount / 100
+                })
+                owing[debtor] -= amount
+                owed[creditor] -= amount
+                if owed[creditor] == 0:
+                    creditor_index += 1
+
+        return {
+            'members': [
+                {
+                    'member_id': member.id,
+                    'name': member.name,
+                    'paid': paid[member.id] / 100,
+                    'share': shares[member.id] / 100,
+                    'balance': balances[member.id] / 100
+                }
+                for member in members
+            ],
+            'transfers': transfers,
+            'shared_monthly_cost': total / 100,
+            'shared_subscriptions': len(shared) - unassigned,
+            'unassigned_shared_subscriptions': unassigned
+        }
+
+    @staticmethod
+    def _breakdown(groups: dict) -> list:
+        """Round group totals and sort by monthly cost descending"""
+        result = []
+        for entry in groups.values():
+            entry['monthly_cost'] = round(entry['monthly_cost'], 2)
+            entry['yearly_cost'] = round(entry['yearly_cost'], 2)
+            result.append(entry)
+
+        result.sort(key=lambda x: x['monthly_cost'], reverse=True)
+        return result
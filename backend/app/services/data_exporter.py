@@ -0,0 +1,297 @@
+"""
+Data Exporter
+Streams subscriptions, notification history and statistics as CSV, NDJSON or JSON
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterable, Iterator
+from app import db
+from app.models.subscription import Subscription
+from app.models.currency import Currency
+from app.models.category import Category
+from app.models.payment_method import PaymentMethod
+from app.models.household import HouseholdMember
+from app.models.notification import NotificationLog
+from app.services.statistics_service import StatisticsService
+
+
+class DataExporter:
+    """
+    Export user data without materializing it
+
+    Row generators read through yield_per cursors, so only one batch of
+    rows is in memory at a time; encoders turn rows into text chunks and
+    gzip_stream optionally compresses them on the fly.
+    """
+
+    BATCH_SIZE = 500  # Rows fetched per round trip
+    FLUSH_SIZE = 65536  # Bytes buffered before a chunk is emitted
+
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+        'json': 'application/json'
+    }
+
+    # Column names match the import format, so exports can be re-imported
+    SUBSCRIPTION_COLUMNS = [
+        'id', 'name', 'price', 'currency', 'cycle', 'frequency', 'next_payment',
+        'auto_renew', 'category', 'payment_method', 'payer', 'shared', 'url', 'logo', 'notes',
+        'notify_days_before', 'inactive', 'cancellation_date', 'created_at'
+    ]
+
+    NOTIFICATION_COLUMNS = [
+        'id', 'sent_at', 'channel', 'notification_type', 'status',
+        'subscription_id', 'subscription', 'error_message'
+    ]
+
+    STATISTICS_COLUMNS = [
+        'section', 'id', 'name', 'subscription_count', 'monthly_cost', 'yearly_cost'
+    ]
+
+    @staticmethod
+    def iter_subscriptions(user_id: int, include_inactive: bool = True) -> Iterator[tuple]:
+        """
+        Stream a user's subscriptions with lookups resolved to names
+
+        Args:
+            user_id: User ID
+            include_inactive: Include inactive subscriptions
+
+        Yields:
+            Tuples in SUBSCRIPTION_COLUMNS order
+        """
+        query = db.session.query(
+            Subscription.id,
+            Subscription.name,
+            Subscription.price,
+            Currency.code,
+            Subscription.cycle,
+            Subscription.frequency,
+            Subscription.next_payment,
+            Subscription.auto_renew,
+            Category.name,
+            PaymentMethod.name,
+            HouseholdMember.name,
+            Subscription.shared,
+            Subscription.url,
+            Subscription.logo,
+            Subscription.notes,
+            Subscription.notify_days_before,
+            Subscription.inactive,
+            Subscription.cancellation_date,
+            Subscription.created_at
+        ).outerjoin(
+            Currency, Currency.id == Subscription.currency_id
+        ).outerjoin(
+            Category, Category.id == Subscription.category_id
+        ).outerjoin(
+            PaymentMethod, PaymentMethod.id == Subscription.payment_method_id
+        ).outerjoin(
+            HouseholdMember, HouseholdMember.id == Subscription.payer_user_id
+        ).filter(Subscription.user_id == user_id)
+
+        if not include_inactive:
+            query = query.filter(Subscription.inactive == False)
+
+        for row in query.order_by(Subscription.id).yield_per(DataExporter.BATCH_SIZE):
+            yield tuple(row)
+
+    @staticmethod
+    def iter_notifications(user_id: int, channel: str = None) -> Iterator[tuple]:
+        """
+        Stream a user's notification history, newest first
+
+        Args:
+            user_id: User ID
+            channel: Optional channel filter
+
+        Yields:
+            Tuples in NOTIFICATION_COLUMNS order
+        """
+        query = db.session.query(
+            NotificationLog.id,
+            NotificationLog.sent_at,
+            NotificationLog.channel,
+            NotificationLog.notification_type,
+            NotificationLog.status,
+            NotificationLog.subscription_id,
+            Subscription.name,
+            NotificationLog.error_message
+        ).outerjoin(
+            Subscription, Subscription.id == NotificationLog.subscription_id
+        ).filter(NotificationLog.user_id == user_id)
+
+        if channel:
+            query = query.filter(NotificationLog.channel == channel)
+
+        for row in query.order_by(NotificationLog.sent_at.desc()).yield_per(DataExporter.BATCH_SIZE):
+            yield tuple(row)
+
+    @staticmethod
+    def iter_statistics(user_id: int) -> Iterator[tuple]:
+        """
+        Stream the spending report: overview, per category, per payment method
+
+        Args:
+            user_id: User ID
+
+        Yields:
+            Tuples in STATISTICS_COLUMNS order
+        """
+        overview = StatisticsService.get_overview(user_id)
+        yield (
+            'overview', None, 'Active subscriptions',
+            overview['active_subscriptions'],
+            overview['total_monthly_cost'],
+            overview['total_yearly_cost']
+        )
+
+        for item in StatisticsService.get_by_category(user_id):
+            yield (
+                'category', item['category_id'], item['category_name'],
+                item['subscription_count'], item['monthly_cost'], item['yearly_cost']
+            )
+
+        for item in StatisticsService.get_by_payment_method(user_id):
+            yield (
+                'payment_method', item['payment_method_id'], item['payment_method_name'],
+                item['subscription_count'], item['monthly_cost'], item['yearly_cost']
+            )
+
+    @staticmethod
+    def _text(value):
+        """Render a value for CSV"""
+        if value is None:
+            return ''
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _json_default(value):
+        """JSON encoder fallback for dates"""
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        raise TypeError(f'Object of type {value.__class__.__name__} is not JSON serializable')
+
+    @staticmethod
+    def encode_csv(columns: list, rows: Iterable[tuple]) -> Iterator[str]:
+        """
+        Encode rows as CSV, emitting chunks of about FLUSH_SIZE characters
+
+        Args:
+            columns: Header row
+            rows: Row tuples
+
+        Yields:
+            CSV text chunks
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+        text = DataExporter._text
+        for row in rows:
+            writer.writerow([text(value) for value in row])
+            if buffer.tell() >= DataExporter.FLUSH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def encode_ndjson(columns: list, rows: Iterable[tuple]) -> Iterator[str]:
+        """
+        Encode rows as newline-delimited JSON objects
+
+        Args:
+            columns: Object keys
+            rows: Row tuples
+
+        Yields:
+            NDJSON text chunks
+        """
+        encoder = json.JSONEncoder(default=DataExporter._json_default, ensure_ascii=False)
+        parts = []
+        size = 0
+
+        for row in rows:
+            line = encoder.encode(dict(zip(columns, row)))
+            parts.append(line)
+            size += len(line) + 1
+            if size >= DataExporter.FLUSH_SIZE:
+                yield '\n'.join(parts) + '\n'
+                parts = []
+                size = 0
+
+        if parts:
+            yield '\n'.join(parts) + '\n'
+
+    @staticmethod
+    def encode_json(columns: list, rows: Iterable[tuple]) -> Iterator[str]:
+        """
+        Encode rows as a JSON array of objects, written incrementally
+
+        Args:
+            columns: Object keys
+            rows: Row tuples
+
+        Yields:
+            JSON text chunks
+        """
+        yield '['
+        first = True
+        for chunk in DataExporter.encode_ndjson(columns, rows):
+            lines = chunk.rstrip('\n').replace('\n', ',\n')
+            yield lines if first else ',\n' + lines
+            first = False
+        yield ']\n'
+
+    @staticmethod
+    def encode(fmt: str, columns: list, rows: Iterable[tuple]) -> Iterator[str]:
+        """
+        Encode rows in the given format
+
+        Args:
+            fmt: csv, ndjson or json
+            columns: Column names
+            rows: Row tuples
+
+        Returns:
+            Iterator of text chunks
+
+        Raises:
+            ValueError: If format is not supported
+        """
+        if fmt == 'csv':
+            return DataExporter.encode_csv(columns, rows)
+        if fmt == 'ndjson':
+            return DataExporter.encode_ndjson(columns, rows)
+        if fmt == 'json':
+            return DataExporter.encode_json(columns, rows)
+        raise ValueError(f"Unsupported format: {fmt}. Use 'csv', 'ndjson' or 'json'")
+
+    @staticmethod
+    def gzip_stream(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+        """
+        Compress text chunks into a gzip stream
+
+        Args:
+            chunks: Text chunks
+            level: Compression level (1-9)
+
+        Yields:
+            Compressed bytes
+        """
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,55 @@
+"""
+Exchange Rate Providers Package
+"""
+from typing import Optional
+from app.services.exchange_rates.base import BaseRateProvider, RateProviderError
+from app.services.exchange_rates.fixer_provider import FixerRateProvider
+from app.services.exchange_rates.http_provider import HTTPRateProvider
+from app.services.exchange_rates.file_provider import FileRateProvider
+
+PROVIDER_MAP = {
+    'fixer': FixerRateProvider,
+    'http': HTTPRateProvider,
+    'file': FileRateProvider
+}
+
+
+def get_rate_provider(config) -> Optional[BaseRateProvider]:
+    """
+    Build the exchange rate provider selected in app config
+
+    Args:
+        config: Flask app config (or any mapping)
+
+    Returns:
+        Provider instance, or None if the selected provider is not configured
+    """
+    name = (config.get('EXCHANGE_RATE_PROVIDER') or 'fixer').lower()
+
+    if name == 'fixer':
+        if not config.get('FIXER_API_KEY'):
+            return None
+        return FixerRateProvider({'api_key': config['FIXER_API_KEY']})
+
+    if name == 'http':
+        if not config.get('EXCHANGE_RATE_URL'):
+            return None
+        return HTTPRateProvider({'url': config['EXCHANGE_RATE_URL']})
+
+    if name == 'file':
+        if not config.get('EXCHANGE_RATE_FILE'):
+            return None
+        return FileRateProvider({'path': str(config['EXCHANGE_RATE_FILE'])})
+
+    raise ValueError(f"Unknown exchange rate provider: {name}")
+
+
+__all__ = [
+    'BaseRateProvider',
+    'RateProviderError',
+    'FixerRateProvider',
+    'HTTPRateProvider',
+    'FileRateProvider',
+    'PROVIDER_MAP',
+    'get_rate_provider'
+]
@@ -0,0 +1,194 @@
+"""
+Base Exchange Rate Provider
+Abstract class for all exchange rate sources
+"""
+import csv
+import io
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+import requests
+
+
+class RateProviderError(Exception):
+    """Raised when a provider cannot produce exchange rates"""
+
+
+class BaseRateProvider(ABC):
+    """
+    Base class for all exchange rate providers
+
+    fetch() returns a list of snapshots sorted by date, each a dict:
+    {'base': 'EUR', 'date': date, 'rates': {'USD': 1.08, ...}}
+
+    It returns None when the source reports no change since the last
+    fetch, so callers can skip all database writes. Validators of a
+    fetched response are only used for the next request once the caller
+    has stored the rates and calls confirm_validators().
+    """
+
+    name = 'base'
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize provider
+
+        Args:
+            config: Provider-specific configuration dictionary
+        """
+        self.config = config or {}
+
+        # Validators from the last successfully stored fetch (conditional GET)
+        self.etag = None
+        self.last_modified = None
+
+        # Validators of the last fetch, until the caller confirms it stored the rates
+        self.pending_validators = None
+
+    @abstractmethod
+    def fetch(self) -> Optional[List[Dict]]:
+        """
+        Fetch exchange rate snapshots
+
+        Returns:
+            List of snapshots, or None if unchanged since last fetch
+
+        Raises:
+            RateProviderError: If rates cannot be fetched or parsed
+        """
+        pass
+
+    def conditional_get(self, url: str, params: Optional[Dict] = None,
+                        timeout: int = 10) -> Optional[requests.Response]:
+        """
+        GET a URL with If-None-Match / If-Modified-Since validators
+
+        Args:
+            url: URL to fetch
+            params: Optional query parameters
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response on 200, None on 304 Not Modified
+
+        Raises:
+            RateProviderError: On network errors or unexpected status codes
+        """
+        self.pending_validators = None
+
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        try:
+            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            raise RateProviderError(f"Error fetching exchange rates: {e}")
+
+        if response.status_code == 304:
+            return None
+
+        if response.status_code != 200:
+            raise RateProviderError(f"Exchange rate source returned HTTP {response.status_code}")
+
+        return response
+
+    def remember_validators(self, response: requests.Response):
+        """
+        Hold ETag / Last-Modified of a parsed response until confirm_validators()
+
+        Args:
+            response: HTTP response
+        """
+        self.pending_validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+    def confirm_validators(self):
+        """Use the last fetch's validators from now on (call after its rates were committed)"""
+        if self.pending_validators is not None:
+            self.etag, self.last_modified = self.pending_validators
+            self.pending_validators = None
+
+    @staticmethod
+    def parse_ecb_xml(content: bytes) -> List[Dict]:
+        """
+        Parse ECB eurofxref XML (daily or historical)
+
+        Args:
+            content: Raw XML bytes
+
+        Returns:
+            List of EUR-based snapshots sorted by date
+        """
+        try:
+            root = ET.fromstring(content)
+        except ET.ParseError as e:
+            raise RateProviderError(f"Invalid ECB XML: {e}")
+
+        snapshots = []
+        for cube in root.iter():
+            if not cube.tag.endswith('Cube') or 'time' not in cube.attrib:
+                continue
+
+            rates = {'EUR': 1.0}
+            try:
+                for rate_cube in cube:
+                    code = rate_cube.attrib.get('currency')
+                    rate = rate_cube.attrib.get('rate')
+                    if code and rate:
+                        rates[code] = float(rate)
+                rate_date = datetime.strptime(cube.attrib['time'], '%Y-%m-%d').date()
+            except ValueError as e:
+                raise RateProviderError(f"Invalid ECB XML: {e}")
+
+            snapshots.append({'base': 'EUR', 'date': rate_date, 'rates': rates})
+
+        snapshots.sort(key=lambda s: s['date'])
+        return snapshots
+
+    @staticmethod
+    def parse_ecb_csv(text: str) -> List[Dict]:
+        """
+        Parse ECB eurofxref CSV (one row per date, one column per currency)
+
+        Args:
+            text: CSV text with a "Date" column followed by currency codes
+
+        Returns:
+            List of EUR-based snapshots sorted by date
+        """
+        reader = csv.reader(io.StringIO(text))
+        try:
+            header = [column.strip() for column in next(reader)]
+        except StopIteration:
+            raise RateProviderError("Empty ECB CSV")
+
+        if not header or header[0].lower() != 'date':
+            raise RateProviderError("ECB CSV must start with a Date column")
+
+        snapshots = []
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+
+            rates = {'EUR': 1.0}
+            try:
+                for code, value in zip(header[1:], row[1:]):
+                    value = value.strip()
+                    if not code or not value or value == 'N/A':
+                        continue
+                    rates[code] = float(value)
+
+                try:
+                    rate_date = datetime.strptime(row[0].strip(), '%Y-%m-%d').date()
+                except ValueError:
+                    rate_date = datetime.strptime(row[0].strip(), '%d %B %Y').date()
+            except ValueError as e:
+                raise RateProviderError(f"Invalid ECB CSV: {e}")
+
+            snapshots.append({'base': 'EUR', 'date': rate_date, 'rates': rates})
+
+        snapshots.sort(key=lambda s: s['date'])
+        return snapshots
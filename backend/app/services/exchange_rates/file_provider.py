@@ -0,0 +1,51 @@
+"""
+File Exchange Rate Provider
+Reads ECB XML/CSV files from local disk for air-gapped deployments
+"""
+import os
+from typing import Dict, List, Optional
+from app.services.exchange_rates.base import BaseRateProvider, RateProviderError
+
+
+class FileRateProvider(BaseRateProvider):
+    """
+    Local file exchange rate provider
+
+    Reads an ECB eurofxref file (.xml or .csv, daily or historical).
+    The file's mtime and size act as the validator, so an unchanged
+    file is reported as not modified without being parsed.
+    """
+
+    name = 'file'
+
+    def fetch(self) -> Optional[List[Dict]]:
+        """
+        Read rates from the configured file
+
+        Returns:
+            List of snapshots, or None if the file is unchanged
+        """
+        path = self.config.get('path')
+        if not path:
+            raise RateProviderError("Exchange rate file not configured")
+
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise RateProviderError(f"Cannot read exchange rate file: {e}")
+
+        self.pending_validators = None
+        validator = f'{stat.st_mtime_ns}-{stat.st_size}'
+        if validator == self.etag:
+            return None
+
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        if path.lower().endswith('.csv'):
+            snapshots = self.parse_ecb_csv(content.decode('utf-8'))
+        else:
+            snapshots = self.parse_ecb_xml(content)
+
+        self.pending_validators = (validator, None)
+        return snapshots
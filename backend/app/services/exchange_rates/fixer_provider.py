@@ -0,0 +1,52 @@
+"""
+Fixer Exchange Rate Provider
+Fetches latest rates from the Fixer.io API
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.services.exchange_rates.base import BaseRateProvider, RateProviderError
+
+
+class FixerRateProvider(BaseRateProvider):
+    """Fixer.io exchange rate provider"""
+
+    name = 'fixer'
+
+    API_URL = 'https://api.fixer.io/latest'
+
+    def fetch(self) -> Optional[List[Dict]]:
+        """
+        Fetch latest rates from Fixer.io
+
+        Returns:
+            Single-snapshot list, or None if unchanged since last fetch
+        """
+        api_key = self.config.get('api_key')
+        if not api_key:
+            raise RateProviderError("Fixer API key not configured")
+
+        response = self.conditional_get(
+            self.config.get('url', self.API_URL),
+            params={'access_key': api_key}
+        )
+        if response is None:
+            return None
+
+        data = response.json()
+
+        if not data.get('success'):
+            raise RateProviderError(
+                f"Fixer API error: {data.get('error', {}).get('info', 'Unknown error')}"
+            )
+
+        rate_date = datetime.now().date()
+        if data.get('date'):
+            rate_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+
+        self.remember_validators(response)
+
+        return [{
+            'base': data.get('base', 'EUR'),
+            'date': rate_date,
+            'rates': data.get('rates', {})
+        }]
@@ -0,0 +1,56 @@
+"""
+HTTP Exchange Rate Provider
+Fetches rates from any HTTP endpoint (ECB mirror, local stub, intranet)
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.services.exchange_rates.base import BaseRateProvider, RateProviderError
+
+
+class HTTPRateProvider(BaseRateProvider):
+    """
+    Generic HTTP exchange rate provider
+
+    Accepts ECB XML, ECB CSV or Fixer-style JSON
+    ({"base": "EUR", "date": "2025-01-15", "rates": {...}}),
+    detected from the response Content-Type.
+    """
+
+    name = 'http'
+
+    def fetch(self) -> Optional[List[Dict]]:
+        """
+        Fetch rates from the configured URL
+
+        Returns:
+            List of snapshots, or None if unchanged since last fetch
+        """
+        url = self.config.get('url')
+        if not url:
+            raise RateProviderError("Exchange rate URL not configured")
+
+        response = self.conditional_get(url)
+        if response is None:
+            return None
+
+        content_type = response.headers.get('Content-Type', '').lower()
+
+        if 'xml' in content_type or url.endswith('.xml'):
+            snapshots = self.parse_ecb_xml(response.content)
+        elif 'csv' in content_type or url.endswith('.csv'):
+            snapshots = self.parse_ecb_csv(response.text)
+        else:
+            data = response.json()
+            if 'rates' not in data:
+                raise RateProviderError("JSON response has no rates")
+            rate_date = datetime.now().date()
+            if data.get('date'):
+                rate_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+            snapshots = [{
+                'base': data.get('base', 'EUR'),
+                'date': rate_date,
+                'rates': data['rates']
+            }]
+
+        self.remember_validators(response)
+        return snapshots
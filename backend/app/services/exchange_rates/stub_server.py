@@ -0,0 +1,101 @@
+"""
+Local Exchange Rate Stub Server
+Serves a rates file over HTTP with ETag / Last-Modified support
+
+Useful for tests, benchmarks and offline development:
+
+    python -m app.services.exchange_rates.stub_server rates.xml --port 8099
+
+then set EXCHANGE_RATE_PROVIDER=http and
+EXCHANGE_RATE_URL=http://localhost:8099/rates.xml
+"""
+import argparse
+import hashlib
+import os
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CONTENT_TYPES = {
+    '.xml': 'application/xml',
+    '.csv': 'text/csv',
+    '.json': 'application/json'
+}
+
+
+def make_handler(path: str):
+    """
+    Build a request handler serving a single file
+
+    Args:
+        path: File to serve on every GET
+
+    Returns:
+        BaseHTTPRequestHandler subclass
+    """
+
+    class RateStubHandler(BaseHTTPRequestHandler):
+        """Serve the rates file, answering 304 when validators match"""
+
+        def do_GET(self):
+            with open(path, 'rb') as f:
+                body = f.read()
+
+            stat = os.stat(path)
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+            if_none_match = self.headers.get('If-None-Match')
+            if_modified_since = self.headers.get('If-Modified-Since')
+            if (if_none_match == etag or
+                    (if_none_match is None and if_modified_since == last_modified)):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            extension = os.path.splitext(path)[1].lower()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPES.get(extension, 'application/octet-stream'))
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RateStubHandler
+
+
+def start_stub_server(path: str, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stub server in a background thread
+
+    Args:
+        path: Rates file to serve
+        host: Bind address
+        port: Port (0 picks a free port)
+
+    Returns:
+        Running server; use server.server_address for the bound port and
+        server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve an exchange rate file over HTTP')
+    parser.add_argument('path', help='ECB XML/CSV or Fixer-style JSON file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.path))
+    print(f"Serving {args.path} on http://{args.host}:{args.port}/")
+    server.serve_forever()
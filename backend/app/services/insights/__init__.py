@@ -0,0 +1,12 @@
+"""
+Insights Package
+"""
+from app.services.insights.history import SubscriptionHistory
+from app.services.insights.anomaly_detector import AnomalyDetector
+from app.services.insights.forecast import SpendingForecast
+
+__all__ = [
+    'SubscriptionHistory',
+    'AnomalyDetector',
+    'SpendingForecast'
+]
@@ -0,0 +1,354 @@
+"""
+Anomaly Detector
+Nightly batch detection of subscription anomalies for all users at once
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from app import db
+from app.models.ml_insight import MLInsight
+from app.services.insights.history import SubscriptionHistory, CYCLE_DAYS, MONTHLY_FACTORS
+from app.utils.data_version import bump_data_version
+from app.utils.names import compact_name, url_domain
+from app.utils.serialization import dumps
+
+
+class AnomalyDetector:
+    """
+    Vectorized anomaly detectors writing MLInsight rows in bulk
+
+    All users' subscriptions and price history are loaded into columnar
+    arrays (SubscriptionHistory) and every detector runs over whole
+    columns, so a nightly run costs a handful of queries and NumPy passes
+    however many users there are. Each detector produces at most one
+    insight per user; users who still have an undismissed insight of the
+    same kind are skipped.
+    """
+
+    INSIGHT_TYPE = 'anomaly'
+    KINDS = ('price_jump', 'duplicate_service', 'unused_subscription', 'spend_spike')
+
+    PRICE_JUMP_DAYS = 45  # look back this far for price increases
+    PRICE_JUMP_THRESHOLD = 0.10  # +10%
+    PRICE_JUMP_CRITICAL = 0.50
+
+    SPIKE_DAYS = 30  # compare monthly spending with this many days ago
+    SPIKE_THRESHOLD = 0.25  # +25%
+    SPIKE_MIN_INCREASE = 10.0  # in the user's main currency
+    SPIKE_MAX_DRIVERS = 5
+
+    USER_CHUNK_SIZE = 1000  # user IDs per batch when running for selected users
+
+    def __init__(self, today: Optional[date] = None):
+        self.today = today or date.today()
+        self.day = self.today.toordinal()
+
+    def run(self, user_ids: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Detect anomalies and store new insights
+
+        Args:
+            user_ids: Users to check (default: all), e.g. users with changes in the change feed
+
+        Returns:
+            {'users', 'detected', 'created', 'skipped'}
+        """
+        if user_ids is None:
+            return self._run(None)
+
+        user_ids = sorted(set(user_ids))
+        totals = {'users': 0, 'detected': 0, 'created': 0, 'skipped': 0}
+        for start in range(0, len(user_ids), self.USER_CHUNK_SIZE):
+            result = self._run(user_ids[start:start + self.USER_CHUNK_SIZE])
+            for key, value in result.items():
+                totals[key] += value
+        return totals
+
+    def _run(self, user_ids: Optional[list]) -> Dict:
+        """Detect and store insights for one batch of users"""
+        history = SubscriptionHistory.load(user_ids)
+        insights = self.detect(history)
+
+        open_kinds = self._open_kinds({insight['user_id'] for insight in insights})
+        rows = [insight for insight in insights if (insight['user_id'], insight['kind']) not in open_kinds]
+
+        if rows:
+            db.session.bulk_insert_mappings(MLInsight, rows)
+            bump_data_version(db.session, {row['user_id'] for row in rows})
+        db.session.commit()
+
+        return {
+            'users': len(history.users),
+            'detected': len(insights),
+            'created': len(rows),
+            'skipped': len(insights) - len(rows)
+        }
+
+    def detect(self, history: SubscriptionHistory) -> List[Dict]:
+        """
+        Run all detectors
+
+        Args:
+            history: Loaded subscription history
+
+        Returns:
+            MLInsight mappings
+        """
+        insights = []
+        insights += self.detect_price_jumps(history)
+        insights += self.detect_duplicates(history)
+        insights += self.detect_unused(history)
+        insights += self.detect_spend_spikes(history)
+        return insights
+
+    def _open_kinds(self, user_ids: set) -> set:
+        """(user_id, kind) pairs with an undismissed insight"""
+        if not user_ids:
+            return set()
+
+        rows = db.session.query(MLInsight.user_id, MLInsight.kind).filter(
+            MLInsight.user_id.in_(sorted(user_ids)),
+            MLInsight.kind.in_(self.KINDS),
+            MLInsight.dismissed.is_(False)
+        ).distinct().all()
+        return {(user_id, kind) for user_id, kind in rows}
+
+    def _insight(self, user_id: int, kind: str, title: str, description: str,
+                 severity: str, data: Dict) -> Dict:
+        """Build an MLInsight mapping"""
+        return {
+            'user_id': int(user_id),
+            'insight_type': self.INSIGHT_TYPE,
+            'kind': kind,
+            'title': title,
+            'description': description,
+            'data': dumps(data),
+            'severity': severity,
+            'dismissed': False
+        }
+
+    @staticmethod
+    def _by_user(history: SubscriptionHistory, rows: np.ndarray) -> Dict[int, list]:
+        """Group subscription rows by owner"""
+        grouped = defaultdict(list)
+        for row, user_id in zip(rows.tolist(), history.subscriptions['user_id'][rows].tolist()):
+            grouped[user_id].append(row)
+        return grouped
+
+    def detect_price_jumps(self, history: SubscriptionHistory) -> List[Dict]:
+        """Active subscriptions whose price rose PRICE_JUMP_THRESHOLD or more within PRICE_JUMP_DAYS"""
+        subscriptions = history.subscriptions
+        positions, old_price, old_currency_id = history.first_change_after(self.day - self.PRICE_JUMP_DAYS)
+
+        price = subscriptions['price'][positions]
+        same_currency = old_currency_id == subscriptions['currency_id'][positions]
+        active = ~subscriptions['inactive'][positions]
+
+        increase = np.divide(price - old_price, old_price, out=np.zeros_like(price), where=old_price > 0)
+        flagged = same_currency & active & (increase >= self.PRICE_JUMP_THRESHOLD)
+
+        increases = dict(zip(positions[flagged].tolist(), zip(old_price[flagged].tolist(), increase[flagged].tolist())))
+
+        insights = []
+        for user_id, rows in self._by_user(history, positions[flagged]).items():
+            items = []
+            for row in rows:
+                previous, change = increases[row]
+                items.append({
+                    'subscription_id': int(subscriptions['id'][row]),
+                    'name': history.names[row],
+                    'old_price': round(previous, 2),
+                    'new_price': round(float(subscriptions['price'][row]), 2),
+                    'increase_pct': round(change * 100, 1)
+                })
+            items.sort(key=lambda item: item['increase_pct'], reverse=True)
+
+            top = items[0]
+            if len(items) == 1:
+                title = f"Price increase: {top['name']}"
+            else:
+                title = f'Price increases on {len(items)} subscriptions'
+            description = (
+                f"{top['name']} went from {top['old_price']:.2f} to {top['new_price']:.2f} "
+                f"(+{top['increase_pct']:g}%) in the last {self.PRICE_JUMP_DAYS} days."
+            )
+            severity = 'critical' if top['increase_pct'] >= self.PRICE_JUMP_CRITICAL * 100 else 'warning'
+            insights.append(self._insight(user_id, 'price_jump', title, description, severity, {'items': items}))
+
+        return insights
+
+    def detect_duplicates(self, history: SubscriptionHistory) -> List[Dict]:
+        """Users paying for the same service twice (same normalized name or website)"""
+        subscriptions = history.subscriptions
+        active = np.flatnonzero(~subscriptions['inactive'])
+        if not len(active):
+            return []
+
+        duplicated = np.zeros(len(subscriptions['id']), dtype=bool)
+        group_of = {}
+
+        names = np.array([compact_name(history.names[row]) for row in active], dtype=object)
+        domains = np.array([url_domain(history.urls[row]) or '' for row in active], dtype=object)
+
+        for key_type, keys in enumerate((names, domains)):
+            usable = keys != ''
+            if not usable.any():
+                continue
+            rows = active[usable]
+            key_codes = np.unique(keys[usable].astype(str), return_inverse=True)[1]
+
+            # One code per (user, key): duplicates are codes seen more than once
+            combined = subscriptions['user_index'][rows] * (key_codes.max() + 1) + key_codes
+            _, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+            repeated = counts[inverse] > 1
+            duplicated[rows[repeated]] = True
+            for row, code in zip(rows[repeated].tolist(), combined[repeated].tolist()):
+                group_of.setdefault(row, (key_type, code))
+
+        insights = []
+        for user_id, rows in self._by_user(history, np.flatnonzero(duplicated)).items():
+            groups = defaultdict(list)
+            for row in rows:
+                groups[group_of[row]].append(row)
+
+            items = []
+            for group in groups.values():
+                monthly = subscriptions['monthly_main'][group]
+                items.append({
+                    'subscriptions': [
+                        {'id': int(subscriptions['id'][row]), 'name': history.names[row]} for row in group
+                    ],
+                    'monthly_cost': round(float(monthly.sum()), 2),
+                    'potential_savings': round(float(monthly.sum() - monthly.max()), 2)
+                })
+            items.sort(key=lambda item: item['potential_savings'], reverse=True)
+
+            names_list = ', '.join(entry['name'] for entry in items[0]['subscriptions'])
+            savings = sum(item['potential_savings'] for item in items)
+            insights.append(self._insight(
+                user_id,
+                'duplicate_service',
+                'Possible duplicate subscriptions',
+                f'These look like the same service: {names_list}. '
+                f'Keeping one of each could save {savings:.2f} per month.',
+                'warning',
+                {'items': items, 'potential_savings': round(savings, 2)}
+            ))
+
+        return insights
+
+    def detect_unused(self, history: SubscriptionHistory) -> List[Dict]:
+        """
+        Active subscriptions that look abandoned but are still counted as paid
+
+        Flags subscriptions past their cancellation date, and ones whose
+        next payment is more than a full billing period overdue (the
+        renewal was never recorded).
+        """
+        subscriptions = history.subscriptions
+        active = ~subscriptions['inactive']
+
+        cancellation = subscriptions['cancellation_date']
+        past_cancellation = active & (cancellation > 0) & (cancellation < self.day)
+
+        period = CYCLE_DAYS[subscriptions['cycle']] * subscriptions['frequency']
+        next_payment = subscriptions['next_payment']
+        not_renewed = active & (next_payment > 0) & (next_payment + period < self.day)
+
+        flagged = past_cancellation | not_renewed
+
+        insights = []
+        for user_id, rows in self._by_user(history, np.flatnonzero(flagged)).items():
+            items = [{
+                'subscription_id': int(subscriptions['id'][row]),
+                'name': history.names[row],
+                'reason': 'past_cancellation_date' if past_cancellation[row] else 'not_renewed',
+                'monthly_cost': round(float(subscriptions['monthly_main'][row]), 2)
+            } for row in rows]
+            items.sort(key=lambda item: item['monthly_cost'], reverse=True)
+
+            monthly = sum(item['monthly_cost'] for item in items)
+            if len(items) == 1:
+                title = f"Still paying for {items[0]['name']}?"
+            else:
+                title = f'{len(items)} subscriptions may be unused'
+            insights.append(self._insight(
+                user_id,
+                'unused_subscription',
+                title,
+                f'{len(items)} active subscription(s) are past their cancellation date or have not '
+                f'renewed for over a billing period ({monthly:.2f} per month).',
+                'info',
+                {'items': items, 'monthly_cost': round(monthly, 2)}
+            ))
+
+        return insights
+
+    def detect_spend_spikes(self, history: SubscriptionHistory) -> List[Dict]:
+        """Users whose monthly spending rose SPIKE_THRESHOLD or more within SPIKE_DAYS"""
+        subscriptions = history.subscriptions
+        if not len(subscriptions['id']):
+            return []
+
+        then = self.day - self.SPIKE_DAYS
+        user_index = subscriptions['user_index']
+        users = len(history.users)
+
+        active_now = ~subscriptions['inactive']
+        existed_then = subscriptions['created'] <= then
+        active_then = existed_then & (active_now | (subscriptions['cancellation_date'] > then))
+
+        price_then, currency_then = history.price_at(then)
+        monthly_then = (
+            price_then / subscriptions['frequency'] * MONTHLY_FACTORS[subscriptions['cycle']]
+            * history.conversion(currency_then, user_index)
+        )
+
+        now_costs = np.where(active_now, subscriptions['monthly_main'], 0.0)
+        then_costs = np.where(active_then, monthly_then, 0.0)
+        spend_now = np.bincount(user_index, weights=now_costs, minlength=users)
+        spend_then = np.bincount(user_index, weights=then_costs, minlength=users)
+
+        spiked = (
+            (spend_then > 0)
+            & (spend_now >= spend_then * (1 + self.SPIKE_THRESHOLD))
+            & (spend_now - spend_then >= self.SPIKE_MIN_INCREASE)
+        )
+        if not spiked.any():
+            return []
+
+        # Subscriptions that added the most to the increase
+        growth = now_costs - then_costs
+        drivers = np.flatnonzero(spiked[user_index] & (growth > 0))
+
+        insights = []
+        for user_id, rows in self._by_user(history, drivers).items():
+            index = int(np.searchsorted(history.users, user_id))
+            now, before = float(spend_now[index]), float(spend_then[index])
+            increase = (now - before) / before * 100
+
+            rows.sort(key=lambda row: growth[row], reverse=True)
+            items = [{
+                'subscription_id': int(subscriptions['id'][row]),
+                'name': history.names[row],
+                'reason': 'new' if not active_then[row] else 'price_increase',
+                'monthly_increase': round(float(growth[row]), 2)
+            } for row in rows[:self.SPIKE_MAX_DRIVERS]]
+
+            insights.append(self._insight(
+                user_id,
+                'spend_spike',
+                'Monthly spending jumped',
+                f'Your monthly subscription spending rose {increase:.0f}% in the last {self.SPIKE_DAYS} days '
+                f'(from {before:.2f} to {now:.2f}), mostly from {items[0]["name"]}.',
+                'warning',
+                {
+                    'monthly_spend': round(now, 2),
+                    'previous_monthly_spend': round(before, 2),
+                    'increase_pct': round(increase, 1),
+                    'drivers': items
+                }
+            ))
+
+        return insights
@@ -0,0 +1,270 @@
+"""
+Spending Forecast
+Month-by-month cash flow forecast from actual payment dates
+"""
+from datetime import date
+from typing import Dict, Optional
+import numpy as np
+from app import db
+from app.services.insights.history import SubscriptionHistory
+from app.utils.cache import TTLCache
+from app.utils.data_version import get_data_version
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+# Shortest length in days of one billing cycle unit, indexed by cycle
+MIN_CYCLE_DAYS = np.array([0, 1, 7, 28, 365])
+
+# Average length in days of one billing cycle unit, indexed by cycle
+AVG_CYCLE_DAYS = np.array([0.0, 1.0, 7.0, 30.44, 365.25])
+
+
+class SpendingForecast:
+    """
+    Forecast subscription payments for the coming months
+
+    Every active subscription is expanded into its individual payment
+    dates (as arrays, one element per payment) from its next payment date
+    and billing cycle; payments on or after a known cancellation date are
+    dropped. Calendar months are complete: the current month includes
+    payments already made this month.
+
+    Prices drift by the user's observed rate of price changes, estimated
+    from their price history and shrunk towards a prior when the history
+    is short. The same estimate gives each payment's uncertainty, which
+    grows with how far ahead it is; payments of one subscription move
+    together, different subscriptions independently.
+
+    Results are cached per user data version, so a forecast is computed
+    once per change to the user's data.
+    """
+
+    DEFAULT_MONTHS = 12
+    MAX_MONTHS = 24
+
+    CONFIDENCE = 0.8
+    Z_SCORE = 1.2816  # two-sided 80% band
+
+    DRIFT_LOOKBACK_DAYS = 3 * 365  # price history used for the drift estimate
+
+    # Prior: about one price change every four years per subscription, of about +8% (+/- 10%),
+    # weighted like two subscription-years of history
+    PRIOR_YEARS = 2.0
+    PRIOR_CHANGE_RATE = 0.25
+    PRIOR_CHANGE_MEAN = 0.08  # log-price change
+    PRIOR_CHANGE_STD = 0.10
+
+    cache = TTLCache(maxsize=1024, ttl=3600)
+
+    def __init__(self, today: Optional[date] = None):
+        self.today = today or date.today()
+        self.day = self.today.toordinal() - EPOCH
+        self.month = (self.today.year - 1970) * 12 + self.today.month - 1
+
+    @classmethod
+    def for_user(cls, user_id: int, months: int = DEFAULT_MONTHS) -> Dict:
+        """
+        Forecast for one user, cached per data version
+
+        Args:
+            user_id: User ID
+            months: Number of calendar months, starting with the current one
+
+        Returns:
+            Forecast dictionary (see forecast())
+        """
+        key = (user_id, get_data_version(db.session, user_id), date.today().isoformat(), months)
+        result = cls.cache.get(key)
+        if result is None:
+            result = cls().forecast(user_id, months)
+            cls.cache.set(key, result)
+        return result
+
+    def forecast(self, user_id: int, months: int = DEFAULT_MONTHS) -> Dict:
+        """
+        Compute a forecast
+
+        Args:
+            user_id: User ID
+            months: Number of calendar months, starting with the current one
+
+        Returns:
+            {
+                'currency_id': main currency of all amounts,
+                'months': [{'month': 'YYYY-MM', 'expected', 'low', 'high', 'baseline', 'payments'}],
+                'total': {'expected', 'low', 'high', 'baseline', 'payments'},
+                'assumptions': {'confidence', 'annual_price_drift_pct', 'price_changes_observed'}
+            }
+            'baseline' is the amount at today's prices.
+        """
+        history = SubscriptionHistory.load([user_id])
+        drift, variance, observed = self._price_drift(history)
+
+        occurrences = self._occurrences(history, months)
+        rows, days, buckets = occurrences
+
+        subscriptions = history.subscriptions
+        baseline = (subscriptions['price'] * subscriptions['to_main'])[rows]
+        years = np.maximum(days - self.day, 0) / 365.25
+        expected = baseline * np.exp(drift * years)
+        spread = expected * np.sqrt(np.expm1(variance * years))
+
+        expected_by_month = np.bincount(buckets, weights=expected, minlength=months)
+        baseline_by_month = np.bincount(buckets, weights=baseline, minlength=months)
+        payments_by_month = np.bincount(buckets, minlength=months)
+        spread_by_month = self._combined_spread(rows, buckets, spread, months)
+        total_spread = self._combined_spread(rows, np.zeros_like(buckets), spread, 1)[0]
+
+        result_months = []
+        for index in range(months):
+            year, month = divmod(self.month + index, 12)
+            result_months.append(self._band(
+                expected_by_month[index], spread_by_month[index], baseline_by_month[index],
+                payments_by_month[index], month=f'{year + 1970:04d}-{month + 1:02d}'
+            ))
+
+        return {
+            'currency_id': history.main_currency.get(user_id),
+            'months': result_months,
+            'total': self._band(expected.sum(), total_spread, baseline.sum(), len(rows)),
+            'assumptions': {
+                'confidence': self.CONFIDENCE,
+                'annual_price_drift_pct': round(float(np.expm1(drift)) * 100, 2),
+                'price_changes_observed': observed
+            }
+        }
+
+    def _band(self, expected: float, spread: float, baseline: float, payments: int, **fields) -> Dict:
+        """Expected amount with its confidence band"""
+        return {
+            **fields,
+            'expected': round(float(expected), 2),
+            'low': round(max(0.0, float(expected - self.Z_SCORE * spread)), 2),
+            'high': round(float(expected + self.Z_SCORE * spread), 2),
+            'baseline': round(float(baseline), 2),
+            'payments': int(payments)
+        }
+
+    @staticmethod
+    def _combined_spread(rows: np.ndarray, buckets: np.ndarray, spread: np.ndarray, size: int) -> np.ndarray:
+        """Standard deviation per bucket: summed within a subscription, combined in quadrature across them"""
+        if not len(rows):
+            return np.zeros(size)
+        pairs, inverse = np.unique(buckets * (rows.max() + 1) + rows, return_inverse=True)
+        per_pair = np.bincount(inverse, weights=spread)
+        return np.sqrt(np.bincount(pairs // (rows.max() + 1), weights=per_pair ** 2, minlength=size))
+
+    def _price_drift(self, history: SubscriptionHistory) -> tuple:
+        """
+        Expected log-price drift and variance per year, from price history
+
+        Returns:
+            (drift, variance, number of changes observed)
+        """
+        changes = history.changes
+        subscriptions = history.subscriptions
+        since = self.day + EPOCH - self.DRIFT_LOOKBACK_DAYS
+
+        # Changes within the first billing period are corrections of the
+        # entered price, not drift: count changes and exposure from the end
+        # of that period
+        created = subscriptions['created']
+        period = AVG_CYCLE_DAYS[subscriptions['cycle']] * subscriptions['frequency']
+        settled = np.where(created > 0, created + period, since)
+        position = changes['position']
+        known = position >= 0
+        change_settled = np.zeros(len(position))
+        change_settled[known] = settled[position[known]]
+
+        usable = (
+            (changes['changed'] > since)
+            & (changes['changed'] >= change_settled)
+            & (changes['old_currency_id'] == changes['new_currency_id'])
+            & (changes['old_price'] > 0)
+            & (changes['new_price'] > 0)
+        )
+        steps = np.log(changes['new_price'][usable] / changes['old_price'][usable])
+
+        # Subscription-years of history in the lookback window
+        exposure = float(np.clip(self.day + EPOCH - np.maximum(settled, since), 0, None).sum()) / 365.25
+
+        prior_changes = self.PRIOR_YEARS * self.PRIOR_CHANGE_RATE
+        count = len(steps) + prior_changes
+        rate = count / (exposure + self.PRIOR_YEARS)
+        mean = (steps.sum() + prior_changes * self.PRIOR_CHANGE_MEAN) / count
+        second_moment = (
+            (steps ** 2).sum() + prior_changes * (self.PRIOR_CHANGE_MEAN ** 2 + self.PRIOR_CHANGE_STD ** 2)
+        ) / count
+
+        return float(rate * mean), float(rate * second_moment), int(len(steps))
+
+    def _occurrences(self, history: SubscriptionHistory, months: int) -> tuple:
+        """
+        Expand active subscriptions into payments within the forecast months
+
+        Returns:
+            (subscription rows, payment days since epoch, month buckets) arrays, one element per payment
+        """
+        subscriptions = history.subscriptions
+        start = self._month_start(np.array([self.month]))[0]
+        end = self._month_start(np.array([self.month + months]))[0]
+
+        active = np.flatnonzero(~subscriptions['inactive'])
+        cycle = subscriptions['cycle'][active]
+        frequency = subscriptions['frequency'][active]
+
+        # Anchor: the next payment date (today if unknown); earlier payments are anchor - k periods,
+        # which only happened if they fall before today (payments already made this month)
+        anchor = np.where(subscriptions['next_payment'][active] > 0,
+                          subscriptions['next_payment'][active] - EPOCH, self.day)
+        created = subscriptions['created'][active]
+        first_day = np.maximum(start, np.where(created > 0, created - EPOCH, start))
+        cancellation = subscriptions['cancellation_date'][active]
+        last_day = np.where(cancellation > 0, np.minimum(cancellation - EPOCH, end), end)
+
+        # First period index on or after the first day (estimated, then corrected)
+        first = np.ceil((first_day - anchor) / (AVG_CYCLE_DAYS[cycle] * frequency)).astype(np.int64)
+        for _ in range(3):
+            first -= self._payment_days(anchor, cycle, frequency, first - 1) >= first_day
+            first += self._payment_days(anchor, cycle, frequency, first) < first_day
+
+        counts = np.maximum((last_day - first_day) // (MIN_CYCLE_DAYS[cycle] * frequency) + 1, 0)
+        counts = np.where(last_day > first_day, counts, 0)
+
+        # One element per candidate payment: k = first, first + 1, ...
+        owner = np.repeat(np.arange(len(active)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        periods = first[owner] + offsets
+        days = self._payment_days(anchor[owner], cycle[owner], frequency[owner], periods)
+
+        keep = (days >= first_day[owner]) & (days < last_day[owner]) & ((periods >= 0) | (days < self.day))
+        days = days[keep]
+        rows = active[owner[keep]]
+        buckets = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) - self.month
+        return rows, days, buckets
+
+    @staticmethod
+    def _month_start(month_index: np.ndarray) -> np.ndarray:
+        """First day (days since epoch) of months given as months since epoch"""
+        return month_index.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+    @classmethod
+    def _payment_days(cls, anchor: np.ndarray, cycle: np.ndarray, frequency: np.ndarray,
+                      periods: np.ndarray) -> np.ndarray:
+        """
+        Payment dates k periods from an anchor date (days since epoch)
+
+        Monthly and yearly cycles keep the anchor's day of month, clipped to
+        the month's length (as BillingCycleCalculator does with relativedelta).
+        """
+        fixed = np.where(cycle == 2, 7, 1) * frequency * periods + anchor
+
+        step = np.where(cycle == 4, 12, 1) * frequency
+        anchor_month = anchor.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        day_of_month = anchor - cls._month_start(anchor_month)
+        month = anchor_month + step * periods
+        month_start = cls._month_start(month)
+        month_length = cls._month_start(month + 1) - month_start
+        calendar = month_start + np.minimum(day_of_month, month_length - 1)
+
+        return np.where(cycle >= 3, calendar, fixed)
@@ -0,0 +1,238 @@
+"""
+Subscription History
+Columnar NumPy snapshot of subscriptions and price changes for batch jobs
+"""
+from typing import Iterable, Optional
+import numpy as np
+from app import db
+from app.models.currency import Currency
+from app.models.price_change import SubscriptionPriceChange
+from app.models.subscription import Subscription
+from app.models.user import User
+
+# Months per billing cycle unit, indexed by cycle (as in BillingCycleCalculator.calculate_monthly_cost)
+MONTHLY_FACTORS = np.array([0.0, 30.44, 4.33, 1.0, 1 / 12])
+
+# Days per billing cycle unit, indexed by cycle
+CYCLE_DAYS = np.array([0.0, 1.0, 7.0, 30.44, 365.25])
+
+
+def _ordinals(values: Iterable) -> np.ndarray:
+    """Dates/datetimes as day ordinals (0 for None)"""
+    return np.array([value.toordinal() if value else 0 for value in values], dtype=np.int64)
+
+
+class SubscriptionHistory:
+    """
+    Subscriptions and their price changes as aligned column arrays
+
+    Loaded with one query per table for any number of users. Dates are day
+    ordinals (0 = not set) and every subscription carries the factor that
+    converts its currency to its owner's main currency, so detectors and
+    forecasts work on whole columns instead of looping over rows.
+
+    Subscription columns (self.subscriptions): id, user_id, user_index,
+    price, currency_id, cycle, frequency, next_payment, cancellation_date,
+    created, inactive, to_main, monthly, monthly_main; plus name and url
+    as lists.
+
+    Price change columns (self.changes), sorted by subscription and time:
+    subscription_id, position (row in the subscription columns, -1 if the
+    subscription is gone), old_price, old_currency_id, new_price,
+    new_currency_id, changed.
+    """
+
+    def __init__(self, user_ids: Optional[Iterable[int]] = None):
+        self.user_ids = None if user_ids is None else sorted(set(user_ids))
+        self.users = np.array([], dtype=np.int64)
+        self.main_currency = {}
+        self.rates = {}
+        self.subscriptions = {}
+        self.names = []
+        self.urls = []
+        self.changes = {}
+
+    @classmethod
+    def load(cls, user_ids: Optional[Iterable[int]] = None) -> 'SubscriptionHistory':
+        """
+        Load history for some or all users
+
+        Args:
+            user_ids: Users to load (default: all)
+
+        Returns:
+            SubscriptionHistory
+        """
+        history = cls(user_ids)
+        history._load_currencies()
+        history._load_subscriptions()
+        history._load_changes()
+        return history
+
+    def _filter_users(self, query, column):
+        """Restrict a query to the selected users"""
+        if self.user_ids is None:
+            return query
+        return query.filter(column.in_(self.user_ids))
+
+    def _load_currencies(self):
+        """Main currency per user and rate (to USD base) per currency"""
+        users = self._filter_users(db.session.query(User.id, User.main_currency), User.id)
+        self.main_currency = {user_id: main_currency for user_id, main_currency in users}
+
+        # Current rates (CurrencyConverter.get_rate without a date)
+        currencies = self._filter_users(db.session.query(Currency.id, Currency.rate), Currency.user_id)
+        self.rates = {currency_id: rate for currency_id, rate in currencies if rate}
+
+    def conversion(self, currency_ids: np.ndarray, user_index: np.ndarray) -> np.ndarray:
+        """
+        Factors converting amounts in the given currencies to the owners' main currencies
+
+        Amounts in unknown currencies, or for users without a main currency, are kept (factor 1).
+        """
+        main_rates = np.array([
+            self.rates.get(self.main_currency.get(int(user_id)), np.nan) for user_id in self.users
+        ], dtype=np.float64)
+
+        known = np.fromiter(self.rates.keys(), dtype=np.int64, count=len(self.rates))
+        order = np.argsort(known)
+        known = known[order]
+        known_rates = np.fromiter(self.rates.values(), dtype=np.float64, count=len(self.rates))[order]
+
+        rates = np.full(len(currency_ids), np.nan)
+        if len(known):
+            slots = np.clip(np.searchsorted(known, currency_ids), 0, len(known) - 1)
+            found = known[slots] == currency_ids
+            rates[found] = known_rates[slots[found]]
+
+        factors = main_rates[user_index] / rates if len(user_index) else np.array([], dtype=np.float64)
+        return np.where(np.isfinite(factors), factors, 1.0)
+
+    def _load_subscriptions(self):
+        """Subscription columns"""
+        query = self._filter_users(db.session.query(
+            Subscription.id,
+            Subscription.user_id,
+            Subscription.price,
+            Subscription.currency_id,
+            Subscription.cycle,
+            Subscription.frequency,
+            Subscription.next_payment,
+            Subscription.cancellation_date,
+            Subscription.created_at,
+            Subscription.inactive,
+            Subscription.name,
+            Subscription.url
+        ), Subscription.user_id).order_by(Subscription.id)
+
+        rows = query.all()
+        columns = list(zip(*rows)) if rows else [()] * 12
+
+        ids = np.array(columns[0], dtype=np.int64)
+        user_ids = np.array(columns[1], dtype=np.int64)
+        self.users, user_index = np.unique(user_ids, return_inverse=True)
+
+        cycle = np.array(columns[4], dtype=np.int64)
+        cycle = np.where((cycle >= 1) & (cycle <= 4), cycle, 3)
+        frequency = np.maximum(np.array([value or 1 for value in columns[5]], dtype=np.int64), 1)
+        price = np.array(columns[2], dtype=np.float64)
+        currency_id = np.array([value or 0 for value in columns[3]], dtype=np.int64)
+
+        to_main = self.conversion(currency_id, user_index)
+        monthly = price / frequency * MONTHLY_FACTORS[cycle]
+
+        self.subscriptions = {
+            'id': ids,
+            'user_id': user_ids,
+            'user_index': user_index,
+            'price': price,
+            'currency_id': currency_id,
+            'cycle': cycle,
+            'frequency': frequency,
+            'next_payment': _ordinals(columns[6]),
+            'cancellation_date': _ordinals(columns[7]),
+            'created': _ordinals(columns[8]),
+            'inactive': np.array([bool(value) for value in columns[9]], dtype=bool),
+            'to_main': to_main,
+            'monthly': monthly,
+            'monthly_main': monthly * to_main
+        }
+        self.names = list(columns[10])
+        self.urls = list(columns[11])
+
+    def _load_changes(self):
+        """Price change columns"""
+        query = self._filter_users(db.session.query(
+            SubscriptionPriceChange.subscription_id,
+            SubscriptionPriceChange.old_price,
+            SubscriptionPriceChange.old_currency_id,
+            SubscriptionPriceChange.new_price,
+            SubscriptionPriceChange.new_currency_id,
+            SubscriptionPriceChange.changed_at
+        ), SubscriptionPriceChange.user_id).order_by(
+            SubscriptionPriceChange.subscription_id,
+            SubscriptionPriceChange.changed_at,
+            SubscriptionPriceChange.id
+        )
+
+        rows = query.all()
+        columns = list(zip(*rows)) if rows else [()] * 6
+
+        subscription_id = np.array(columns[0], dtype=np.int64)
+        self.changes = {
+            'subscription_id': subscription_id,
+            'position': self.positions(subscription_id),
+            'old_price': np.array(columns[1], dtype=np.float64),
+            'old_currency_id': np.array([value or 0 for value in columns[2]], dtype=np.int64),
+            'new_price': np.array(columns[3], dtype=np.float64),
+            'new_currency_id': np.array([value or 0 for value in columns[4]], dtype=np.int64),
+            'changed': _ordinals(columns[5])
+        }
+
+    def positions(self, subscription_ids: np.ndarray) -> np.ndarray:
+        """Rows of the given subscriptions in the subscription columns (-1 if not loaded)"""
+        ids = self.subscriptions['id']
+        if not len(ids):
+            return np.full(len(subscription_ids), -1, dtype=np.int64)
+        slots = np.clip(np.searchsorted(ids, subscription_ids), 0, len(ids) - 1)
+        return np.where(ids[slots] == subscription_ids, slots, -1)
+
+    def first_change_after(self, day: int) -> tuple:
+        """
+        Earliest price change after a day, per subscription
+
+        Args:
+            day: Day ordinal
+
+        Returns:
+            (positions, old prices, old currency IDs) for subscriptions whose price changed since
+        """
+        changes = self.changes
+        mask = (changes['changed'] > day) & (changes['position'] >= 0)
+        subscription_id = changes['subscription_id'][mask]
+
+        # Changes are sorted by subscription and time: the first row per subscription is the earliest
+        _, first = np.unique(subscription_id, return_index=True)
+        return (
+            changes['position'][mask][first],
+            changes['old_price'][mask][first],
+            changes['old_currency_id'][mask][first]
+        )
+
+    def price_at(self, day: int) -> tuple:
+        """
+        Every subscription's price and currency as of a day
+
+        Args:
+            day: Day ordinal
+
+        Returns:
+            (prices, currency IDs) aligned with the subscription columns
+        """
+        price = self.subscriptions['price'].copy()
+        currency_id = self.subscriptions['currency_id'].copy()
+
+        positions, old_price, old_currency_id = self.first_change_after(day)
+        price[positions] = old_price
+        currency_id[positions] = old_currency_id
+        return price, currency_id
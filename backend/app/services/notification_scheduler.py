@@ -2,14 +2,23 @@
 Notification Scheduler
 Background jobs for automatic notifications
 """
+import os
+import socket
 from datetime import datetime, timedelta
+from typing import Optional
+from flask import current_app
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import func, or_
 from app import db
+from app.models.scheduler_job import SchedulerJob
 from app.models.subscription import Subscription
 from app.models.user import User
 from app.services.notifications.notification_manager import NotificationManager
 from app.services.currency_converter import CurrencyConverter
+from app.utils.change_feed import changed_users, prune_change_feed
+from app.utils.serialization import dumps
 
 
 class NotificationScheduler:
@@ -24,6 +33,8 @@ class NotificationScheduler:
         """
         self.scheduler = BackgroundScheduler()
         self.app = app
+        self.rate_provider = None
+        self.node_id = None
 
         if app:
             self.init_app(app)
@@ -36,6 +47,7 @@ class NotificationScheduler:
             app: Flask application instance
         """
         self.app = app
+        self.node_id = app.config.get('SCHEDULER_NODE_ID') or f'{socket.gethostname()}:{os.getpid()}'
 
         # Schedule jobs
         self.schedule_jobs()
@@ -49,7 +61,8 @@ class NotificationScheduler:
 
         # Daily job at 9:00 AM for upcoming payment notifications
         self.scheduler.add_job(
-            func=self.send_upcoming_payment_notifications,
+            func=self.run_claimed,
+            args=['upcoming_payments', self.send_upcoming_payment_notifications],
             trigger=CronTrigger(hour=9, minute=0),
             id='upcoming_payments',
             name='Send upcoming payment notifications',
@@ -58,7 +71,8 @@ class NotificationScheduler:
 
         # Daily job at 8:00 AM for overdue payment notifications
         self.scheduler.add_job(
-            func=self.send_overdue_notifications,
+            func=self.run_claimed,
+            args=['overdue_payments', self.send_overdue_notifications],
             trigger=CronTrigger(hour=8, minute=0),
             id='overdue_payments',
             name='Send overdue payment notifications',
@@ -67,7 +81,8 @@ class NotificationScheduler:
 
         # Daily job at 10:00 AM for cancellation reminders
         self.scheduler.add_job(
-            func=self.send_cancellation_reminders,
+            func=self.run_claimed,
+            args=['cancellation_reminders', self.send_cancellation_reminders],
             trigger=CronTrigger(hour=10, minute=0),
             id='cancellation_reminders',
             name='Send cancellation reminders',
@@ -76,91 +91,251 @@ class NotificationScheduler:
 
         # Daily job at 2:00 AM for currency rate updates
         self.scheduler.add_job(
-            func=self.update_currency_rates,
+            func=self.run_claimed,
+            args=['currency_updates', self.update_currency_rates],
             trigger=CronTrigger(hour=2, minute=0),
             id='currency_updates',
             name='Update currency exchange rates',
             replace_existing=True
         )
 
+        # Daily job at 3:00 AM for ML insights (after the currency update)
+        self.scheduler.add_job(
+            func=self.run_claimed,
+            args=['ml_insights', self.generate_ml_insights],
+            trigger=CronTrigger(hour=3, minute=0),
+            id='ml_insights',
+            name='Detect subscription anomalies',
+            replace_existing=True
+        )
+
+        # Daily job at 4:00 AM for AI recommendations (users with changes)
+        self.scheduler.add_job(
+            func=self.run_claimed,
+            args=['ai_recommendations', self.generate_ai_recommendations],
+            trigger=CronTrigger(hour=4, minute=0),
+            id='ai_recommendations',
+            name='Generate AI recommendations',
+            replace_existing=True
+        )
+
+        # Every minute: requeue stalled receipts and fill idle OCR workers
+        # (runs on every node, claims are per receipt)
+        self.scheduler.add_job(
+            func=self.dispatch_ocr_jobs,
+            trigger=IntervalTrigger(minutes=1),
+            id='ocr_dispatch',
+            name='Dispatch queued receipt OCR jobs',
+            replace_existing=True
+        )
+
         print("✅ Notification scheduler jobs configured:")
         print("  - Upcoming payments: Daily at 9:00 AM")
         print("  - Overdue payments: Daily at 8:00 AM")
         print("  - Cancellation reminders: Daily at 10:00 AM")
         print("  - Currency updates: Daily at 2:00 AM")
+        print("  - ML insights: Daily at 3:00 AM")
+        print("  - Recommendations (rules, then AI): Daily at 4:00 AM")
+        print("  - OCR queue: Every minute")
 
-    def send_upcoming_payment_notifications(self):
+    def claim_run(self, job_id: str, run_key: str) -> bool:
         """
-        Send notifications for upcoming payments
+        Claim one run of a job for this node
 
-        Checks all active subscriptions and sends notifications based on
-        user's notify_days_before setting
+        Every API node runs the same schedule against the shared database;
+        the node that claims the job row for a run key executes it and the
+        others skip. On PostgreSQL the row is locked with SKIP LOCKED so
+        competing nodes move on immediately instead of queueing on the lock;
+        the conditional update makes the claim safe on SQLite as well.
+
+        Args:
+            job_id: Scheduler job ID
+            run_key: Identifier of this run (scheduled date)
+
+        Returns:
+            True if this node should run the job
+        """
+        self._ensure_job_row(job_id)
+
+        not_claimed = or_(
+            SchedulerJob.last_run_key.is_(None),
+            SchedulerJob.last_run_key != run_key
+        )
+
+        job = db.session.query(SchedulerJob).filter(
+            SchedulerJob.name == job_id,
+            not_claimed
+        ).with_for_update(skip_locked=True).first()
+
+        if job is None:
+            db.session.rollback()
+            return False
+
+        claimed = db.session.query(SchedulerJob).filter(
+            SchedulerJob.name == job_id,
+            not_claimed
+        ).update({
+            'last_run_key': run_key,
+            'claimed_by': self.node_id,
+            'claimed_at': datetime.utcnow(),
+            'finished_at': None,
+            'last_status': 'running',
+            'last_error': None
+        }, synchronize_session=False)
+        db.session.commit()
+
+        return claimed == 1
+
+    def finish_run(self, job_id: str, error: str = None):
         """
+        Record the result of a claimed run
+
+        Args:
+            job_id: Scheduler job ID
+            error: Error message if the job failed
+        """
+        db.session.query(SchedulerJob).filter(
+            SchedulerJob.name == job_id,
+            SchedulerJob.claimed_by == self.node_id
+        ).update({
+            'finished_at': datetime.utcnow(),
+            'last_status': 'failed' if error else 'success',
+            'last_error': error
+        }, synchronize_session=False)
+        db.session.commit()
+
+    def run_claimed(self, job_id: str, func):
+        """
+        Run a job if this node claims today's run
+
+        Args:
+            job_id: Scheduler job ID
+            func: Job function; it raises on failure, which is recorded as the run's status
+        """
+        run_key = datetime.now().date().isoformat()
+
         with self.app.app_context():
             try:
-                today = datetime.now().date()
+                if not self.claim_run(job_id, run_key):
+                    current_app.logger.info(f'{job_id} ({run_key}) already claimed by another node')
+                    return
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception(f'Error claiming {job_id}')
+                return
+
+        error = None
+        try:
+            func()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.app.logger.exception(f'Error running {job_id}')
 
-                # Get all active subscriptions
-                subscriptions = db.session.query(Subscription).filter_by(inactive=False).all()
+        with self.app.app_context():
+            try:
+                self.finish_run(job_id, error)
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception(f'Error recording {job_id} result')
 
-                notifications_sent = 0
+    def pending_users(self, job_id: str) -> tuple:
+        """
+        Users an incremental job has to recompute
 
-                for sub in subscriptions:
-                    if not sub.next_payment:
-                        continue
+        Reads the change feed after the job's watermark, plus the users the
+        previous run couldn't finish. The first run, and runs more than
+        INSIGHTS_FULL_RUN_DAYS after the last full run, cover all users
+        instead, which also picks up findings that only depend on time
+        passing (a missed renewal).
 
-                    # Calculate days until payment
-                    days_until = (sub.next_payment - today).days
+        Args:
+            job_id: Scheduler job ID
 
-                    # Check if we should notify
-                    if days_until == sub.notify_days_before:
-                        # Get user's currency
-                        user = db.session.get(User, sub.user_id)
-                        currency_symbol = '$'
+        Returns:
+            (user IDs, or None for all users; new watermark)
+        """
+        job = db.session.get(SchedulerJob, job_id)
+        user_ids, watermark = changed_users(db.session, job.watermark)
 
-                        if sub.currency:
-                            currency_symbol = sub.currency.symbol
+        full_run_days = self.app.config.get('INSIGHTS_FULL_RUN_DAYS', 7)
+        if job.watermark is None or job.full_run_at is None or (
+            full_run_days and job.full_run_at <= datetime.utcnow() - timedelta(days=full_run_days)
+        ):
+            return None, watermark
 
-                        # Prepare subscription data
-                        subscription_data = {
-                            'name': sub.name,
-                            'price': sub.price,
-                            'currency_symbol': currency_symbol,
-                            'next_payment': sub.next_payment.strftime('%Y-%m-%d'),
-                            'days_until': days_until,
-                            'url': sub.url
-                        }
+        if job.retry_users:
+            user_ids = sorted(set(user_ids) | set(job.retry_users))
+        return user_ids, watermark
 
-                        # Send notification
-                        NotificationManager.send_payment_reminder(sub.user_id, subscription_data)
-                        notifications_sent += 1
+    def advance_watermark(self, job_id: str, watermark: int, full_run: bool = False,
+                          retry_user_ids: Optional[list] = None):
+        """
+        Record an incremental job's progress and prune processed change feed entries
 
-                print(f"✅ Sent {notifications_sent} upcoming payment notifications")
+        Args:
+            job_id: Scheduler job ID
+            watermark: Last change feed ID processed
+            full_run: Whether the run covered all users
+            retry_user_ids: Users that weren't processed and are picked up by the next run
+        """
+        values = {
+            'watermark': watermark if watermark is not None else 0,
+            'retry_user_ids': dumps(sorted(set(retry_user_ids))) if retry_user_ids else None
+        }
+        if full_run:
+            values['full_run_at'] = datetime.utcnow()
+
+        db.session.query(SchedulerJob).filter(SchedulerJob.name == job_id).update(
+            values, synchronize_session=False
+        )
 
-            except Exception as e:
-                print(f"❌ Error sending upcoming payment notifications: {e}")
+        # Entries every incremental job has processed (jobs without a watermark start with a full run)
+        lowest = db.session.query(func.min(SchedulerJob.watermark)).scalar()
+        prune_change_feed(db.session, lowest, self.app.config.get('CHANGE_FEED_RETENTION_DAYS', 7))
+        db.session.commit()
+
+    def _ensure_job_row(self, job_id: str):
+        """Create the job row if it doesn't exist yet"""
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(SchedulerJob).values(name=job_id).on_conflict_do_nothing(
+            index_elements=['name']
+        )
+        db.session.execute(stmt)
+        db.session.commit()
 
-    def send_overdue_notifications(self):
+    def send_upcoming_payment_notifications(self):
         """
-        Send notifications for overdue payments
+        Send notifications for upcoming payments
 
-        Checks all active subscriptions with past payment dates
+        Checks all active subscriptions and sends notifications based on
+        user's notify_days_before setting
         """
         with self.app.app_context():
-            try:
-                today = datetime.now().date()
+            today = datetime.now().date()
+
+            # Get all active subscriptions
+            subscriptions = db.session.query(Subscription).filter_by(inactive=False).all()
+
+            notifications_sent = 0
 
-                # Get overdue subscriptions
-                overdue_subscriptions = db.session.query(Subscription).filter(
-                    Subscription.inactive == False,
-                    Subscription.next_payment < today
-                ).all()
+            for sub in subscriptions:
+                if not sub.next_payment:
+                    continue
 
-                notifications_sent = 0
+                # Calculate days until payment
+                days_until = (sub.next_payment - today).days
 
-                for sub in overdue_subscriptions:
+                # Check if we should notify
+                if days_until == sub.notify_days_before:
                     # Get user's currency
+                    user = db.session.get(User, sub.user_id)
                     currency_symbol = '$'
+
                     if sub.currency:
                         currency_symbol = sub.currency.symbol
 
@@ -170,17 +345,53 @@ class NotificationScheduler:
                         'price': sub.price,
                         'currency_symbol': currency_symbol,
                         'next_payment': sub.next_payment.strftime('%Y-%m-%d'),
+                        'days_until': days_until,
                         'url': sub.url
                     }
 
                     # Send notification
-                    NotificationManager.send_overdue_reminder(sub.user_id, subscription_data)
+                    NotificationManager.send_payment_reminder(sub.user_id, subscription_data)
                     notifications_sent += 1
 
-                print(f"✅ Sent {notifications_sent} overdue payment notifications")
+            current_app.logger.info(f'Sent {notifications_sent} upcoming payment notifications')
 
-            except Exception as e:
-                print(f"❌ Error sending overdue notifications: {e}")
+    def send_overdue_notifications(self):
+        """
+        Send notifications for overdue payments
+
+        Checks all active subscriptions with past payment dates
+        """
+        with self.app.app_context():
+            today = datetime.now().date()
+
+            # Get overdue subscriptions
+            overdue_subscriptions = db.session.query(Subscription).filter(
+                Subscription.inactive == False,
+                Subscription.next_payment < today
+            ).all()
+
+            notifications_sent = 0
+
+            for sub in overdue_subscriptions:
+                # Get user's currency
+                currency_symbol = '$'
+                if sub.currency:
+                    currency_symbol = sub.currency.symbol
+
+                # Prepare subscription data
+                subscription_data = {
+                    'name': sub.name,
+                    'price': sub.price,
+                    'currency_symbol': currency_symbol,
+                    'next_payment': sub.next_payment.strftime('%Y-%m-%d'),
+                    'url': sub.url
+                }
+
+                # Send notification
+                NotificationManager.send_overdue_reminder(sub.user_id, subscription_data)
+                notifications_sent += 1
+
+            current_app.logger.info(f'Sent {notifications_sent} overdue payment notifications')
 
     def send_cancellation_reminders(self):
         """
@@ -189,65 +400,122 @@ class NotificationScheduler:
         Notifies users 7 days before cancellation date
         """
         with self.app.app_context():
-            try:
-                today = datetime.now().date()
-                reminder_date = today + timedelta(days=7)
+            today = datetime.now().date()
+            reminder_date = today + timedelta(days=7)
 
-                # Get subscriptions with cancellation date in 7 days
-                subscriptions = db.session.query(Subscription).filter(
-                    Subscription.cancellation_date == reminder_date
-                ).all()
+            # Get subscriptions with cancellation date in 7 days
+            subscriptions = db.session.query(Subscription).filter(
+                Subscription.cancellation_date == reminder_date
+            ).all()
 
-                notifications_sent = 0
-
-                for sub in subscriptions:
-                    # Get user's currency
-                    currency_symbol = '$'
-                    if sub.currency:
-                        currency_symbol = sub.currency.symbol
+            notifications_sent = 0
 
-                    # Prepare subscription data
-                    subscription_data = {
-                        'name': sub.name,
-                        'price': sub.price,
-                        'currency_symbol': currency_symbol,
-                        'cancellation_date': sub.cancellation_date.strftime('%Y-%m-%d'),
-                        'url': sub.url
-                    }
+            for sub in subscriptions:
+                # Get user's currency
+                currency_symbol = '$'
+                if sub.currency:
+                    currency_symbol = sub.currency.symbol
 
-                    # Send notification
-                    NotificationManager.send_cancellation_reminder(sub.user_id, subscription_data)
-                    notifications_sent += 1
+                # Prepare subscription data
+                subscription_data = {
+                    'name': sub.name,
+                    'price': sub.price,
+                    'currency_symbol': currency_symbol,
+                    'cancellation_date': sub.cancellation_date.strftime('%Y-%m-%d'),
+                    'url': sub.url
+                }
 
-                print(f"✅ Sent {notifications_sent} cancellation reminder notifications")
+                # Send notification
+                NotificationManager.send_cancellation_reminder(sub.user_id, subscription_data)
+                notifications_sent += 1
 
-            except Exception as e:
-                print(f"❌ Error sending cancellation reminders: {e}")
+            current_app.logger.info(f'Sent {notifications_sent} cancellation reminder notifications')
 
     def update_currency_rates(self):
         """
-        Update currency exchange rates from Fixer.io
+        Update currency exchange rates from the configured provider
 
-        Requires FIXER_API_KEY environment variable
+        Uses EXCHANGE_RATE_PROVIDER (fixer, http or file). The provider is
+        kept between runs so unchanged sources are skipped via conditional GET.
         """
         with self.app.app_context():
-            try:
-                import os
-                api_key = os.getenv('FIXER_API_KEY')
+            from app.services.exchange_rates import get_rate_provider
 
-                if not api_key:
-                    print("⚠️  FIXER_API_KEY not set, skipping currency update")
-                    return
+            if self.rate_provider is None:
+                self.rate_provider = get_rate_provider(self.app.config)
+
+            if self.rate_provider is None:
+                current_app.logger.warning('Exchange rate provider not configured, skipping currency update')
+                return
 
-                success = CurrencyConverter.update_exchange_rates(api_key)
+            if not CurrencyConverter.update_exchange_rates(provider=self.rate_provider):
+                raise RuntimeError('Failed to update currency exchange rates')
 
-                if success:
-                    print("✅ Currency exchange rates updated successfully")
+            current_app.logger.info('Currency exchange rates updated')
+
+    def generate_ml_insights(self):
+        """Run the anomaly detectors for users with changes and store new insights"""
+        with self.app.app_context():
+            try:
+                from app.services.insights import AnomalyDetector
+            except ImportError as e:
+                current_app.logger.warning(f'ML insights unavailable, skipping ({e})')
+                return
+
+            try:
+                user_ids, watermark = self.pending_users('ml_insights')
+                if user_ids == []:
+                    current_app.logger.info('No subscription changes since the last ML insights run')
                 else:
-                    print("❌ Failed to update currency exchange rates")
+                    result = AnomalyDetector().run(user_ids)
+                    scope = 'all users' if user_ids is None else f'{len(user_ids)} changed users'
+                    current_app.logger.info(f"Created {result['created']} ML insights for {scope} "
+                                            f"({result['skipped']} already open)")
+
+                self.advance_watermark('ml_insights', watermark, full_run=user_ids is None)
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def generate_ai_recommendations(self):
+        """Run the recommendation rules for users with changes and escalate the rest to the AI provider"""
+        with self.app.app_context():
+            try:
+                from app.services.recommendations import RecommendationRules, recommendation_service
 
-            except Exception as e:
-                print(f"❌ Error updating currency rates: {e}")
+                user_ids, watermark = self.pending_users('ai_recommendations')
+                retry = []
+                if user_ids == []:
+                    current_app.logger.info('No subscription changes since the last recommendations run')
+                else:
+                    rules = RecommendationRules().run(user_ids)
+                    current_app.logger.info(f"Rule-based recommendations: {rules['recommendations']} new for "
+                                            f"{rules['users']} users, {len(rules['escalated'])} escalated")
+
+                    if not recommendation_service.enabled:
+                        current_app.logger.warning('AI provider not configured, keeping escalated users for the next run')
+                        retry = rules['escalated']
+                    elif rules['escalated']:
+                        result = recommendation_service.run(rules['escalated'])
+                        retry = result['failed_users']
+                        current_app.logger.info(f"AI recommendations: {result['generated']} requests, "
+                                                f"{result['cached']} cached, {result['unchanged']} unchanged, "
+                                                f"{result['failed']} failed")
+
+                self.advance_watermark('ai_recommendations', watermark, full_run=user_ids is None,
+                                       retry_user_ids=retry)
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def dispatch_ocr_jobs(self):
+        """Requeue stalled receipts and submit pending ones to idle OCR workers"""
+        from app.services.receipts import ocr_pool
+
+        try:
+            ocr_pool.dispatch()
+        except Exception:
+            self.app.logger.exception('Error dispatching OCR jobs')
 
     def shutdown(self):
         """Shutdown the scheduler"""
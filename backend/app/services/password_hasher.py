@@ -0,0 +1,144 @@
+"""
+Password Hasher Pool
+Runs bcrypt hashing and verification in a bounded process pool
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from typing import Optional
+from app.services.auth_service import AuthService
+
+
+class HasherBusyError(Exception):
+    """Raised when the hashing queue is full or a job times out"""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Password hashing capacity exceeded')
+        self.retry_after = retry_after
+
+
+def _hash_job(password: str, rounds: int) -> str:
+    """Hash a password (runs in a worker process)"""
+    return AuthService.hash_password(password, rounds)
+
+
+def _verify_job(password: str, hashed: str) -> bool:
+    """Verify a password (runs in a worker process)"""
+    return AuthService.verify_password(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Bounded bcrypt worker pool with admission control
+
+    Each bcrypt call costs ~250ms of CPU at cost 12. Running them in a
+    separate process pool keeps web workers free for other endpoints,
+    and the pending-job limit rejects bursts with HasherBusyError
+    (mapped to 503 + Retry-After) instead of queueing without bound.
+
+    With PASSWORD_HASH_WORKERS=0 jobs run inline in the calling thread.
+    """
+
+    def __init__(self):
+        self.workers = 0
+        self.max_pending = 0
+        self.timeout = 10
+        self.retry_after = 1
+        self.rounds = AuthService.BCRYPT_ROUNDS
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Configure from Flask app config
+
+        Args:
+            app: Flask application instance
+        """
+        self.shutdown()
+
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.max_pending = app.config.get('PASSWORD_HASH_QUEUE_DEPTH') or self.workers * 4
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self.retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER', 1)
+        self.rounds = app.config.get('BCRYPT_ROUNDS', AuthService.BCRYPT_ROUNDS)
+
+        AuthService.BCRYPT_ROUNDS = self.rounds
+        self._slots = threading.BoundedSemaphore(self.max_pending) if self.workers else None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use (after any server fork)"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _run(self, fn, *args):
+        """
+        Run a job in the pool, enforcing the pending-job limit
+
+        Raises:
+            HasherBusyError: If the queue is full or the job times out
+        """
+        if not self.workers:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusyError(self.retry_after)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        # The slot is held until the job finishes, even if the caller stops waiting:
+        # a job that is already running can't be cancelled and still uses a worker
+        slots = self._slots
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HasherBusyError(self.retry_after)
+
+    def hash(self, password: str, rounds: Optional[int] = None) -> str:
+        """
+        Hash a password in the pool
+
+        Args:
+            password: Plain text password
+            rounds: Optional cost factor (defaults to BCRYPT_ROUNDS)
+
+        Returns:
+            Hashed password
+        """
+        return self._run(_hash_job, password, rounds or self.rounds)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """
+        Verify a password in the pool
+
+        Args:
+            password: Plain text password
+            hashed: Hashed password
+
+        Returns:
+            True if password matches
+        """
+        return self._run(_verify_job, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Check whether a hash uses a different cost than configured"""
+        return AuthService.needs_rehash(hashed, self.rounds)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
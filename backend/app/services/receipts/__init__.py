@@ -0,0 +1,21 @@
+"""
+Receipt Processing Package
+"""
+from app.services.receipts.ocr_engine import OCRError, run_ocr
+from app.services.receipts.field_extractor import FieldExtractor
+from app.services.receipts.receipt_matcher import SubscriptionIndex, ReceiptMatcher
+from app.services.receipts.receipt_store import StagedFile, ReceiptStore, OCRCache
+from app.services.receipts.ocr_pool import OCRWorkerPool, ocr_pool
+
+__all__ = [
+    'OCRError',
+    'run_ocr',
+    'FieldExtractor',
+    'SubscriptionIndex',
+    'ReceiptMatcher',
+    'StagedFile',
+    'ReceiptStore',
+    'OCRCache',
+    'OCRWorkerPool',
+    'ocr_pool'
+]
@@ -0,0 +1,256 @@
+"""
+Receipt Field Extractor
+Pulls amount, currency, date and merchant out of OCR text
+"""
+import re
+from collections import Counter
+from datetime import date
+from typing import Dict, Optional
+from app.services.currency_converter import CURRENCY_SYMBOLS
+
+
+def _currency_markers() -> Dict[str, tuple]:
+    """Map each currency symbol and code to the codes it may stand for"""
+    markers = {}
+    for code, symbol in CURRENCY_SYMBOLS.items():
+        markers.setdefault(symbol, set()).add(code)
+        markers.setdefault(code, set()).add(code)
+    return {marker: tuple(sorted(codes)) for marker, codes in markers.items()}
+
+
+class FieldExtractor:
+    """
+    Extract receipt fields with precompiled regex banks
+
+    Patterns are compiled once per process from CURRENCY_SYMBOLS. Text is
+    scanned line by line: amounts on total lines ('Total', 'Amount paid')
+    win over other amounts, and dates on date lines ('Date', 'Paid on')
+    over other dates. Extraction is pure string work (no database), so it
+    is cheap enough to run for every finished job and cached result.
+    """
+
+    # Bump when extraction changes; stored fields from older versions are re-extracted
+    VERSION = 1
+
+    MARKERS = _currency_markers()
+
+    MONTHS = {
+        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+    }
+
+    # Longest marker first so 'A$' wins over '$'; letters must stand alone ('R' in 'RECEIPT' isn't ZAR)
+    _CURRENCY = '|'.join(
+        rf'(?<![A-Za-z]){re.escape(marker)}(?![A-Za-z])' if marker[-1].isalpha() else re.escape(marker)
+        for marker in sorted(MARKERS, key=len, reverse=True)
+    )
+    _NUMBER = r'(?:\d{1,3}(?:[.,]\d{3})+|\d+)(?:[.,]\d{2})?'
+    _DECIMAL = r'(?:\d{1,3}(?:[.,]\d{3})+|\d+)[.,]\d{2}'
+    _MONTH = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+
+    # Amounts next to a currency marker (integers allowed: '¥1,200'), or any two-decimal number
+    MONEY = re.compile(
+        rf'(?P<before>{_CURRENCY})\s?(?P<amount_after>{_NUMBER})(?![\d.,]?\d)'
+        rf'|(?<![\d.,])(?P<amount_before>{_NUMBER})\s?(?P<after>{_CURRENCY})'
+        rf'|(?<![\d.,])(?P<amount>{_DECIMAL})(?![\d.,]?\d)'
+    )
+
+    DATE_ISO = re.compile(r'(?<!\d)(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?!\d)')
+    DATE_NUMERIC = re.compile(r'(?<![\d.])(\d{1,2})[-/.](\d{1,2})[-/.](\d{4}|\d{2})(?![\d.])')
+    DATE_DAY_MONTH = re.compile(rf'(?<!\d)(\d{{1,2}})(?:st|nd|rd|th)?\.?\s+{_MONTH},?\s+(\d{{4}})', re.IGNORECASE)
+    DATE_MONTH_DAY = re.compile(rf'\b{_MONTH}\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})', re.IGNORECASE)
+
+    TOTAL_LINE = re.compile(
+        r'\b(total|amount paid|amount charged|amount due|charged|grand total|balance|'
+        r'summe|gesamt|betrag|montant|importe|totale)\b',
+        re.IGNORECASE
+    )
+    PARTIAL_LINE = re.compile(r'\b(sub-?total|tax|vat|gst|discount|tip|change|savings)\b', re.IGNORECASE)
+    DATE_LINE = re.compile(
+        r'\b(date|dated|paid on|charged on|billed on|issued|datum|fecha)\b',
+        re.IGNORECASE
+    )
+    FUTURE_LINE = re.compile(r'\b(next|renews?|renewal|expires?|valid until|due)\b', re.IGNORECASE)
+    MERCHANT_LINE = re.compile(r'[A-Za-z]{3,}')
+    HEADING_LINE = re.compile(
+        r'^(payment |tax |your )?(receipt|invoice|order confirmation|kvitto|rechnung|facture)\b',
+        re.IGNORECASE
+    )
+
+    @classmethod
+    def extract(cls, text: Optional[str], day_first: bool = False) -> Dict:
+        """
+        Extract fields from receipt text
+
+        Args:
+            text: OCR text
+            day_first: Read ambiguous numeric dates (03/04/2024) as day/month
+
+        Returns:
+            {'version', 'amount', 'currency', 'currency_symbol', 'date' (ISO), 'merchant'}
+            (fields not found are None)
+        """
+        fields = {
+            'version': cls.VERSION,
+            'amount': None,
+            'currency': None,
+            'currency_symbol': None,
+            'date': None,
+            'merchant': None
+        }
+        if not text:
+            return fields
+
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+
+        amount, marker = cls._find_amount(lines)
+        if amount is not None:
+            fields['amount'] = amount
+        if marker is None:
+            marker = cls._common_marker(text)
+        if marker is not None:
+            codes = cls.MARKERS[marker]
+            fields['currency_symbol'] = marker
+            fields['currency'] = codes[0] if len(codes) == 1 else None
+
+        found = cls._find_date(lines, day_first)
+        if found is not None:
+            fields['date'] = found.isoformat()
+
+        fields['merchant'] = cls._find_merchant(lines)
+        return fields
+
+    @staticmethod
+    def parse_amount(raw: str) -> Optional[float]:
+        """
+        Parse '1,234.56', '1.234,56', '12,99' or '1,200'
+
+        The last separator is the decimal point if two digits follow it;
+        other separators group thousands.
+        """
+        head, separator, tail = max(raw.rpartition('.'), raw.rpartition(','), key=lambda parts: len(parts[0]))
+        if separator and len(tail) == 2:
+            whole, cents = head, tail
+        else:
+            whole, cents = raw, '0'
+
+        digits = whole.replace('.', '').replace(',', '')
+        try:
+            return round(float(f'{digits}.{cents}'), 2)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _find_amount(cls, lines: list) -> tuple:
+        """Pick the receipt total: (amount, currency marker or None)"""
+        totals = []
+        marked = []
+        plain = []
+
+        for line in lines:
+            on_total_line = cls.TOTAL_LINE.search(line) and not cls.PARTIAL_LINE.search(line)
+            for match in cls.MONEY.finditer(line):
+                raw = match.group('amount_after') or match.group('amount_before') or match.group('amount')
+                value = cls.parse_amount(raw)
+                if not value:
+                    continue
+                marker = match.group('before') or match.group('after')
+                candidate = (value, marker)
+
+                if on_total_line:
+                    totals.append(candidate)
+                elif marker:
+                    marked.append(candidate)
+                else:
+                    plain.append(candidate)
+
+        # The total is the largest amount on total lines ('Total', 'Amount paid', ...)
+        for candidates in (totals, marked, plain):
+            if candidates:
+                # Prefer a marked occurrence of the same amount (it carries the currency)
+                return max(candidates, key=lambda candidate: (candidate[0], candidate[1] is not None))
+
+        return None, None
+
+    @classmethod
+    def _common_marker(cls, text: str) -> Optional[str]:
+        """Most frequent currency marker anywhere in the text"""
+        counts = Counter(
+            match.group('before') or match.group('after')
+            for match in cls.MONEY.finditer(text)
+            if match.group('before') or match.group('after')
+        )
+        return counts.most_common(1)[0][0] if counts else None
+
+    @classmethod
+    def _find_date(cls, lines: list, day_first: bool) -> Optional[date]:
+        """Pick the payment date: date lines first, future dates ('Renews on') last"""
+        dated = []
+        other = []
+        future = []
+
+        for line in lines:
+            found = cls._dates_in(line, day_first)
+            if not found:
+                continue
+            if cls.FUTURE_LINE.search(line):
+                future.extend(found)
+            elif cls.DATE_LINE.search(line):
+                dated.extend(found)
+            else:
+                other.extend(found)
+
+        for candidates in (dated, other, future):
+            if candidates:
+                return candidates[0]
+        return None
+
+    @classmethod
+    def _dates_in(cls, line: str, day_first: bool) -> list:
+        """All valid dates in a line, in order of appearance"""
+        found = []
+
+        for match in cls.DATE_ISO.finditer(line):
+            found.append((match.start(), cls._date(match.group(1), match.group(2), match.group(3))))
+
+        for match in cls.DATE_NUMERIC.finditer(line):
+            first, second, year = int(match.group(1)), int(match.group(2)), match.group(3)
+            if first > 12 or (day_first and second <= 12):
+                day, month = first, second
+            else:
+                month, day = first, second
+            found.append((match.start(), cls._date(year, month, day)))
+
+        for match in cls.DATE_DAY_MONTH.finditer(line):
+            month = cls.MONTHS[match.group(2).lower()]
+            found.append((match.start(), cls._date(match.group(3), month, match.group(1))))
+
+        for match in cls.DATE_MONTH_DAY.finditer(line):
+            month = cls.MONTHS[match.group(1).lower()]
+            found.append((match.start(), cls._date(match.group(3), month, match.group(2))))
+
+        return [value for _, value in sorted(found, key=lambda item: item[0]) if value is not None]
+
+    @staticmethod
+    def _date(year, month, day) -> Optional[date]:
+        """Build a date, or None if invalid or implausible"""
+        year = int(year)
+        if year < 100:
+            year += 2000
+        if not 2000 <= year <= 2100:
+            return None
+        try:
+            return date(year, int(month), int(day))
+        except ValueError:
+            return None
+
+    @classmethod
+    def _find_merchant(cls, lines: list) -> Optional[str]:
+        """First line near the top that reads like a name rather than an amount or date"""
+        for line in lines[:5]:
+            letters = sum(character.isalpha() for character in line)
+            if (cls.MERCHANT_LINE.search(line) and letters >= len(line) / 2
+                    and not cls.HEADING_LINE.search(line)
+                    and not cls.TOTAL_LINE.search(line) and not cls.DATE_LINE.search(line)):
+                return line[:100]
+        return None
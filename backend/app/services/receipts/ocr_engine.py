@@ -0,0 +1,331 @@
+"""
+OCR Engine
+Decodes, preprocesses and recognizes receipt images with local Tesseract
+
+Everything here runs inside OCR worker processes: plain functions, no
+database or Flask access. Pillow, pytesseract and (for PDFs) pdf2image
+are imported on first use so the API runs without them.
+
+Memory per job is kept bounded: JPEGs are decoded at reduced scale,
+PDFs are rendered one page at a time at the target size, and workers
+run under an address space limit (limit_memory).
+"""
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
+
+PROVIDER = 'tesseract'
+
+# Bump when preprocessing or recognition settings change output, so
+# cached results from the old pipeline are not reused
+ENGINE_VERSION = 2
+
+PDF_EXTENSIONS = {'pdf'}
+
+
+class OCRError(Exception):
+    """Raised when a receipt can't be recognized"""
+    pass
+
+
+def _imaging():
+    """Import Pillow and pytesseract"""
+    try:
+        from PIL import Image, ImageFilter, ImageOps
+        import pytesseract
+    except ImportError as e:
+        raise OCRError(f'OCR dependencies are not installed ({e.name}); pip install Pillow pytesseract')
+    return Image, ImageFilter, ImageOps, pytesseract
+
+
+@lru_cache(maxsize=1)
+def tesseract_version() -> str:
+    """Installed Tesseract version ('unknown' if it can't be determined)"""
+    try:
+        import pytesseract
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return 'unknown'
+
+
+def provider_version(options: Dict) -> str:
+    """
+    Identify everything that determines OCR output besides the file
+
+    Args:
+        options: OCR options
+
+    Returns:
+        e.g. 'tesseract:5.3.0:eng:psm6:1'
+    """
+    return ':'.join([
+        PROVIDER,
+        tesseract_version(),
+        options.get('language', 'eng'),
+        f"psm{options.get('psm', 6)}",
+        str(ENGINE_VERSION)
+    ])
+
+
+def limit_memory(limit_bytes: int):
+    """
+    Cap the address space of the current (worker) process
+
+    Runs as the OCR pool's worker initializer. The limit is inherited by
+    the tesseract and pdftoppm processes a job starts, so one oversized
+    receipt fails with MemoryError instead of exhausting the host. Tesseract
+    is also kept to one thread per job; the pool provides the parallelism.
+
+    Args:
+        limit_bytes: Maximum address space (0 = unlimited)
+    """
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+    if not limit_bytes:
+        return
+
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+def _pdf_pages(path: str, options: Dict) -> Iterator:
+    """Render PDF pages one at a time, at most max_side pixels on the long side"""
+    try:
+        from pdf2image import convert_from_path, pdfinfo_from_path
+        from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError
+    except ImportError:
+        raise OCRError('PDF support is not installed; pip install pdf2image')
+
+    try:
+        info = pdfinfo_from_path(path)
+    except PDFInfoNotInstalledError:
+        raise OCRError('Poppler is not installed')
+    except (PDFPageCountError, PDFSyntaxError) as e:
+        raise OCRError(f'Unreadable PDF: {e}')
+
+    dpi = options.get('pdf_dpi', 200)
+    max_side = options.get('max_side', 3000)
+
+    # Render straight to the target size rather than rendering at full DPI
+    # and shrinking afterwards ('Page size: 612 x 792 pts (letter)')
+    size = None
+    match = re.match(r'([\d.]+) x ([\d.]+)', info.get('Page size', ''))
+    if match and max(float(match.group(1)), float(match.group(2))) / 72 * dpi > max_side:
+        size = max_side
+
+    pages = min(int(info.get('Pages', 0)), options.get('max_pages', 10))
+    for number in range(1, pages + 1):
+        rendered = convert_from_path(
+            path,
+            dpi=dpi,
+            size=size,
+            first_page=number,
+            last_page=number,
+            grayscale=True
+        )
+        yield from rendered
+
+
+def _open_image(path: str, options: Dict):
+    """
+    Decode an image, reduced to about max_side while decoding where possible
+
+    JPEGs (phone photos) are decoded by libjpeg at 1/2, 1/4 or 1/8 scale
+    and straight to grayscale (Image.draft), so a 12 MP photo never exists
+    in memory at full size. Other formats are decoded in full after
+    checking the pixel count against max_pixels.
+    """
+    Image, _, _, _ = _imaging()
+
+    try:
+        image = Image.open(path)
+
+        max_side = options.get('max_side', 3000)
+        if image.format == 'JPEG' and max(image.size) > max_side:
+            scale = max_side / max(image.size)
+            image.draft('L', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+
+        max_pixels = options.get('max_pixels')
+        if max_pixels and image.width * image.height > max_pixels:
+            image.close()
+            raise OCRError(f'Image too large ({image.width}x{image.height} pixels)')
+
+        image.load()
+    except (OSError, Image.DecompressionBombError) as e:
+        raise OCRError(f'Unreadable image: {e}')
+
+    return image
+
+
+def load_pages(path: str, extension: str, options: Dict) -> Iterator:
+    """
+    Decode a receipt file into page images, one page at a time
+
+    Args:
+        path: File path
+        extension: File extension (lowercase, without dot)
+        options: OCR options (pdf_dpi, max_pages, max_side, max_pixels)
+
+    Yields:
+        PIL images, one per page
+    """
+    if extension in PDF_EXTENSIONS:
+        yield from _pdf_pages(path, options)
+        return
+
+    yield _open_image(path, options)
+
+
+def _otsu_threshold(histogram: list) -> int:
+    """Threshold that best separates a grayscale histogram into two classes"""
+    total = sum(histogram)
+    weighted_total = sum(value * count for value, count in enumerate(histogram))
+
+    background = 0
+    background_sum = 0.0
+    best_threshold = 127
+    best_variance = 0.0
+
+    for value, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+
+        background_sum += value * count
+        background_mean = background_sum / background
+        foreground_mean = (weighted_total - background_sum) / foreground
+        variance = background * foreground * (background_mean - foreground_mean) ** 2
+
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = value
+
+    return best_threshold
+
+
+def preprocess(image, options: Dict):
+    """
+    Prepare a page for recognition
+
+    Applies EXIF rotation, grayscale, downscaling to max_side, contrast
+    stretching, denoising and Otsu binarization.
+
+    Args:
+        image: PIL image
+        options: OCR options (max_side)
+
+    Returns:
+        Binarized PIL image
+    """
+    _, ImageFilter, ImageOps, _ = _imaging()
+
+    image = ImageOps.exif_transpose(image)
+    image = image.convert('L')
+
+    max_side = options.get('max_side', 3000)
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side))  # Draft decoding leaves up to 2x
+
+    image = ImageOps.autocontrast(image, cutoff=1)
+    image = image.filter(ImageFilter.MedianFilter(3))
+
+    threshold = _otsu_threshold(image.histogram())
+    return image.point(lambda value: 255 if value > threshold else 0, mode='1')
+
+
+def recognize(image, options: Dict) -> tuple:
+    """
+    Run Tesseract on a preprocessed page
+
+    Args:
+        image: PIL image
+        options: OCR options (language, psm, timeout)
+
+    Returns:
+        (text, list of word confidences 0-100)
+    """
+    _, _, _, pytesseract = _imaging()
+
+    try:
+        data = pytesseract.image_to_data(
+            image,
+            lang=options.get('language', 'eng'),
+            config=f"--psm {options.get('psm', 6)}",
+            timeout=options.get('timeout', 0),
+            output_type=pytesseract.Output.DICT
+        )
+    except pytesseract.TesseractNotFoundError:
+        raise OCRError('Tesseract is not installed')
+    except RuntimeError as e:  # pytesseract raises RuntimeError on timeout
+        raise OCRError(f'Tesseract failed: {e}')
+
+    lines = {}
+    confidences = []
+    for index, word in enumerate(data['text']):
+        word = word.strip()
+        if not word:
+            continue
+        key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+        lines.setdefault(key, []).append(word)
+
+        confidence = float(data['conf'][index])
+        if confidence >= 0:
+            confidences.append(confidence)
+
+    text = '\n'.join(' '.join(words) for _, words in sorted(lines.items()))
+    return text, confidences
+
+
+def run_ocr(path: str, extension: str, options: Optional[Dict] = None) -> Dict:
+    """
+    Recognize a receipt file (OCR worker entry point)
+
+    Args:
+        path: File path
+        extension: File extension (lowercase, without dot)
+        options: OCR options
+
+    Returns:
+        {'text', 'confidence' (0-1), 'provider', 'pages'}
+
+    Raises:
+        OCRError: If the file can't be decoded or recognized
+    """
+    options = options or {}
+    texts = []
+    confidences = []
+    pages = 0
+
+    try:
+        for page in load_pages(path, extension, options):
+            prepared = preprocess(page, options)
+            page.close()
+            text, page_confidences = recognize(prepared, options)
+            prepared.close()
+            texts.append(text)
+            confidences += page_confidences
+            pages += 1
+    except MemoryError:
+        raise OCRError('Receipt is too large to process within the memory limit')
+
+    if not pages:
+        raise OCRError('No pages found')
+
+    return {
+        'text': '\n\n'.join(texts).strip(),
+        'confidence': round(sum(confidences) / len(confidences) / 100, 3) if confidences else 0.0,
+        'provider': PROVIDER,
+        'pages': pages
+    }
@@ -0,0 +1,430 @@
+"""
+OCR Worker Pool
+Processes queued receipts in a process pool and writes results back
+"""
+import os
+import socket
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Optional
+from flask import has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.receipt import Receipt
+from app.services.receipts.ocr_engine import run_ocr, provider_version, limit_memory, OCRError
+from app.services.receipts.receipt_store import ReceiptStore, OCRCache
+from app.services.receipts.field_extractor import FieldExtractor
+from app.services.receipts.receipt_matcher import ReceiptMatcher
+from app.utils.data_version import bump_data_version
+from app.utils.serialization import dumps
+
+
+class OCRWorkerPool:
+    """
+    Receipt OCR queue backed by the receipts table
+
+    Uploads are stored with status 'pending'; dispatch() claims the
+    oldest pending receipts (conditional update, SKIP LOCKED on
+    PostgreSQL, so several API nodes can share the queue) up to the
+    number of free worker processes and submits them. Each finished job
+    writes its result back and dispatches the next one. Jobs left
+    'processing' by a node that died are requeued after OCR_JOB_TIMEOUT.
+
+    Results are cached by file hash and provider version (OCRCache): a
+    claimed receipt whose file was recognized before completes without
+    running OCR, and a finished job also completes pending receipts with
+    the same file.
+
+    Amount, currency, date and merchant are extracted from every result
+    (FieldExtractor, cached with the OCR text) and completed receipts are
+    matched to the owner's subscriptions (ReceiptMatcher).
+
+    Workers run under OCR_MEMORY_LIMIT_MB; a job that hits the limit fails
+    with a MemoryError (or crashes its worker) instead of starving the host.
+
+    With OCR_WORKERS=0 a receipt is processed inline when it is submitted
+    (without the memory limit, which would apply to the whole API process).
+    """
+
+    TERMINAL_STATUSES = ('done', 'failed')
+
+    def __init__(self):
+        self.app = None
+        self.workers = 0
+        self.node_id = None
+        self.store = None
+        self.options = {}
+        self.job_timeout = 600
+        self.max_attempts = 3
+        self.memory_limit = 0
+        self._executor = None
+        self._running = set()
+        self._lock = threading.RLock()  # Done callbacks may run inside dispatch()
+        self._finished = threading.Condition()
+
+    def init_app(self, app):
+        """
+        Configure from Flask app config
+
+        Args:
+            app: Flask application instance
+        """
+        self.shutdown()
+
+        self.app = app
+        self.workers = app.config.get('OCR_WORKERS', 0)
+        self.node_id = app.config.get('SCHEDULER_NODE_ID') or f'{socket.gethostname()}:{os.getpid()}'
+        self.store = ReceiptStore(app.config['UPLOAD_FOLDER'])
+        self.job_timeout = app.config.get('OCR_JOB_TIMEOUT', 600)
+        self.max_attempts = app.config.get('OCR_MAX_ATTEMPTS', 3)
+        self.memory_limit = app.config.get('OCR_MEMORY_LIMIT_MB', 0) * 1024 * 1024
+        self.options = {
+            'language': app.config.get('OCR_LANGUAGE', 'eng'),
+            'timeout': app.config.get('OCR_TESSERACT_TIMEOUT', 120),
+            'pdf_dpi': app.config.get('OCR_PDF_DPI', 200),
+            'max_pages': app.config.get('OCR_MAX_PAGES', 10),
+            'max_side': app.config.get('OCR_MAX_IMAGE_SIDE', 3000),
+            'max_pixels': app.config.get('OCR_MAX_IMAGE_PIXELS', 50000000),
+            'date_day_first': app.config.get('OCR_DATE_DAY_FIRST', False)
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use (after any server fork)"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=limit_memory,
+                        initargs=(self.memory_limit,)
+                    )
+        return self._executor
+
+    def _app_context(self):
+        """Use the caller's app context (and session) if there is one, else push one"""
+        return nullcontext() if has_app_context() else self.app.app_context()
+
+    @property
+    def provider_version(self) -> str:
+        """Cache key component identifying the OCR pipeline"""
+        return provider_version(self.options)
+
+    def file_path(self, receipt: Receipt) -> str:
+        """Absolute path of a stored receipt file"""
+        return self.store.absolute_path(receipt.file_path or '')
+
+    def cached_result(self, content_hash: str) -> Optional[dict]:
+        """
+        Cached OCR result for a file
+
+        Args:
+            content_hash: SHA-256 of the file
+
+        Returns:
+            run_ocr() result (plus extracted_data), or None
+        """
+        cached = OCRCache.get(content_hash, self.provider_version)
+        return OCRCache.as_result(cached) if cached else None
+
+    def match_receipts(self, receipts: list, relink: bool = False) -> dict:
+        """
+        Match completed receipts to subscriptions (see ReceiptMatcher)
+
+        Args:
+            receipts: Receipts
+            relink: Replace existing subscription links
+
+        Returns:
+            {'matched', 'linked'}
+        """
+        return ReceiptMatcher.match_receipts(receipts, relink=relink, day_first=self.options.get('date_day_first', False))
+
+    def submit(self, receipt_id: int):
+        """
+        Queue a newly stored receipt
+
+        Args:
+            receipt_id: Receipt ID (already committed with status 'pending')
+        """
+        if not self.workers:
+            self._process_inline(receipt_id)
+            return
+
+        self.dispatch()
+
+    def dispatch(self) -> int:
+        """
+        Claim pending receipts for free workers and submit them
+
+        Returns:
+            Number of jobs submitted
+        """
+        if not self.workers:
+            return 0
+
+        with self._lock:
+            free = self.workers - len(self._running)
+            if free <= 0:
+                return 0
+
+            with self._app_context():
+                try:
+                    self._requeue_stale()
+                    jobs = self._claim(limit=free)
+                    jobs = self._complete_cached(jobs)
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    self.app.logger.exception('Failed to claim OCR jobs')
+                    return 0
+
+            for receipt_id, path, extension, _ in jobs:
+                self._running.add(receipt_id)
+                try:
+                    future = self._get_executor().submit(run_ocr, path, extension, self.options)
+                except (BrokenProcessPool, RuntimeError) as e:
+                    self._running.discard(receipt_id)
+                    self._executor = None
+                    self._finish(receipt_id, error=f'Worker pool unavailable: {e}', retry=True)
+                    continue
+                future.add_done_callback(
+                    lambda future, receipt_id=receipt_id: self._job_done(receipt_id, future)
+                )
+
+            return len(jobs)
+
+    def _claim(self, limit: int, receipt_id: Optional[int] = None) -> list:
+        """
+        Claim pending receipts for this node
+
+        Args:
+            limit: Maximum number of receipts
+            receipt_id: Claim only this receipt
+
+        Returns:
+            List of (receipt ID, file path, extension, content hash)
+        """
+        query = db.session.query(Receipt.id).filter(Receipt.status == 'pending')
+        if receipt_id is not None:
+            query = query.filter(Receipt.id == receipt_id)
+
+        candidates = [row[0] for row in query.order_by(Receipt.id).limit(limit).with_for_update(skip_locked=True).all()]
+
+        claimed = []
+        for candidate in candidates:
+            updated = db.session.query(Receipt).filter(
+                Receipt.id == candidate,
+                Receipt.status == 'pending'
+            ).update({
+                'status': 'processing',
+                'claimed_by': self.node_id,
+                'claimed_at': datetime.utcnow(),
+                'attempts': Receipt.attempts + 1,
+                'error_message': None
+            }, synchronize_session=False)
+            if updated:
+                claimed.append(candidate)
+
+        jobs = []
+        if claimed:
+            rows = db.session.query(Receipt).filter(Receipt.id.in_(claimed)).all()
+            bump_data_version(db.session, {receipt.user_id for receipt in rows})
+            for receipt in rows:
+                extension = os.path.splitext(receipt.file_path or '')[1].lstrip('.').lower()
+                jobs.append((receipt.id, self.file_path(receipt), extension, receipt.content_hash))
+
+        db.session.commit()
+        return jobs
+
+    def _complete_cached(self, jobs: list) -> list:
+        """
+        Finish claimed receipts whose file has a cached result
+
+        Args:
+            jobs: Claimed jobs
+
+        Returns:
+            Jobs that still need OCR
+        """
+        remaining = []
+        for job in jobs:
+            result = self.cached_result(job[3])
+            if result is None:
+                remaining.append(job)
+            else:
+                self._finish(job[0], result=result, cached=True)
+        return remaining
+
+    def _requeue_stale(self):
+        """Return receipts stuck in 'processing' (dead node) to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.job_timeout)
+        stale = db.session.query(Receipt.id, Receipt.user_id, Receipt.attempts).filter(
+            Receipt.status == 'processing',
+            Receipt.claimed_at < cutoff
+        ).all()
+
+        if not stale:
+            return
+
+        for receipt_id, _, attempts in stale:
+            exhausted = attempts >= self.max_attempts
+            db.session.query(Receipt).filter(
+                Receipt.id == receipt_id,
+                Receipt.status == 'processing',
+                Receipt.claimed_at < cutoff
+            ).update({
+                'status': 'failed' if exhausted else 'pending',
+                'claimed_by': None,
+                'error_message': 'Processing timed out' if exhausted else None
+            }, synchronize_session=False)
+
+        bump_data_version(db.session, {user_id for _, user_id, _ in stale})
+        db.session.commit()
+
+    def _job_done(self, receipt_id: int, future):
+        """Future callback: record the result and start the next job"""
+        with self._lock:
+            self._running.discard(receipt_id)
+
+        try:
+            result = future.result()
+        except OCRError as e:
+            self._finish(receipt_id, error=str(e))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); the job may succeed on retry
+            with self._lock:
+                self._executor = None
+            self._finish(receipt_id, error='OCR worker crashed', retry=True)
+        except Exception as e:
+            self._finish(receipt_id, error=f'OCR failed: {e.__class__.__name__}: {e}')
+        else:
+            self._finish(receipt_id, result=result)
+
+        self.dispatch()
+
+    def _process_inline(self, receipt_id: int):
+        """Claim and process one receipt in the calling thread"""
+        with self._app_context():
+            jobs = self._complete_cached(self._claim(limit=1, receipt_id=receipt_id))
+
+        for receipt_id, path, extension, _ in jobs:
+            try:
+                result = run_ocr(path, extension, self.options)
+            except OCRError as e:
+                self._finish(receipt_id, error=str(e))
+            except Exception as e:
+                self._finish(receipt_id, error=f'OCR failed: {e.__class__.__name__}: {e}')
+            else:
+                self._finish(receipt_id, result=result)
+
+    @staticmethod
+    def apply_result(receipt: Receipt, result: dict):
+        """Store an OCR result on a receipt"""
+        receipt.status = 'done'
+        receipt.claimed_by = None
+        receipt.extracted_text = result['text']
+        receipt.confidence_score = result['confidence']
+        receipt.ocr_provider = result['provider']
+        if result.get('extracted_data'):
+            receipt.extracted_data = dumps(result['extracted_data'])
+        receipt.error_message = None
+        receipt.processed_at = datetime.utcnow()
+
+    def _finish(self, receipt_id: int, result: Optional[dict] = None,
+                error: Optional[str] = None, retry: bool = False, cached: bool = False):
+        """
+        Write a job result back to the receipt
+
+        Args:
+            receipt_id: Receipt ID
+            result: run_ocr() result
+            error: Error message if the job failed
+            retry: Return the receipt to the queue if attempts remain
+            cached: The result came from the cache
+        """
+        with self._app_context():
+            try:
+                receipt = db.session.get(Receipt, receipt_id)
+                if receipt is None or receipt.status != 'processing' or receipt.claimed_by != self.node_id:
+                    return  # Deleted, or requeued and claimed elsewhere
+
+                receipt.claimed_by = None
+                if result is not None:
+                    if not cached:
+                        fields = FieldExtractor.extract(result['text'], self.options.get('date_day_first', False))
+                        result = {**result, 'extracted_data': fields}
+
+                    self.apply_result(receipt, result)
+                    completed = [receipt]
+
+                    if receipt.content_hash and not cached:
+                        OCRCache.put(receipt.content_hash, self.provider_version, result,
+                                     result.get('extracted_data'))
+
+                        # Identical files queued meanwhile don't need their own run
+                        duplicates = db.session.query(Receipt).filter(
+                            Receipt.content_hash == receipt.content_hash,
+                            Receipt.status == 'pending'
+                        ).all()
+                        for duplicate in duplicates:
+                            self.apply_result(duplicate, result)
+                        completed += duplicates
+
+                    self.match_receipts(completed)
+                elif retry and receipt.attempts < self.max_attempts:
+                    receipt.status = 'pending'
+                    receipt.error_message = error
+                else:
+                    receipt.status = 'failed'
+                    receipt.error_message = error
+                    receipt.processed_at = datetime.utcnow()
+
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.app.logger.exception(f'Failed to store OCR result for receipt {receipt_id}')
+
+        with self._finished:
+            self._finished.notify_all()
+
+    def wait(self, receipt_id: int, user_id: int, timeout: float) -> Optional[Receipt]:
+        """
+        Wait until a receipt is processed (long polling)
+
+        Wakes up when a local job finishes and re-reads the row at least
+        once a second, so results written by other nodes are seen too.
+
+        Args:
+            receipt_id: Receipt ID
+            user_id: Owner's user ID
+            timeout: Maximum seconds to wait
+
+        Returns:
+            The receipt (in whatever state it is when the wait ends), or None if not found
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            db.session.rollback()  # End the read transaction to see new commits
+            receipt = db.session.query(Receipt).filter_by(id=receipt_id, user_id=user_id).first()
+
+            remaining = deadline - time.monotonic()
+            if receipt is None or receipt.status in self.TERMINAL_STATUSES or remaining <= 0:
+                return receipt
+
+            with self._finished:
+                self._finished.wait(min(remaining, 1.0))
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._running.clear()
+
+
+ocr_pool = OCRWorkerPool()
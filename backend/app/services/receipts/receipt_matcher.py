@@ -0,0 +1,293 @@
+"""
+Receipt Matcher
+Links recognized receipts to the subscriptions they pay for
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional
+from app import db
+from app.models.currency import Currency
+from app.models.receipt import Receipt
+from app.models.subscription import Subscription
+from app.services.billing_cycle import BillingCycleCalculator
+from app.services.receipts.field_extractor import FieldExtractor
+from app.utils.names import name_tokens, significant_tokens, compact_name, url_domain
+from app.utils.serialization import dumps
+
+# Average cycle lengths in days (1=days, 2=weeks, 3=months, 4=years)
+CYCLE_DAYS = {1: 1, 2: 7, 3: 30.44, 4: 365.25}
+
+
+class SubscriptionIndex:
+    """
+    Lookup structures over one user's subscriptions
+
+    Name tokens (and the website's domain) map to subscriptions through an
+    inverted index, and prices are kept sorted per currency. A receipt is
+    only scored against subscriptions that share a token with its text or
+    whose price is within PRICE_TOLERANCE of its amount, so matching costs
+    about the same however many subscriptions the user has.
+    """
+
+    NAME_WEIGHT = 0.5
+    PRICE_WEIGHT = 0.3
+    DATE_WEIGHT = 0.2
+
+    PRICE_TOLERANCE = 0.15  # relative difference (tax, rounding)
+    DATE_WINDOW = 10  # days from a billing date
+
+    MATCH_THRESHOLD = 0.6
+    MIN_MARGIN = 0.1  # over the runner-up, to link automatically
+
+    def __init__(self, rows: Iterable):
+        """
+        Args:
+            rows: (id, name, url, price, currency code, cycle, frequency, next_payment) tuples
+        """
+        self.subscriptions = {}
+        self.tokens = defaultdict(set)
+        self.prices = defaultdict(list)
+        self._date_scores = {}  # (subscription_id, receipt date) -> score
+
+        for row in rows:
+            subscription_id, name, url, price, code, cycle, frequency, next_payment = row
+
+            significant = significant_tokens(name)
+            compact = compact_name(name)
+
+            domain = url_domain(url)
+            keys = set(significant)
+            if len(compact) >= 3:
+                keys.add(compact)
+            if domain:
+                keys.add(domain)
+
+            self.subscriptions[subscription_id] = {
+                'name_tokens': significant,
+                'compact': compact,
+                'domain': domain,
+                'price': price,
+                'currency': code,
+                'cycle': cycle,
+                'frequency': frequency or 1,
+                'next_payment': next_payment
+            }
+            for key in keys:
+                self.tokens[key].add(subscription_id)
+            if price:
+                self.prices[code].append((price, subscription_id))
+
+        for entries in self.prices.values():
+            entries.sort()
+
+    def candidates(self, tokens: set, fields: Dict) -> set:
+        """Subscriptions sharing a token with the receipt or priced near its amount"""
+        found = set()
+        for token in tokens:
+            found |= self.tokens.get(token, set())
+
+        amount = fields.get('amount')
+        if amount:
+            low = amount / (1 + self.PRICE_TOLERANCE)
+            high = amount / (1 - self.PRICE_TOLERANCE)
+            for code in self._currencies(fields):
+                entries = self.prices.get(code, [])
+                start = bisect_left(entries, (low,))
+                end = bisect_right(entries, (high, float('inf')))
+                found.update(subscription_id for _, subscription_id in entries[start:end])
+
+        return found
+
+    def _currencies(self, fields: Dict) -> Iterable:
+        """Currency codes a receipt amount may be in"""
+        if fields.get('currency'):
+            return (fields['currency'],)
+        if fields.get('currency_symbol'):
+            return FieldExtractor.MARKERS.get(fields['currency_symbol'], ())
+        return list(self.prices)
+
+    def match(self, text: Optional[str], fields: Dict) -> Optional[Dict]:
+        """
+        Find the subscription a receipt pays for
+
+        Args:
+            text: OCR text
+            fields: FieldExtractor fields
+
+        Returns:
+            {'subscription_id', 'score', 'signals': {'name', 'price', 'date'}, 'confident'} or None
+        """
+        words = name_tokens(text)
+        tokens = set(words)
+        compact_text = ''.join(words)
+
+        receipt_date = None
+        if fields.get('date'):
+            receipt_date = date.fromisoformat(fields['date'])
+
+        scored = []
+        for subscription_id in self.candidates(tokens, fields):
+            subscription = self.subscriptions[subscription_id]
+            signals = {
+                'name': self._name_score(subscription, tokens, compact_text),
+                'price': self._price_score(subscription, fields),
+                'date': self._date_score(subscription_id, receipt_date)
+            }
+            score = (self.NAME_WEIGHT * signals['name'] + self.PRICE_WEIGHT * signals['price']
+                     + self.DATE_WEIGHT * signals['date'])
+            scored.append((score, subscription_id, signals))
+
+        if not scored:
+            return None
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        score, subscription_id, signals = scored[0]
+        runner_up = scored[1][0] if len(scored) > 1 else 0.0
+
+        return {
+            'subscription_id': subscription_id,
+            'score': round(score, 3),
+            'signals': {signal: round(value, 3) for signal, value in signals.items()},
+            'confident': score >= self.MATCH_THRESHOLD and score - runner_up >= self.MIN_MARGIN
+        }
+
+    @staticmethod
+    def _name_score(subscription: Dict, tokens: set, compact_text: str) -> float:
+        """1.0 for the whole name (or website) on the receipt, else the share of name words found"""
+        if len(subscription['compact']) >= 4 and subscription['compact'] in compact_text:
+            return 1.0
+        if subscription['domain'] and subscription['domain'] in tokens:
+            return 1.0
+        if not subscription['name_tokens']:
+            return 0.0
+        return len(subscription['name_tokens'] & tokens) / len(subscription['name_tokens'])
+
+    def _price_score(self, subscription: Dict, fields: Dict) -> float:
+        """1.0 for the exact price, falling to 0 at PRICE_TOLERANCE"""
+        amount = fields.get('amount')
+        price = subscription['price']
+        if not amount or not price or subscription['currency'] not in self._currencies(fields):
+            return 0.0
+        difference = abs(amount - price) / price
+        return max(0.0, 1.0 - difference / self.PRICE_TOLERANCE)
+
+    def _date_score(self, subscription_id: int, receipt_date: Optional[date]) -> float:
+        """1.0 on a billing date, falling to 0 at DATE_WINDOW days away (memoized per batch)"""
+        key = (subscription_id, receipt_date)
+        if key not in self._date_scores:
+            self._date_scores[key] = self._billing_date_score(self.subscriptions[subscription_id], receipt_date)
+        return self._date_scores[key]
+
+    def _billing_date_score(self, subscription: Dict, receipt_date: Optional[date]) -> float:
+        """Score a receipt date against a subscription's billing dates"""
+        next_payment = subscription['next_payment']
+        if receipt_date is None or next_payment is None or subscription['cycle'] not in CYCLE_DAYS:
+            return 0.0
+
+        cycle = subscription['cycle']
+        frequency = subscription['frequency']
+        period = CYCLE_DAYS[cycle] * frequency
+
+        # Billing dates are next_payment minus whole periods; check the ones around the receipt
+        periods_back = round((next_payment - receipt_date).days / period)
+        distance = min(
+            abs((BillingCycleCalculator.calculate_next_payment(next_payment, cycle, -k * frequency)
+                 - receipt_date).days)
+            for k in (periods_back - 1, periods_back, periods_back + 1)
+        )
+        return max(0.0, 1.0 - distance / self.DATE_WINDOW)
+
+
+class ReceiptMatcher:
+    """Match receipts to subscriptions in batches"""
+
+    USER_CHUNK_SIZE = 500  # user IDs per subscription query
+
+    @classmethod
+    def build_indexes(cls, user_ids: Iterable[int]) -> Dict[int, SubscriptionIndex]:
+        """
+        Build subscription indexes for several users
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Dictionary of user_id -> SubscriptionIndex
+        """
+        user_ids = list(user_ids)
+        rows = defaultdict(list)
+
+        for start in range(0, len(user_ids), cls.USER_CHUNK_SIZE):
+            chunk = user_ids[start:start + cls.USER_CHUNK_SIZE]
+            query = db.session.query(
+                Subscription.user_id,
+                Subscription.id,
+                Subscription.name,
+                Subscription.url,
+                Subscription.price,
+                Currency.code,
+                Subscription.cycle,
+                Subscription.frequency,
+                Subscription.next_payment
+            ).outerjoin(Currency, Subscription.currency_id == Currency.id).filter(
+                Subscription.user_id.in_(chunk)
+            )
+            for user_id, *row in query:
+                rows[user_id].append(row)
+
+        return {user_id: SubscriptionIndex(rows[user_id]) for user_id in user_ids}
+
+    @staticmethod
+    def fields_for(receipt: Receipt, day_first: bool = False) -> Dict:
+        """Stored fields, re-extracted from the text if missing or outdated"""
+        fields = dict(receipt.extracted_fields)
+        if fields.get('version') != FieldExtractor.VERSION:
+            fields.update(FieldExtractor.extract(receipt.extracted_text, day_first))
+        return fields
+
+    @classmethod
+    def match_receipts(cls, receipts: Iterable[Receipt], relink: bool = False,
+                       day_first: bool = False) -> Dict:
+        """
+        Match recognized receipts and link confident matches
+
+        Each user's subscriptions are indexed once per batch. The match is
+        stored in the receipt's extracted_data; receipts already linked to
+        a subscription keep it unless relink is set. The session is not
+        committed.
+
+        Args:
+            receipts: Receipts (any users; only 'done' ones are matched)
+            relink: Replace existing subscription links
+            day_first: Read ambiguous numeric dates as day/month
+
+        Returns:
+            {'matched': receipts with a candidate, 'linked': receipts linked}
+        """
+        by_user = defaultdict(list)
+        for receipt in receipts:
+            if receipt.status == 'done':
+                by_user[receipt.user_id].append(receipt)
+
+        indexes = cls.build_indexes(by_user)
+
+        matched = 0
+        linked = 0
+        for user_id, user_receipts in by_user.items():
+            index = indexes[user_id]
+            for receipt in user_receipts:
+                fields = cls.fields_for(receipt, day_first)
+                match = index.match(receipt.extracted_text, fields)
+                fields['match'] = match
+
+                if match:
+                    matched += 1
+                    if match['confident'] and (receipt.subscription_id is None or relink):
+                        if receipt.subscription_id != match['subscription_id']:
+                            receipt.subscription_id = match['subscription_id']
+                            linked += 1
+
+                receipt.extracted_data = dumps(fields)
+
+        return {'matched': matched, 'linked': linked}
@@ -0,0 +1,230 @@
+"""
+Receipt Store
+Content-addressed receipt files and OCR results cached by file hash
+"""
+import hashlib
+import io
+import os
+import tempfile
+import time
+from typing import BinaryIO, Optional
+from app import db
+from app.models.receipt import Receipt
+from app.models.ocr_result import OCRResult
+from app.utils.serialization import dumps
+
+
+class StagedFile(io.BufferedRandom):
+    """
+    Temporary upload file that hashes data as it is written
+
+    Used as the spool file for multipart uploads (see stage_uploads), so an
+    upload is written to disk once, in chunks, and hashed on the way. The
+    file is removed on close unless ReceiptStore moved it into place.
+    """
+
+    def __init__(self, directory: str):
+        fd, self.path = tempfile.mkstemp(dir=directory)
+        super().__init__(io.FileIO(fd, 'r+b'))
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.adopted = False
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return super().write(data)
+
+    def close(self):
+        super().close()
+        if not self.adopted and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ReceiptStore:
+    """
+    Receipt files keyed by SHA-256
+
+    Files live at UPLOAD_FOLDER/receipts/<aa>/<bb>/<sha256>.<ext>, so
+    identical uploads (from any user) share one file on disk. A file is
+    removed when the last receipt referencing its hash is deleted.
+    """
+
+    ROOT = 'receipts'
+    CHUNK_SIZE = 65536
+    GRACE_PERIOD = 60  # seconds a just-(re)uploaded file is protected from removal
+
+    EXTENSION_ALIASES = {'jpeg': 'jpg'}
+
+    def __init__(self, upload_folder):
+        self.upload_folder = str(upload_folder)
+
+    def relative_path(self, content_hash: str, extension: str) -> str:
+        """Path of a stored file, relative to UPLOAD_FOLDER"""
+        extension = self.EXTENSION_ALIASES.get(extension, extension)
+        return os.path.join(self.ROOT, content_hash[:2], content_hash[2:4], f'{content_hash}.{extension}')
+
+    def absolute_path(self, relative_path: str) -> str:
+        """Absolute path of a stored file"""
+        return os.path.join(self.upload_folder, relative_path)
+
+    @property
+    def staging_dir(self) -> str:
+        """Directory for uploads in progress (same filesystem as the store)"""
+        return os.path.join(self.upload_folder, self.ROOT, 'tmp')
+
+    def stage(self) -> StagedFile:
+        """Open a new staging file"""
+        os.makedirs(self.staging_dir, exist_ok=True)
+        return StagedFile(self.staging_dir)
+
+    def save(self, stream: BinaryIO, extension: str) -> dict:
+        """
+        Store an upload, hashing it while it is copied to disk
+
+        A StagedFile from this store (the request already spooled the
+        upload here) is moved into place without copying.
+
+        Args:
+            stream: File-like object to read
+            extension: File extension (lowercase, without dot)
+
+        Returns:
+            {'content_hash', 'file_path' (relative), 'size', 'created' (False if deduplicated)}
+        """
+        if isinstance(stream, StagedFile) and os.path.dirname(stream.path) == self.staging_dir:
+            return self._store(stream, extension)
+
+        with self.stage() as staged:
+            while True:
+                chunk = stream.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                staged.write(chunk)
+            return self._store(staged, extension)
+
+    def _store(self, staged: StagedFile, extension: str) -> dict:
+        """Move a staged file to its content address (or drop it if already stored)"""
+        staged.flush()
+
+        content_hash = staged.digest.hexdigest()
+        relative_path = self.relative_path(content_hash, extension)
+        path = self.absolute_path(relative_path)
+
+        if os.path.exists(path):
+            os.utime(path)  # Restart the grace period (see release)
+            created = False
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staged.path, path)
+            staged.adopted = True
+            created = True
+
+        return {
+            'content_hash': content_hash,
+            'file_path': relative_path,
+            'size': staged.size,
+            'created': created
+        }
+
+    def release(self, content_hash: Optional[str], relative_path: Optional[str],
+                grace_period: Optional[int] = None) -> bool:
+        """
+        Remove a stored file if no receipt references it any more
+
+        Call after the referencing receipt has been deleted and committed.
+        Files touched within GRACE_PERIOD are kept, so an upload that
+        deduplicated against the file just before its receipt row was
+        committed doesn't lose it.
+
+        Args:
+            content_hash: SHA-256 of the file (None for files stored before hashing)
+            relative_path: Stored path
+            grace_period: Override GRACE_PERIOD (seconds)
+
+        Returns:
+            True if the file was removed
+        """
+        if not relative_path:
+            return False
+
+        if content_hash and db.session.query(Receipt.id).filter(
+            Receipt.content_hash == content_hash
+        ).first():
+            return False
+
+        if grace_period is None:
+            grace_period = self.GRACE_PERIOD
+
+        path = self.absolute_path(relative_path)
+        try:
+            if time.time() - os.path.getmtime(path) < grace_period:
+                return False
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+
+class OCRCache:
+    """OCR output and parsed fields by (content hash, provider version)"""
+
+    @staticmethod
+    def get(content_hash: Optional[str], provider_version: str) -> Optional[OCRResult]:
+        """
+        Look up a cached result
+
+        Args:
+            content_hash: SHA-256 of the file
+            provider_version: ocr_engine.provider_version()
+
+        Returns:
+            OCRResult or None
+        """
+        if not content_hash:
+            return None
+        return db.session.get(OCRResult, (content_hash, provider_version))
+
+    @staticmethod
+    def put(content_hash: Optional[str], provider_version: str, result: dict,
+            extracted_data: Optional[dict] = None):
+        """
+        Cache a result (first writer wins; the session is not committed)
+
+        Args:
+            content_hash: SHA-256 of the file
+            provider_version: ocr_engine.provider_version()
+            result: run_ocr() result
+            extracted_data: Parsed fields
+        """
+        if not content_hash:
+            return
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(OCRResult).values(
+            content_hash=content_hash,
+            provider_version=provider_version,
+            extracted_text=result['text'],
+            extracted_data=dumps(extracted_data) if extracted_data else None,
+            confidence_score=result['confidence'],
+            ocr_provider=result['provider'],
+            pages=result.get('pages')
+        ).on_conflict_do_nothing(index_elements=['content_hash', 'provider_version'])
+        db.session.execute(stmt)
+
+    @staticmethod
+    def as_result(cached: OCRResult) -> dict:
+        """Convert a cached row to the run_ocr() result shape"""
+        return {
+            'text': cached.extracted_text or '',
+            'confidence': cached.confidence_score or 0.0,
+            'provider': cached.ocr_provider,
+            'pages': cached.pages,
+            'extracted_data': cached.extracted_fields
+        }
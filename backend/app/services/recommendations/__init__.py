@@ -0,0 +1,80 @@
+"""
+AI Recommendation Package
+"""
+from typing import Optional
+from app.services.recommendations.base import (
+    BaseRecommendationProvider,
+    RecommendationProviderError,
+    RateLimitedError,
+    RateLimiter
+)
+from app.services.recommendations.openai_provider import OpenAIProvider
+from app.services.recommendations.gemini_provider import GeminiProvider
+from app.services.recommendations.ollama_provider import OllamaProvider
+
+PROVIDER_MAP = {
+    'openai': OpenAIProvider,
+    'gemini': GeminiProvider,
+    'ollama': OllamaProvider
+}
+
+
+def get_recommendation_provider(config) -> Optional[BaseRecommendationProvider]:
+    """
+    Build the AI provider selected in app config
+
+    Args:
+        config: Flask app config (or any mapping)
+
+    Returns:
+        Provider instance, or None if AI recommendations are disabled or not configured
+    """
+    name = (config.get('AI_PROVIDER') or '').lower()
+    if not name:
+        return None
+
+    if name not in PROVIDER_MAP:
+        raise ValueError(f"Unknown AI provider: {name}")
+
+    options = {
+        'model': config.get('AI_MODEL'),
+        'url': config.get('AI_BASE_URL'),
+        'timeout': config.get('AI_REQUEST_TIMEOUT', 60)
+    }
+
+    if name == 'openai':
+        if not config.get('OPENAI_API_KEY'):
+            return None
+        options['api_key'] = config['OPENAI_API_KEY']
+
+    if name == 'gemini':
+        if not config.get('GOOGLE_GEMINI_API_KEY'):
+            return None
+        options['api_key'] = config['GOOGLE_GEMINI_API_KEY']
+
+    if name == 'ollama':
+        options['url'] = options['url'] or config.get('OLLAMA_HOST')
+
+    return PROVIDER_MAP[name](options)
+
+
+from app.services.recommendations.store import replace_recommendations
+from app.services.recommendations.rules import RULES_SOURCE, RecommendationRules
+from app.services.recommendations.recommendation_service import RecommendationService, recommendation_service
+
+__all__ = [
+    'BaseRecommendationProvider',
+    'RecommendationProviderError',
+    'RateLimitedError',
+    'RateLimiter',
+    'OpenAIProvider',
+    'GeminiProvider',
+    'OllamaProvider',
+    'PROVIDER_MAP',
+    'get_recommendation_provider',
+    'replace_recommendations',
+    'RULES_SOURCE',
+    'RecommendationRules',
+    'RecommendationService',
+    'recommendation_service'
+]
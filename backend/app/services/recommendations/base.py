@@ -0,0 +1,142 @@
+"""
+Base Recommendation Provider
+Abstract class for all AI recommendation backends
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+import requests
+
+
+class RecommendationProviderError(Exception):
+    """Raised when a provider cannot produce a completion"""
+
+
+class RateLimitedError(RecommendationProviderError):
+    """Raised when the provider asks us to slow down (HTTP 429)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Thread-safe request spacing for one provider
+
+    Allows requests_per_minute requests per rolling minute, spread evenly:
+    acquire() blocks until the next slot. 0 disables the limit.
+    """
+
+    def __init__(self, requests_per_minute: float = 0):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for the next request slot"""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, seconds: float):
+        """Push the next slot back (after a 429 from the provider)"""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class BaseRecommendationProvider(ABC):
+    """
+    Base class for all recommendation providers
+
+    complete() sends a system and a user prompt and returns the model's
+    text reply, which is asked to be a JSON object. Providers are called
+    from worker threads and must not touch the database.
+    """
+
+    name = 'base'
+    default_model = None
+    default_url = None
+    requests_per_minute = 0  # default rate limit (0 = unlimited)
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize provider
+
+        Args:
+            config: Provider-specific configuration dictionary
+                    (api_key, model, url, timeout)
+        """
+        self.config = config or {}
+        self.model = self.config.get('model') or self.default_model
+        self.url = (self.config.get('url') or self.default_url or '').rstrip('/')
+        self.timeout = self.config.get('timeout', 60)
+
+    @property
+    def version(self) -> str:
+        """Identifies responses this provider produces (cache key)"""
+        return f'{self.name}:{self.model}'
+
+    @abstractmethod
+    def complete(self, system: str, prompt: str) -> str:
+        """
+        Run one completion
+
+        Args:
+            system: System instructions
+            prompt: User prompt
+
+        Returns:
+            Reply text
+
+        Raises:
+            RateLimitedError: If the provider rate limited the request
+            RecommendationProviderError: On any other failure
+        """
+        pass
+
+    def post_json(self, url: str, payload: Dict, headers: Optional[Dict] = None,
+                  params: Optional[Dict] = None) -> Dict:
+        """
+        POST a JSON payload and decode the JSON response
+
+        Args:
+            url: Endpoint URL
+            payload: Request body
+            headers: Extra headers
+            params: Query parameters
+
+        Returns:
+            Decoded response body
+
+        Raises:
+            RateLimitedError: On HTTP 429
+            RecommendationProviderError: On network errors, other status codes or invalid JSON
+        """
+        try:
+            response = requests.post(url, json=payload, headers=headers, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise RecommendationProviderError(f"Error calling {self.name}: {e}")
+
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            raise RateLimitedError(
+                f"{self.name} rate limit exceeded",
+                float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+
+        if response.status_code != 200:
+            raise RecommendationProviderError(f"{self.name} returned HTTP {response.status_code}")
+
+        try:
+            return response.json()
+        except ValueError:
+            raise RecommendationProviderError(f"{self.name} returned invalid JSON")
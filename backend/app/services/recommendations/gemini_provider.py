@@ -0,0 +1,35 @@
+"""
+Gemini Recommendation Provider
+Google Gemini via the generateContent API
+"""
+from app.services.recommendations.base import BaseRecommendationProvider, RecommendationProviderError
+
+
+class GeminiProvider(BaseRecommendationProvider):
+    """Google Gemini provider"""
+
+    name = 'gemini'
+    default_model = 'gemini-1.5-flash'
+    default_url = 'https://generativelanguage.googleapis.com/v1beta'
+    requests_per_minute = 15  # free tier
+
+    def complete(self, system: str, prompt: str) -> str:
+        """Generate content with a JSON response type"""
+        api_key = self.config.get('api_key')
+        if not api_key:
+            raise RecommendationProviderError("Gemini API key not configured")
+
+        data = self.post_json(
+            f'{self.url}/models/{self.model}:generateContent',
+            {
+                'systemInstruction': {'parts': [{'text': system}]},
+                'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+                'generationConfig': {'responseMimeType': 'application/json', 'temperature': 0.2}
+            },
+            params={'key': api_key}
+        )
+
+        try:
+            return ''.join(part.get('text', '') for part in data['candidates'][0]['content']['parts'])
+        except (KeyError, IndexError, TypeError):
+            raise RecommendationProviderError("Gemini response has no content")
@@ -0,0 +1,35 @@
+"""
+Ollama Recommendation Provider
+Local models through an Ollama server (no data leaves the machine)
+"""
+from app.services.recommendations.base import BaseRecommendationProvider, RecommendationProviderError
+
+
+class OllamaProvider(BaseRecommendationProvider):
+    """Ollama chat provider"""
+
+    name = 'ollama'
+    default_model = 'llama3.1'
+    default_url = 'http://localhost:11434'
+    requests_per_minute = 0  # local; bounded by the worker pool
+
+    def complete(self, system: str, prompt: str) -> str:
+        """Run one chat request with JSON output"""
+        data = self.post_json(
+            f'{self.url}/api/chat',
+            {
+                'model': self.model,
+                'messages': [
+                    {'role': 'system', 'content': system},
+                    {'role': 'user', 'content': prompt}
+                ],
+                'format': 'json',
+                'stream': False,
+                'options': {'temperature': 0.2}
+            }
+        )
+
+        try:
+            return data['message']['content']
+        except (KeyError, TypeError):
+            raise RecommendationProviderError("Ollama response has no message")
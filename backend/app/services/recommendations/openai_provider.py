@@ -0,0 +1,39 @@
+"""
+OpenAI Recommendation Provider
+ChatGPT via the Chat Completions API (or any compatible endpoint)
+"""
+from app.services.recommendations.base import BaseRecommendationProvider, RecommendationProviderError
+
+
+class OpenAIProvider(BaseRecommendationProvider):
+    """OpenAI Chat Completions provider"""
+
+    name = 'openai'
+    default_model = 'gpt-4o-mini'
+    default_url = 'https://api.openai.com/v1'
+    requests_per_minute = 60
+
+    def complete(self, system: str, prompt: str) -> str:
+        """Run one chat completion in JSON mode"""
+        api_key = self.config.get('api_key')
+        if not api_key:
+            raise RecommendationProviderError("OpenAI API key not configured")
+
+        data = self.post_json(
+            f'{self.url}/chat/completions',
+            {
+                'model': self.model,
+                'messages': [
+                    {'role': 'system', 'content': system},
+                    {'role': 'user', 'content': prompt}
+                ],
+                'response_format': {'type': 'json_object'},
+                'temperature': 0.2
+            },
+            headers={'Authorization': f'Bearer {api_key}'}
+        )
+
+        try:
+            return data['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            raise RecommendationProviderError("OpenAI response has no message")
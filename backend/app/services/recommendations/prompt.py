@@ -0,0 +1,157 @@
+"""
+Recommendation Prompt
+Compact, anonymized prompts and their cache keys
+"""
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional
+
+
+# Bump when the prompt or response format changes; cached responses from older versions are ignored
+PROMPT_VERSION = 1
+
+RECOMMENDATION_TYPES = ('duplicate', 'alternative', 'bundle', 'cancel', 'optimize')
+
+MAX_RECOMMENDATIONS = 5
+
+SYSTEM_PROMPT = (
+    "You review a person's subscriptions and suggest how to spend less. "
+    "Reply with JSON only: "
+    '{"recommendations":[{"type":"duplicate|alternative|bundle|cancel|optimize",'
+    '"title":"...","description":"...","monthly_savings":0.0,"items":[1,2]}]}. '
+    f"At most {MAX_RECOMMENDATIONS} recommendations; items are line numbers from the list; "
+    "savings are in the list's currency. Reply with an empty list if nothing stands out."
+)
+
+CYCLE_NAMES = {1: 'day', 2: 'week', 3: 'month', 4: 'year'}
+
+WHITESPACE = re.compile(r'\s+')
+LINE_BREAKS = re.compile(r'[\r\n|]+')
+
+
+def _billing(cycle: int, frequency: int) -> str:
+    """'monthly'-style label: 'month', '3 months', 'year'"""
+    unit = CYCLE_NAMES.get(cycle, 'month')
+    return unit if frequency == 1 else f'{frequency} {unit}s'
+
+
+def normalize_items(subscriptions: List[Dict]) -> List[tuple]:
+    """
+    Reduce subscriptions to what the model needs, in a canonical order
+
+    Only the name, monthly cost in the user's main currency, billing
+    period and category are kept (no IDs, notes, URLs or dates), so equal
+    subscription sets produce equal prompts whoever owns them.
+
+    Args:
+        subscriptions: Dicts with name, monthly, cycle, frequency, category
+
+    Returns:
+        Sorted (name, monthly cost, billing, category) tuples
+    """
+    items = []
+    for subscription in subscriptions:
+        name = WHITESPACE.sub(' ', LINE_BREAKS.sub(' ', subscription['name'] or '')).strip()[:60]
+        category = WHITESPACE.sub(' ', LINE_BREAKS.sub(' ', subscription.get('category') or '')).strip()[:40]
+        items.append((
+            name,
+            round(float(subscription['monthly']), 2),
+            _billing(subscription['cycle'], subscription['frequency'] or 1),
+            category
+        ))
+    items.sort()
+    return items
+
+
+def input_hash(items: List[tuple], currency: str) -> str:
+    """
+    Cache key of a normalized subscription set
+
+    Args:
+        items: normalize_items() output
+        currency: Currency code of the amounts
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps([PROMPT_VERSION, currency, items], separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_prompt(items: List[tuple], currency: str) -> str:
+    """
+    One line per subscription: number|name|monthly cost|billing period|category
+
+    Args:
+        items: normalize_items() output
+        currency: Currency code of the amounts
+
+    Returns:
+        User prompt
+    """
+    lines = [f'Subscriptions ({currency}/month): n|name|cost|billed every|category']
+    lines += [
+        f'{number}|{name}|{monthly:.2f}|{billing}|{category}'
+        for number, (name, monthly, billing, category) in enumerate(items, 1)
+    ]
+    return '\n'.join(lines)
+
+
+def parse_response(text: str, item_count: int) -> List[Dict]:
+    """
+    Validate a model reply
+
+    Tolerates code fences and text around the JSON object; drops
+    recommendations without a title or with unknown item numbers.
+
+    Args:
+        text: Reply text
+        item_count: Number of lines in the prompt
+
+    Returns:
+        List of {'type', 'title', 'description', 'monthly_savings', 'items'}
+
+    Raises:
+        ValueError: If the reply holds no JSON object
+    """
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("Reply holds no JSON object")
+
+    data = json.loads(text[start:end + 1])
+    entries = data.get('recommendations') if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError("Reply has no recommendations list")
+
+    recommendations = []
+    for entry in entries[:MAX_RECOMMENDATIONS]:
+        if not isinstance(entry, dict) or not str(entry.get('title') or '').strip():
+            continue
+
+        items = entry.get('items') or []
+        if not isinstance(items, list):
+            continue
+        numbers = sorted({int(n) for n in items if isinstance(n, (int, float)) and 1 <= int(n) <= item_count})
+        if items and not numbers:
+            continue
+
+        recommendation_type = str(entry.get('type') or '').lower()
+        recommendations.append({
+            'type': recommendation_type if recommendation_type in RECOMMENDATION_TYPES else 'optimize',
+            'title': str(entry['title']).strip()[:255],
+            'description': str(entry.get('description') or '').strip()[:2000],
+            'monthly_savings': _amount(entry.get('monthly_savings')),
+            'items': numbers
+        })
+
+    return recommendations
+
+
+def _amount(value) -> Optional[float]:
+    """Non-negative amount or None"""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return round(amount, 2) if amount > 0 else None
@@ -0,0 +1,359 @@
+"""
+Recommendation Service
+Generates AI recommendations in a bounded, rate-limited worker pool
+"""
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+from app import db
+from app.models.ai_recommendation import AIRecommendation
+from app.models.ai_response import AIResponse
+from app.models.category import Category
+from app.models.currency import Currency
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.currency_converter import CurrencyConverter
+from app.services.insights.history import SubscriptionHistory
+from app.services.recommendations.base import RateLimiter, RateLimitedError, RecommendationProviderError
+from app.services.recommendations.prompt import (
+    SYSTEM_PROMPT, normalize_items, input_hash, build_prompt, parse_response
+)
+from app.services.recommendations.rules import RULES_SOURCE
+from app.services.recommendations.store import replace_recommendations
+from app.utils.serialization import dumps
+
+
+class RecommendationService:
+    """
+    AI recommendations for many users at once
+
+    Each user's active subscriptions are reduced to a compact, anonymized
+    prompt (names, monthly costs, billing periods, categories). Parsed
+    replies are cached in ai_responses by a hash of that normalized set
+    and the provider version, so unchanged users (and users with identical
+    sets) never cost a second request, and users whose stored
+    recommendations were generated from the same set are skipped entirely.
+
+    Requests for the remaining sets run in a thread pool of AI_WORKERS,
+    spaced by a per-provider rate limiter (AI_REQUESTS_PER_MINUTE, or the
+    provider's default) and retried with backoff when rate limited.
+    Database access stays on the calling thread, and no transaction is
+    open while requests are in flight.
+    """
+
+    USER_CHUNK_SIZE = 500
+    MAX_ATTEMPTS = 3
+    BACKOFF_SECONDS = 5
+
+    # One limiter per provider, shared by every run in this process
+    limiters = {}
+    _limiters_lock = threading.Lock()
+
+    def __init__(self):
+        self.app = None
+        self.provider = None
+        self.workers = 4
+        self.limiter = None
+        self._executor = None
+        self._background = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Configure from Flask app config
+
+        Args:
+            app: Flask application instance
+        """
+        from app.services.recommendations import get_recommendation_provider
+
+        self.shutdown()
+
+        self.app = app
+        self.provider = get_recommendation_provider(app.config)
+        self.workers = max(1, app.config.get('AI_WORKERS', 4))
+        self.limiter = None
+
+        if self.provider is not None:
+            requests_per_minute = app.config.get('AI_REQUESTS_PER_MINUTE', -1)
+            if requests_per_minute < 0:
+                requests_per_minute = self.provider.requests_per_minute
+            with self._limiters_lock:
+                self.limiter = self.limiters.setdefault(self.provider.name, RateLimiter(requests_per_minute))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether an AI provider is configured"""
+        return self.provider is not None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the request pool on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ai-recommend')
+        return self._executor
+
+    def submit(self, user_ids: Iterable[int]) -> Future:
+        """
+        Generate recommendations in the background (one analysis at a time)
+
+        Args:
+            user_ids: Users to analyze
+
+        Returns:
+            Future with run()'s result
+        """
+        user_ids = list(user_ids)
+        with self._lock:
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai-analyze')
+
+        def analyze():
+            with self.app.app_context():
+                return self.run(user_ids)
+
+        return self._background.submit(analyze)
+
+    def run(self, user_ids: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Generate and store recommendations
+
+        Args:
+            user_ids: Users to analyze (default: all)
+
+        Returns:
+            {'users', 'unchanged', 'cached', 'generated', 'failed', 'recommendations'} counts,
+            plus 'failed_users' (users whose request failed)
+        """
+        counts = dict.fromkeys(('users', 'unchanged', 'cached', 'generated', 'failed', 'recommendations'), 0)
+        counts['failed_users'] = []
+        if self.provider is None:
+            return counts
+
+        if user_ids is None:
+            user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+        user_ids = sorted(set(user_ids))
+
+        for start in range(0, len(user_ids), self.USER_CHUNK_SIZE):
+            self._run_chunk(user_ids[start:start + self.USER_CHUNK_SIZE], counts)
+
+        return counts
+
+    def _run_chunk(self, user_ids: List[int], counts: Dict):
+        """Generate recommendations for one batch of users"""
+        inputs = self.load_inputs(user_ids)
+        counts['users'] += len(user_ids)
+
+        current = dict(db.session.query(AIRecommendation.user_id, AIRecommendation.input_hash).filter(
+            AIRecommendation.user_id.in_(user_ids),
+            AIRecommendation.source == self.provider.name,
+            AIRecommendation.dismissed.is_(False)
+        ).distinct().all())
+
+        todo = {}
+        for user_id in user_ids:
+            user_input = inputs.get(user_id)
+            if user_input is None or current.get(user_id) == user_input['hash']:
+                counts['unchanged'] += 1
+            else:
+                todo[user_id] = user_input
+
+        responses = self._responses({user_input['hash']: user_input for user_input in todo.values()}, counts)
+
+        results = {}
+        for user_id, user_input in todo.items():
+            if user_input['hash'] in responses:
+                results[user_id] = responses[user_input['hash']]
+            else:
+                counts['failed'] += 1
+                counts['failed_users'].append(user_id)
+
+        # Users without active subscriptions lose their stale recommendations
+        cleared = [user_id for user_id in user_ids if user_id not in inputs and user_id in current]
+        counts['recommendations'] += self._store(results, inputs, cleared)
+
+    def load_inputs(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Normalized subscription sets of users with active subscriptions
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            user_id -> {'items', 'subscription_ids' (per item), 'currency', 'hash'}
+        """
+        history = SubscriptionHistory.load(user_ids)
+        subscriptions = history.subscriptions
+
+        categories = dict(db.session.query(Subscription.id, Category.name).join(
+            Category, Subscription.category_id == Category.id
+        ).filter(Subscription.user_id.in_(user_ids)).all())
+        codes = dict(db.session.query(Currency.id, Currency.code).filter(
+            Currency.id.in_([currency_id for currency_id in history.main_currency.values() if currency_id])
+        ).all())
+
+        rows = defaultdict(list)
+        for row in range(len(subscriptions['id'])):
+            if subscriptions['inactive'][row]:
+                continue
+            subscription_id = int(subscriptions['id'][row])
+            rows[int(subscriptions['user_id'][row])].append((subscription_id, {
+                'name': history.names[row],
+                'monthly': float(subscriptions['monthly_main'][row]),
+                'cycle': int(subscriptions['cycle'][row]),
+                'frequency': int(subscriptions['frequency'][row]),
+                'category': categories.get(subscription_id)
+            }))
+
+        inputs = {}
+        for user_id, entries in rows.items():
+            currency = codes.get(history.main_currency.get(user_id), 'USD')
+
+            # Identical entries share one prompt line
+            keyed = sorted(
+                (normalize_items([subscription])[0], subscription_id) for subscription_id, subscription in entries
+            )
+            items, subscription_ids = [], []
+            for item, subscription_id in keyed:
+                if items and items[-1] == item:
+                    subscription_ids[-1].append(subscription_id)
+                else:
+                    items.append(item)
+                    subscription_ids.append([subscription_id])
+
+            inputs[user_id] = {
+                'items': items,
+                'subscription_ids': subscription_ids,
+                'currency': currency,
+                'hash': input_hash(items, currency)
+            }
+
+        return inputs
+
+    def _responses(self, inputs: Dict[str, Dict], counts: Dict) -> Dict[str, list]:
+        """Parsed recommendations per input hash, from the cache or the provider"""
+        version = self.provider.version
+        responses = {}
+
+        hashes = list(inputs)
+        for start in range(0, len(hashes), self.USER_CHUNK_SIZE):
+            for cached in db.session.query(AIResponse).filter(
+                AIResponse.input_hash.in_(hashes[start:start + self.USER_CHUNK_SIZE]),
+                AIResponse.provider_version == version
+            ):
+                responses[cached.input_hash] = cached.entries
+        counts['cached'] += len(responses)
+
+        missing = {key: value for key, value in inputs.items() if key not in responses}
+
+        # Don't hold a transaction (and the SQLite writer connection) while requests are in flight
+        db.session.commit()
+        if not missing:
+            return responses
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self._generate, build_prompt(user_input['items'], user_input['currency']),
+                            len(user_input['items'])): key
+            for key, user_input in missing.items()
+        }
+
+        generated = {}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                generated[key] = future.result()
+            except (RecommendationProviderError, ValueError) as e:
+                print(f"⚠️  AI recommendation request failed: {e}")
+
+        if generated:
+            for key, entries in generated.items():
+                self._cache(key, version, entries)
+            db.session.commit()
+
+        responses.update(generated)
+        counts['generated'] += len(generated)
+        return responses
+
+    def _generate(self, prompt: str, item_count: int) -> list:
+        """Request and parse one completion (worker thread; no database access)"""
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            self.limiter.acquire()
+            try:
+                return parse_response(self.provider.complete(SYSTEM_PROMPT, prompt), item_count)
+            except RateLimitedError as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                self.limiter.defer(e.retry_after or self.BACKOFF_SECONDS * 2 ** (attempt - 1))
+            except ValueError:
+                # Malformed reply; models often get it right on a second try
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+
+    @staticmethod
+    def _cache(key: str, version: str, entries: list):
+        """Store parsed recommendations (first writer wins; not committed)"""
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        db.session.execute(insert(AIResponse).values(
+            input_hash=key,
+            provider_version=version,
+            recommendations=dumps(entries)
+        ).on_conflict_do_nothing(index_elements=['input_hash', 'provider_version']))
+
+    def _store(self, results: Dict[int, list], inputs: Dict[int, Dict], cleared: List[int]) -> int:
+        """Replace users' open recommendations from this provider, leaving out what the rules already found"""
+        user_ids = sorted(set(results) | set(cleared))
+        if not user_ids:
+            return 0
+
+        # Subscriptions a rule-based recommendation already covers, per user
+        covered = set(db.session.query(AIRecommendation.user_id, AIRecommendation.related_subscription_ids).filter(
+            AIRecommendation.user_id.in_(user_ids),
+            AIRecommendation.source == RULES_SOURCE
+        ))
+
+        mappings = []
+        for user_id, entries in results.items():
+            user_input = inputs[user_id]
+            symbol = CurrencyConverter.get_currency_symbol(user_input['currency'])
+            for entry in entries:
+                related = dumps(sorted(
+                    subscription_id
+                    for number in entry['items']
+                    for subscription_id in user_input['subscription_ids'][number - 1]
+                ))
+                if (user_id, related) in covered:
+                    continue
+                savings = entry['monthly_savings']
+                mappings.append({
+                    'user_id': user_id,
+                    'title': entry['title'],
+                    'description': entry['description'] or entry['title'],
+                    'savings': f'{symbol}{savings:.2f}/month' if savings else None,
+                    'recommendation_type': entry['type'],
+                    'related_subscription_ids': related,
+                    'input_hash': user_input['hash']
+                })
+
+        inserted = replace_recommendations(db.session, self.provider.name, user_ids, mappings)
+        db.session.commit()
+        return inserted
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        with self._lock:
+            for executor in (self._executor, self._background):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._background = None
+
+
+recommendation_service = RecommendationService()
@@ -0,0 +1,241 @@
+"""
+Recommendation Rules
+Deterministic recommendations that need no AI provider
+"""
+from collections import defaultdict
+from statistics import median
+from typing import Dict, Iterable, List, Optional
+from app import db
+from app.models.currency import Currency
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.billing_cycle import BillingCycleCalculator
+from app.services.currency_converter import CurrencyConverter
+from app.services.insights.history import SubscriptionHistory
+from app.services.recommendations.store import replace_recommendations
+from app.utils.names import compact_name, url_domain
+from app.utils.serialization import dumps
+
+RULES_SOURCE = 'rules'
+
+
+class RecommendationRules:
+    """
+    Rule-based recommendations, computed in milliseconds per batch of users
+
+    - Duplicates: active subscriptions sharing a normalized name or website
+      domain are one service paid for more than once.
+    - Yearly plans: a subscription billed monthly (or weekly/daily) costs
+      noticeably more than the yearly plan of the same service, as paid by
+      other users in the same currency (median, compared as monthly costs
+      with BillingCycleCalculator).
+
+    What the rules can't judge is escalated to the AI provider: users with
+    two or more subscriptions in the same category (or uncategorized) that
+    no rule explains, where overlaps, bundles and alternatives are a matter
+    of knowing the services.
+    """
+
+    USER_CHUNK_SIZE = 1000
+
+    # Users who must pay yearly for a service before their price is used
+    MIN_YEARLY_PLANS = 3
+
+    # Smallest saving worth suggesting a yearly plan for (share of the monthly cost)
+    MIN_YEARLY_SAVINGS = 0.10
+
+    def __init__(self):
+        self._yearly_prices = None
+
+    def run(self, user_ids: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Evaluate the rules and store their recommendations
+
+        Args:
+            user_ids: Users to evaluate (default: all)
+
+        Returns:
+            {'users', 'recommendations' (inserted), 'escalated' (user IDs for the AI provider)}
+        """
+        if user_ids is None:
+            user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+        user_ids = sorted(set(user_ids))
+
+        result = {'users': len(user_ids), 'recommendations': 0, 'escalated': []}
+        for start in range(0, len(user_ids), self.USER_CHUNK_SIZE):
+            chunk = user_ids[start:start + self.USER_CHUNK_SIZE]
+            mappings, escalated = self.evaluate(chunk)
+            result['recommendations'] += replace_recommendations(db.session, RULES_SOURCE, chunk, mappings)
+            result['escalated'] += escalated
+            db.session.commit()
+
+        return result
+
+    def evaluate(self, user_ids: List[int]) -> tuple:
+        """
+        Recommendations for a batch of users, without storing them
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            (AIRecommendation column dicts, user IDs to escalate)
+        """
+        history = SubscriptionHistory.load(user_ids)
+        subscriptions = history.subscriptions
+
+        categories = dict(db.session.query(Subscription.id, Subscription.category_id).filter(
+            Subscription.user_id.in_(user_ids)
+        ).all())
+        codes = dict(db.session.query(Currency.id, Currency.code).filter(
+            Currency.user_id.in_(user_ids)
+        ).all())
+
+        by_user = defaultdict(list)
+        for row in range(len(subscriptions['id'])):
+            if not subscriptions['inactive'][row]:
+                by_user[int(subscriptions['user_id'][row])].append(row)
+
+        mappings, escalated = [], []
+        for user_id, rows in by_user.items():
+            symbol = CurrencyConverter.get_currency_symbol(codes.get(history.main_currency.get(user_id), 'USD'))
+            resolved = set()
+
+            for group in self._duplicate_groups(history, rows):
+                mappings.append(self._duplicate(history, user_id, group, symbol))
+                resolved.update(group)
+
+            for row in rows:
+                if row in resolved:
+                    continue
+                mapping = self._yearly_plan(history, user_id, row, codes, symbol)
+                if mapping:
+                    mappings.append(mapping)
+                    resolved.add(row)
+
+            unresolved = defaultdict(int)
+            for row in rows:
+                if row not in resolved:
+                    unresolved[categories.get(int(subscriptions['id'][row]))] += 1
+            if any(count > 1 for count in unresolved.values()):
+                escalated.append(user_id)
+
+        return mappings, escalated
+
+    @staticmethod
+    def _duplicate_groups(history: SubscriptionHistory, rows: List[int]) -> List[List[int]]:
+        """Groups of a user's subscriptions linked by equal names or website domains"""
+        parent = {row: row for row in rows}
+
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        first_with = {}
+        for row in rows:
+            for key in (('name', compact_name(history.names[row])), ('domain', url_domain(history.urls[row]))):
+                if not key[1]:
+                    continue
+                if key in first_with:
+                    parent[find(row)] = find(first_with[key])
+                else:
+                    first_with[key] = row
+
+        groups = defaultdict(list)
+        for row in rows:
+            groups[find(row)].append(row)
+        return [group for group in groups.values() if len(group) > 1]
+
+    @staticmethod
+    def _duplicate(history: SubscriptionHistory, user_id: int, group: List[int], symbol: str) -> Dict:
+        """Recommendation to keep one subscription of a duplicate group"""
+        subscriptions = history.subscriptions
+        monthly = [float(subscriptions['monthly_main'][row]) for row in group]
+        keep = group[monthly.index(max(monthly))]
+        savings = sum(monthly) - max(monthly)
+        names = ', '.join(history.names[row] for row in group)
+
+        return {
+            'user_id': user_id,
+            'title': f'Possible duplicate: {history.names[keep]}',
+            'description': f'{names} look like the same service. '
+                           f'Keeping only {history.names[keep]} would save {symbol}{savings:.2f} per month.',
+            'savings': f'{symbol}{savings:.2f}/month' if savings > 0 else None,
+            'recommendation_type': 'duplicate',
+            'related_subscription_ids': dumps(sorted(int(subscriptions['id'][row]) for row in group)),
+            'input_hash': None
+        }
+
+    def _yearly_plan(self, history: SubscriptionHistory, user_id: int, row: int, codes: Dict,
+                     symbol: str) -> Optional[Dict]:
+        """Recommendation to switch a subscription to its cheaper yearly plan, if there is one"""
+        subscriptions = history.subscriptions
+        cycle = int(subscriptions['cycle'][row])
+        price = float(subscriptions['price'][row])
+        if cycle == BillingCycleCalculator.CYCLE_YEARS or price <= 0:
+            return None
+
+        code = codes.get(int(subscriptions['currency_id'][row]))
+        yearly = self.yearly_prices().get((compact_name(history.names[row]), code))
+        if yearly is None:
+            return None
+
+        monthly = BillingCycleCalculator.calculate_monthly_cost(price, cycle, int(subscriptions['frequency'][row]))
+        yearly_monthly = BillingCycleCalculator.calculate_monthly_cost(yearly, BillingCycleCalculator.CYCLE_YEARS, 1)
+        if yearly_monthly > monthly * (1 - self.MIN_YEARLY_SAVINGS):
+            return None
+
+        name = history.names[row]
+        savings = (monthly - yearly_monthly) * float(subscriptions['to_main'][row])
+        cycle_name = BillingCycleCalculator.get_cycle_name(cycle, int(subscriptions['frequency'][row])).lower()
+
+        return {
+            'user_id': user_id,
+            'title': f'Switch {name} to yearly billing',
+            'description': f'Others pay {yearly:.2f} {code} a year for {name}, '
+                           f'{symbol}{savings:.2f} per month less than your {cycle_name} plan.',
+            'savings': f'{symbol}{savings:.2f}/month',
+            'recommendation_type': 'optimize',
+            'related_subscription_ids': dumps([int(subscriptions['id'][row])]),
+            'input_hash': None
+        }
+
+    def yearly_prices(self) -> Dict[tuple, float]:
+        """
+        Typical yearly price per service and currency, from all users' yearly subscriptions
+
+        Loaded once per instance.
+
+        Returns:
+            (compact name, currency code) -> median price for one year
+        """
+        if self._yearly_prices is not None:
+            return self._yearly_prices
+
+        rows = db.session.query(
+            Subscription.user_id, Subscription.name, Subscription.price, Subscription.frequency, Currency.code
+        ).join(Currency, Subscription.currency_id == Currency.id).filter(
+            Subscription.cycle == BillingCycleCalculator.CYCLE_YEARS,
+            Subscription.inactive == False,
+            Subscription.price > 0
+        )
+
+        # Cheapest yearly price per user, so one user's duplicates count once
+        per_user = {}
+        for user_id, name, price, frequency, code in rows:
+            key = (compact_name(name), code)
+            if not key[0]:
+                continue
+            price = float(price) / (frequency or 1)
+            per_user[key, user_id] = min(price, per_user.get((key, user_id), price))
+
+        prices = defaultdict(list)
+        for (key, _), price in per_user.items():
+            prices[key].append(price)
+
+        self._yearly_prices = {
+            key: median(values) for key, values in prices.items() if len(values) >= self.MIN_YEARLY_PLANS
+        }
+        return self._yearly_prices
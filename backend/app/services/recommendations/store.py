@@ -0,0 +1,79 @@
+"""
+Recommendation Store
+Replaces users' open recommendations from one source without churn
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from app.models.ai_recommendation import AIRecommendation
+from app.utils.data_version import bump_data_version
+
+# Columns that make two recommendations the same
+FIELDS = ('title', 'description', 'savings', 'recommendation_type', 'related_subscription_ids', 'input_hash')
+
+
+def replace_recommendations(session, source: str, user_ids: Iterable[int], mappings: List[Dict]) -> int:
+    """
+    Replace the open recommendations of one source for some users
+
+    Recommendations the user dismissed (same title and subscriptions) are
+    not re-created. Users whose open recommendations already match are
+    left untouched, so rows keep their IDs and data versions only change
+    when something did. Does not commit.
+
+    Args:
+        session: Database session
+        source: Recommendation source ('rules' or a provider name)
+        user_ids: Users whose recommendations are replaced (users without mappings lose theirs)
+        mappings: AIRecommendation column dicts (user_id, title, description, ...)
+
+    Returns:
+        Number of recommendations inserted
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return 0
+
+    dismissed = set(session.query(
+        AIRecommendation.user_id, AIRecommendation.title, AIRecommendation.related_subscription_ids
+    ).filter(
+        AIRecommendation.user_id.in_(user_ids),
+        AIRecommendation.source == source,
+        AIRecommendation.dismissed.is_(True)
+    ))
+
+    wanted = defaultdict(list)
+    for mapping in mappings:
+        if (mapping['user_id'], mapping['title'], mapping['related_subscription_ids']) not in dismissed:
+            wanted[mapping['user_id']].append(mapping)
+
+    current = defaultdict(set)
+    for row in session.query(AIRecommendation.user_id, *[getattr(AIRecommendation, field) for field in FIELDS]).filter(
+        AIRecommendation.user_id.in_(user_ids),
+        AIRecommendation.source == source,
+        AIRecommendation.dismissed.is_(False)
+    ):
+        current[row[0]].add(tuple(row[1:]))
+
+    changed = [
+        user_id for user_id in user_ids
+        if current.get(user_id, set()) != {tuple(mapping.get(field) for field in FIELDS) for mapping in wanted[user_id]}
+    ]
+    if not changed:
+        return 0
+
+    session.query(AIRecommendation).filter(
+        AIRecommendation.user_id.in_(changed),
+        AIRecommendation.source == source,
+        AIRecommendation.dismissed.is_(False)
+    ).delete(synchronize_session=False)
+
+    inserted = [
+        {**mapping, 'source': source, 'dismissed': False}
+        for user_id in changed
+        for mapping in wanted[user_id]
+    ]
+    if inserted:
+        session.bulk_insert_mappings(AIRecommendation, inserted)
+
+    bump_data_version(session, changed)
+    return len(inserted)
@@ -0,0 +1,174 @@
+"""
+Local AI Recommendation Stub Server
+Answers OpenAI, Gemini and Ollama requests with deterministic recommendations
+
+Useful for tests, benchmarks and offline development:
+
+    python -m app.services.recommendations.stub_server --port 8098
+
+then set AI_PROVIDER=ollama and AI_BASE_URL=http://localhost:8098 (or
+AI_PROVIDER=openai with AI_BASE_URL=http://localhost:8098/v1 and any
+OPENAI_API_KEY).
+
+Recommendations are derived from the prompt lines: subscriptions sharing
+a category are reported as duplicates and the most expensive one as a
+candidate for a cheaper plan.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+LINE = re.compile(r'^(\d+)\|([^|]*)\|([\d.]+)\|([^|]*)\|([^|]*)$', re.MULTILINE)
+
+
+def recommend(prompt: str) -> dict:
+    """
+    Deterministic recommendations for a prompt built by build_prompt()
+
+    Args:
+        prompt: User prompt
+
+    Returns:
+        {'recommendations': [...]} in the format the service asks for
+    """
+    items = [
+        (int(number), name, float(cost), category)
+        for number, name, cost, _, category in LINE.findall(prompt)
+    ]
+
+    recommendations = []
+    by_category = defaultdict(list)
+    for item in items:
+        if item[3]:
+            by_category[item[3]].append(item)
+
+    for category, grouped in sorted(by_category.items()):
+        if len(grouped) > 1:
+            costs = [cost for _, _, cost, _ in grouped]
+            recommendations.append({
+                'type': 'duplicate',
+                'title': f'Overlapping {category} subscriptions',
+                'description': 'You pay for ' + ', '.join(name for _, name, _, _ in grouped) + '.',
+                'monthly_savings': round(sum(costs) - max(costs), 2),
+                'items': [number for number, _, _, _ in grouped]
+            })
+
+    if items:
+        number, name, cost, _ = max(items, key=lambda item: item[2])
+        recommendations.append({
+            'type': 'optimize',
+            'title': f'Review your {name} plan',
+            'description': f'{name} is your most expensive subscription.',
+            'monthly_savings': round(cost * 0.2, 2),
+            'items': [number]
+        })
+
+    return {'recommendations': recommendations}
+
+
+def make_handler(server_state: dict):
+    """
+    Build a request handler sharing counters through server_state
+
+    Args:
+        server_state: {'requests': 0, 'delay': seconds, 'fail_first': n 429 responses}
+
+    Returns:
+        BaseHTTPRequestHandler subclass
+    """
+    lock = threading.Lock()
+
+    class RecommendationStubHandler(BaseHTTPRequestHandler):
+        """Reply in the shape of whichever API the path belongs to"""
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._reply(400, {'error': 'invalid JSON'})
+                return
+
+            with lock:
+                server_state['requests'] += 1
+                rate_limited = server_state['fail_first'] > 0
+                if rate_limited:
+                    server_state['fail_first'] -= 1
+
+            if rate_limited:
+                self._reply(429, {'error': 'rate limited'}, {'Retry-After': '0'})
+                return
+
+            if server_state['delay']:
+                time.sleep(server_state['delay'])
+
+            if self.path.startswith('/api/chat'):
+                prompt = payload['messages'][-1]['content']
+                content = json.dumps(recommend(prompt))
+                self._reply(200, {'model': payload.get('model'), 'message': {'role': 'assistant', 'content': content}})
+            elif ':generateContent' in self.path:
+                prompt = payload['contents'][-1]['parts'][0]['text']
+                content = json.dumps(recommend(prompt))
+                self._reply(200, {'candidates': [{'content': {'role': 'model', 'parts': [{'text': content}]}}]})
+            elif self.path.endswith('/chat/completions'):
+                prompt = payload['messages'][-1]['content']
+                content = json.dumps(recommend(prompt))
+                self._reply(200, {'choices': [{'message': {'role': 'assistant', 'content': content}}]})
+            else:
+                self._reply(404, {'error': 'unknown endpoint'})
+
+        def _reply(self, status: int, body: dict, headers: dict = None):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RecommendationStubHandler
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, delay: float = 0.0,
+                      fail_first: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stub server in a background thread
+
+    Args:
+        host: Bind address
+        port: Port (0 picks a free port)
+        delay: Seconds to wait before each reply (simulated model latency)
+        fail_first: Number of initial requests answered with HTTP 429
+
+    Returns:
+        Running server; server.state['requests'] counts requests,
+        server.server_address holds the bound port and server.shutdown() stops it
+    """
+    state = {'requests': 0, 'delay': delay, 'fail_first': fail_first}
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.state = state
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve deterministic AI recommendations over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8098)
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds per reply')
+    args = parser.parse_args()
+
+    state = {'requests': 0, 'delay': args.delay, 'fail_first': 0}
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Serving AI recommendations on http://{args.host}:{args.port}/")
+    server.serve_forever()
@@ -0,0 +1,299 @@
+"""
+Session Manager
+Tracks issued login tokens and answers revocation checks from memory
+"""
+import hashlib
+import math
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from app import db
+from app.models.session import UserSession
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    Membership tests never give false negatives, so a miss proves a
+    token is not revoked without touching the exact set.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        """
+        Initialize filter
+
+        Args:
+            capacity: Expected number of entries
+            error_rate: Target false positive rate at capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        """Bit positions for an item (double hashing over one digest)"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        """Add an item"""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenDenylist:
+    """
+    In-memory set of revoked JWT IDs, synced incrementally from user_sessions
+
+    Lookups hit a Bloom filter first; only filter positives consult the
+    exact jti -> expiry map. Every sync_interval seconds, rows whose
+    revoked_at is past the last watermark are pulled in; every
+    rebuild_interval seconds the filter is rebuilt without expired tokens.
+    """
+
+    # Re-read this far behind the watermark to tolerate clock skew between nodes
+    SYNC_OVERLAP = timedelta(seconds=60)
+
+    def __init__(self):
+        self.capacity = 100000
+        self.sync_interval = 5
+        self.rebuild_interval = 3600
+        self._revoked = {}
+        self._bloom = BloomFilter(self.capacity)
+        self._watermark = None
+        self._last_sync = 0.0
+        self._last_rebuild = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Configure from Flask app config
+
+        Args:
+            app: Flask application instance
+        """
+        self.capacity = app.config.get('TOKEN_DENYLIST_CAPACITY', 100000)
+        self.sync_interval = app.config.get('TOKEN_DENYLIST_SYNC_INTERVAL', 5)
+        self.rebuild_interval = app.config.get('TOKEN_DENYLIST_REBUILD_INTERVAL', 3600)
+        self.reset()
+
+    def reset(self):
+        """Forget all state; the next check performs a full sync"""
+        with self._lock:
+            self._revoked = {}
+            self._bloom = BloomFilter(self.capacity)
+            self._watermark = None
+            self._last_sync = 0.0
+            self._last_rebuild = 0.0
+
+    def _add(self, jti: str, expires_at: datetime):
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+
+    def add(self, jti: str, expires_at: datetime):
+        """
+        Record a revocation made by this process
+
+        Args:
+            jti: JWT ID
+            expires_at: Token expiry (UTC)
+        """
+        with self._lock:
+            self._add(jti, expires_at)
+
+    def _rebuild(self):
+        """Reload all unexpired revocations and rebuild the filter"""
+        now = datetime.utcnow()
+        rows = db.session.query(
+            UserSession.jti,
+            UserSession.expires_at,
+            UserSession.revoked_at
+        ).filter(
+            UserSession.revoked_at.isnot(None),
+            UserSession.expires_at > now
+        ).all()
+
+        self._revoked = {}
+        self._bloom = BloomFilter(max(self.capacity, len(rows) * 2))
+        watermark = self._watermark
+        for jti, expires_at, revoked_at in rows:
+            self._add(jti, expires_at)
+            if watermark is None or revoked_at > watermark:
+                watermark = revoked_at
+
+        self._watermark = watermark or now
+        self._last_rebuild = time.monotonic()
+
+    def _sync(self):
+        """Pull revocations newer than the watermark"""
+        rows = db.session.query(
+            UserSession.jti,
+            UserSession.expires_at,
+            UserSession.revoked_at
+        ).filter(
+            UserSession.revoked_at >= self._watermark - self.SYNC_OVERLAP
+        ).all()
+
+        for jti, expires_at, revoked_at in rows:
+            if jti not in self._revoked:
+                self._add(jti, expires_at)
+            if revoked_at > self._watermark:
+                self._watermark = revoked_at
+
+    def refresh(self, force: bool = False):
+        """
+        Sync with the database if the sync interval has elapsed
+
+        Args:
+            force: Sync regardless of the interval
+        """
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.sync_interval:
+            return
+
+        with self._lock:
+            if not force and now - self._last_sync < self.sync_interval:
+                return
+
+            if self._watermark is None or now - self._last_rebuild >= self.rebuild_interval:
+                self._rebuild()
+            else:
+                self._sync()
+
+            self._last_sync = now
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Check whether a token has been revoked
+
+        Args:
+            jti: JWT ID (tokens without one cannot be revoked)
+
+        Returns:
+            True if revoked
+        """
+        if not jti:
+            return False
+
+        self.refresh()
+
+        if jti not in self._bloom:
+            return False
+
+        return jti in self._revoked
+
+
+token_denylist = TokenDenylist()
+
+
+class SessionManager:
+    """Create, list and revoke login sessions"""
+
+    @staticmethod
+    def new_jti() -> str:
+        """Generate a unique JWT ID"""
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def create_session(user_id: int, jti: str, expires_in: int,
+                       user_agent: Optional[str] = None,
+                       ip_address: Optional[str] = None) -> UserSession:
+        """
+        Record an issued token (caller commits)
+
+        Args:
+            user_id: User ID
+            jti: JWT ID embedded in the token
+            expires_in: Token lifetime in seconds
+            user_agent: Optional client user agent
+            ip_address: Optional client IP address
+
+        Returns:
+            New UserSession
+        """
+        session = UserSession(
+            user_id=user_id,
+            jti=jti,
+            user_agent=user_agent[:255] if user_agent else None,
+            ip_address=ip_address,
+            expires_at=datetime.utcnow() + timedelta(seconds=expires_in)
+        )
+        db.session.add(session)
+        return session
+
+    @staticmethod
+    def revoke_jti(jti: str) -> bool:
+        """
+        Revoke a single token by JWT ID
+
+        Args:
+            jti: JWT ID
+
+        Returns:
+            True if a live session was revoked
+        """
+        session = db.session.query(UserSession).filter_by(jti=jti, revoked_at=None).first()
+        if not session:
+            return False
+
+        session.revoked_at = datetime.utcnow()
+        db.session.commit()
+        token_denylist.add(session.jti, session.expires_at)
+        return True
+
+    @staticmethod
+    def revoke_user_sessions(user_id: int, except_jti: Optional[str] = None) -> int:
+        """
+        Revoke all live sessions of a user
+
+        Args:
+            user_id: User ID
+            except_jti: Optional JWT ID to keep (the caller's own session)
+
+        Returns:
+            Number of sessions revoked
+        """
+        now = datetime.utcnow()
+        query = db.session.query(UserSession).filter(
+            UserSession.user_id == user_id,
+            UserSession.revoked_at.is_(None),
+            UserSession.expires_at > now
+        )
+        if except_jti:
+            query = query.filter(UserSession.jti != except_jti)
+
+        sessions = query.all()
+        for session in sessions:
+            session.revoked_at = now
+        db.session.commit()
+
+        for session in sessions:
+            token_denylist.add(session.jti, session.expires_at)
+
+        return len(sessions)
+
+    @staticmethod
+    def list_sessions(user_id: int) -> list:
+        """
+        List live sessions of a user
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            List of UserSession, newest first
+        """
+        return db.session.query(UserSession).filter(
+            UserSession.user_id == user_id,
+            UserSession.revoked_at.is_(None),
+            UserSession.expires_at > datetime.utcnow()
+        ).order_by(UserSession.created_at.desc()).all()
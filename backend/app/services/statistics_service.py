@@ -6,12 +6,12 @@ from datetime import datetime, timedelta
 from sqlalchemy import func
 from app import db
 from app.models.subscription import Subscription
-from app.models.currency import Currency
 from app.models.category import Category
 from app.models.payment_method import PaymentMethod
 from app.models.user import User
 from app.services.billing_cycle import BillingCycleCalculator
 from app.services.currency_converter import CurrencyConverter
+from app.services.dashboard_service import DashboardService
 
 
 class StatisticsService:
@@ -26,67 +26,9 @@ class StatisticsService:
             user_id: User ID
 
         Returns:
-            Dictionary with overview metrics
+            Dictionary with overview metrics (cached per data version)
         """
-        user = db.session.get(User, user_id)
-
-        # Count active and inactive subscriptions
-        active_count = db.session.query(Subscription).filter_by(
-            user_id=user_id,
-            inactive=False
-        ).count()
-
-        inactive_count = db.session.query(Subscription).filter_by(
-            user_id=user_id,
-            inactive=True
-        ).count()
-
-        # Calculate total monthly cost
-        subscriptions = db.session.query(Subscription).filter_by(
-            user_id=user_id,
-            inactive=False
-        ).all()
-
-        total_monthly = 0.0
-        for sub in subscriptions:
-            monthly_cost = BillingCycleCalculator.calculate_monthly_cost(
-                sub.price,
-                sub.cycle,
-                sub.frequency
-            )
-
-            # Convert to main currency
-            if user and user.main_currency and sub.currency_id != user.main_currency:
-                try:
-                    monthly_cost = CurrencyConverter.convert(
-                        monthly_cost,
-                        sub.currency_id,
-                        user.main_currency
-                    )
-                except ValueError:
-                    pass
-
-            total_monthly += monthly_cost
-
-        # Calculate average subscription cost
-        avg_monthly = total_monthly / active_count if active_count > 0 else 0
-
-        # Get main currency symbol
-        currency_symbol = '$'
-        if user and user.main_currency:
-            currency = db.session.get(Currency, user.main_currency)
-            if currency:
-                currency_symbol = currency.symbol
-
-        return {
-            'active_subscriptions': active_count,
-            'inactive_subscriptions': inactive_count,
-            'total_subscriptions': active_count + inactive_count,
-            'total_monthly_cost': round(total_monthly, 2),
-            'total_yearly_cost': round(total_monthly * 12, 2),
-            'average_subscription_cost': round(avg_monthly, 2),
-            'currency_symbol': currency_symbol
-        }
+        return DashboardService.build(user_id, ['overview'])['overview']
 
     @staticmethod
     def get_by_category(user_id: int) -> list:
@@ -97,61 +39,9 @@ class StatisticsService:
             user_id: User ID
 
         Returns:
-            List of category spending data
+            List of category spending data (cached per data version)
         """
-        user = db.session.get(User, user_id)
-        subscriptions = db.session.query(Subscription).filter_by(
-            user_id=user_id,
-            inactive=False
-        ).all()
-
-        category_data = {}
-
-        for sub in subscriptions:
-            category_name = sub.category.name if sub.category else 'Uncategorized'
-            category_id = sub.category_id if sub.category else None
-
-            monthly_cost = BillingCycleCalculator.calculate_monthly_cost(
-                sub.price,
-                sub.cycle,
-                sub.frequency
-            )
-
-            # Convert to main currency
-            if user and user.main_currency and sub.currency_id != user.main_currency:
-                try:
-                    monthly_cost = CurrencyConverter.convert(
-                        monthly_cost,
-                        sub.currency_id,
-                        user.main_currency
-                    )
-                except ValueError:
-                    pass
-
-            if category_name not in category_data:
-                category_data[category_name] = {
-                    'category_id': category_id,
-                    'category_name': category_name,
-                    'monthly_cost': 0.0,
-                    'yearly_cost': 0.0,
-                    'subscription_count': 0
-                }
-
-            category_data[category_name]['monthly_cost'] += monthly_cost
-            category_data[category_name]['yearly_cost'] += monthly_cost * 12
-            category_data[category_name]['subscription_count'] += 1
-
-        # Round values and convert to list
-        result = []
-        for data in category_data.values():
-            data['monthly_cost'] = round(data['monthly_cost'], 2)
-            data['yearly_cost'] = round(data['yearly_cost'], 2)
-            result.append(data)
-
-        # Sort by monthly cost descending
-        result.sort(key=lambda x: x['monthly_cost'], reverse=True)
-
-        return result
+        return DashboardService.build(user_id, ['by_category'])['by_category']
 
     @staticmethod
     def get_by_payment_method(user_id: int) -> list:
@@ -162,67 +52,45 @@ class StatisticsService:
             user_id: User ID
 
         Returns:
-            List of payment method spending data
+            List of payment method spending data (cached per data version)
         """
-        user = db.session.get(User, user_id)
-        subscriptions = db.session.query(Subscription).filter_by(
-            user_id=user_id,
-            inactive=False
-        ).all()
+        return DashboardService.build(user_id, ['by_payment_method'])['by_payment_method']
 
-        payment_method_data = {}
+    @staticmethod
+    def get_by_payer(user_id: int) -> list:
+        """
+        Get spending breakdown by payer (household member)
 
-        for sub in subscriptions:
-            pm_name = sub.payment_method.name if sub.payment_method else 'No Payment Method'
-            pm_id = sub.payment_method_id if sub.payment_method else None
+        Args:
+            user_id: User ID
 
-            monthly_cost = BillingCycleCalculator.calculate_monthly_cost(
-                sub.price,
-                sub.cycle,
-                sub.frequency
-            )
+        Returns:
+            List of payer spending data (cached per data version)
+        """
+        return DashboardService.build(user_id, ['by_payer'])['by_payer']
+
+    @staticmethod
+    def get_settlement(user_id: int) -> dict:
+        """
+        Get who owes whom for shared subscriptions
 
-            # Convert to main currency
-            if user and user.main_currency and sub.currency_id != user.main_currency:
-                try:
-                    monthly_cost = CurrencyConverter.convert(
-                        monthly_cost,
-                        sub.currency_id,
-                        user.main_currency
-                    )
-                except ValueError:
-                    pass
-
-            if pm_name not in payment_method_data:
-                payment_method_data[pm_name] = {
-                    'payment_method_id': pm_id,
-                    'payment_method_name': pm_name,
-                    'monthly_cost': 0.0,
-                    'yearly_cost': 0.0,
-                    'subscription_count': 0
-                }
-
-            payment_method_data[pm_name]['monthly_cost'] += monthly_cost
-            payment_method_data[pm_name]['yearly_cost'] += monthly_cost * 12
-            payment_method_data[pm_name]['subscription_count'] += 1
-
-        # Round values and convert to list
-        result = []
-        for data in payment_method_data.values():
-            data['monthly_cost'] = round(data['monthly_cost'], 2)
-            data['yearly_cost'] = round(data['yearly_cost'], 2)
-            result.append(data)
-
-        # Sort by monthly cost descending
-        result.sort(key=lambda x: x['monthly_cost'], reverse=True)
-
-        return result
+        Args:
+            user_id: User ID
+
+        Returns:
+            Household settlement (cached per data version)
+        """
+        return DashboardService.build(user_id, ['settlement'])['settlement']
 
     @staticmethod
     def get_trends(user_id: int, months: int = 6) -> dict:
         """
         Get spending trends over time
 
+        Today's active subscriptions, priced in the main currency at each
+        month's exchange rates (from the rate history), so the trend shows
+        how currency movements changed what they cost.
+
         Args:
             user_id: User ID
             months: Number of months to analyze
@@ -231,32 +99,22 @@ class StatisticsService:
             Dictionary with trend data
         """
         # This would require tracking historical data
-        # For now, return current month projection
+        # For now, project today's subscriptions onto each month's rates
         user = db.session.get(User, user_id)
         subscriptions = db.session.query(Subscription).filter_by(
             user_id=user_id,
             inactive=False
         ).all()
 
-        total_monthly = 0.0
+        # Monthly cost per currency, converted once per month below
+        by_currency = {}
         for sub in subscriptions:
             monthly_cost = BillingCycleCalculator.calculate_monthly_cost(
                 sub.price,
                 sub.cycle,
                 sub.frequency
             )
-
-            if user and user.main_currency and sub.currency_id != user.main_currency:
-                try:
-                    monthly_cost = CurrencyConverter.convert(
-                        monthly_cost,
-                        sub.currency_id,
-                        user.main_currency
-                    )
-                except ValueError:
-                    pass
-
-            total_monthly += monthly_cost
+            by_currency[sub.currency_id] = by_currency.get(sub.currency_id, 0.0) + monthly_cost
 
         # Generate trend data (simplified - would need historical tracking for real trends)
         trend_data = []
@@ -264,6 +122,22 @@ class StatisticsService:
 
         for i in range(months):
             month_date = current_date - timedelta(days=30 * i)
+
+            total_monthly = 0.0
+            for currency_id, monthly_cost in by_currency.items():
+                if user and user.main_currency and currency_id != user.main_currency:
+                    try:
+                        monthly_cost = CurrencyConverter.convert(
+                            monthly_cost,
+                            currency_id,
+                            user.main_currency,
+                            at=month_date.date()
+                        )
+                    except ValueError:
+                        pass
+
+                total_monthly += monthly_cost
+
             trend_data.insert(0, {
                 'month': month_date.strftime('%Y-%m'),
                 'monthly_cost': round(total_monthly, 2),
@@ -285,27 +159,9 @@ class StatisticsService:
             days: Number of days to look ahead
 
         Returns:
-            List of upcoming renewals
+            List of upcoming renewals (cached per data version)
         """
-        today = datetime.now().date()
-        end_date = today + timedelta(days=days)
-
-        subscriptions = db.session.query(Subscription).filter(
-            Subscription.user_id == user_id,
-            Subscription.inactive == False,
-            Subscription.next_payment >= today,
-            Subscription.next_payment <= end_date
-        ).order_by(Subscription.next_payment).all()
-
-        result = []
-        for sub in subscriptions:
-            days_until = (sub.next_payment - today).days
-            result.append({
-                'subscription': sub.to_dict(),
-                'days_until_renewal': days_until
-            })
-
-        return result
+        return DashboardService.build(user_id, ['upcoming'], upcoming_days=days)['upcoming']
 
     @staticmethod
     def get_most_expensive(user_id: int, limit: int = 5) -> list:
@@ -317,41 +173,7 @@ class StatisticsService:
             limit: Number of subscriptions to return
 
         Returns:
-            List of most expensive subscriptions
+            List of most expensive subscriptions (cached per data version)
         """
-        user = db.session.get(User, user_id)
-        subscriptions = db.session.query(Subscription).filter_by(
-            user_id=user_id,
-            inactive=False
-        ).all()
-
-        # Calculate monthly cost for each
-        subscription_costs = []
-        for sub in subscriptions:
-            monthly_cost = BillingCycleCalculator.calculate_monthly_cost(
-                sub.price,
-                sub.cycle,
-                sub.frequency
-            )
-
-            # Convert to main currency
-            if user and user.main_currency and sub.currency_id != user.main_currency:
-                try:
-                    monthly_cost = CurrencyConverter.convert(
-                        monthly_cost,
-                        sub.currency_id,
-                        user.main_currency
-                    )
-                except ValueError:
-                    pass
-
-            subscription_costs.append({
-                'subscription': sub.to_dict(),
-                'monthly_cost': round(monthly_cost, 2),
-                'yearly_cost': round(monthly_cost * 12, 2)
-            })
-
-        # Sort by monthly cost descending
-        subscription_costs.sort(key=lambda x: x['monthly_cost'], reverse=True)
+        return DashboardService.build(user_id, ['most_expensive'], limit=limit)['most_expensive']
 
-        return subscription_costs[:limit]
@@ -0,0 +1,405 @@
+"""
+Bulk Subscription Operations
+Set-based update, inactivation, renewal and deletion of many subscriptions
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+from app import db
+from app.models.subscription import Subscription
+from app.models.currency import Currency
+from app.models.category import Category
+from app.models.payment_method import PaymentMethod
+from app.models.household import HouseholdMember
+from app.models.receipt import Receipt
+from app.models.price_change import SubscriptionPriceChange
+from app.services.billing_cycle import BillingCycleCalculator
+from app.utils.change_feed import record_changes
+from app.utils.data_version import bump_data_version
+from app.utils.price_history import record_price_changes
+
+
+class BulkOperationError(Exception):
+    """Raised when a bulk request is invalid as a whole"""
+    pass
+
+
+class SubscriptionBulkService:
+    """
+    Apply one action to many subscriptions
+
+    Targets are given as a list of IDs or a filter. Each action runs as
+    one statement over all matched rows (renewal, whose new dates depend
+    on each row's cycle, as one executemany UPDATE); IDs that don't
+    exist or belong to another user are reported as failures.
+    """
+
+    MAX_TARGETS = 5000
+    ACTIONS = ('update', 'inactivate', 'renew', 'delete')
+
+    UPDATABLE_FIELDS = [
+        'name', 'price', 'currency_id', 'cycle', 'frequency', 'next_payment',
+        'auto_renew', 'logo', 'url', 'notes', 'category_id', 'payer_user_id',
+        'shared', 'payment_method_id', 'notify_days_before'
+    ]
+
+    # Text fields -> maximum length (None for unlimited)
+    TEXT_LIMITS = {'name': 255, 'logo': 255, 'url': 500, 'notes': None}
+
+    # Lookup fields -> model, checked for ownership
+    LOOKUPS = {
+        'currency_id': Currency,
+        'category_id': Category,
+        'payment_method_id': PaymentMethod,
+        'payer_user_id': HouseholdMember
+    }
+
+    FILTERS = ('category_id', 'payment_method_id', 'payer_id', 'currency_id', 'inactive',
+               'cycle', 'next_payment_before', 'next_payment_after', 'name_contains')
+
+    MAX_ID = 2 ** 63 - 1  # largest value a BIGINT/SQLite integer column can compare against
+
+    @staticmethod
+    def resolve_targets(user_id: int, ids: Optional[list] = None, filters: Optional[dict] = None) -> tuple:
+        """
+        Find the subscriptions an action applies to
+
+        Args:
+            user_id: User ID
+            ids: Subscription IDs
+            filters: Filter expression (see FILTERS)
+
+        Returns:
+            (matched IDs, failures for IDs that weren't found)
+
+        Raises:
+            BulkOperationError: If neither or both of ids/filter are given, or input is invalid
+        """
+        if (ids is None) == (filters is None):
+            raise BulkOperationError("Provide either 'ids' or 'filter'")
+
+        query = db.session.query(Subscription.id).filter(Subscription.user_id == user_id)
+
+        if ids is not None:
+            if not isinstance(ids, list) or not ids:
+                raise BulkOperationError("'ids' must be a non-empty list")
+            if len(ids) > SubscriptionBulkService.MAX_TARGETS:
+                raise BulkOperationError(f'At most {SubscriptionBulkService.MAX_TARGETS} subscriptions per request')
+
+            requested = []
+            failed = []
+            seen = set()
+            for value in ids:
+                if not SubscriptionBulkService._is_id(value):
+                    failed.append({'id': value, 'error': 'Invalid subscription ID'})
+                elif value not in seen:
+                    seen.add(value)
+                    requested.append(value)
+
+            found = {row[0] for row in query.filter(Subscription.id.in_(requested)).all()} if requested else set()
+            matched = [value for value in requested if value in found]
+            failed += [{'id': value, 'error': 'Subscription not found'} for value in requested if value not in found]
+            return matched, failed
+
+        query = SubscriptionBulkService._apply_filters(query, filters)
+        matched = [row[0] for row in query.order_by(Subscription.id).limit(SubscriptionBulkService.MAX_TARGETS + 1).all()]
+        if len(matched) > SubscriptionBulkService.MAX_TARGETS:
+            raise BulkOperationError(
+                f'Filter matches more than {SubscriptionBulkService.MAX_TARGETS} subscriptions'
+            )
+        return matched, []
+
+    @staticmethod
+    def _apply_filters(query, filters: dict):
+        """Apply a filter expression to a subscription query"""
+        if not isinstance(filters, dict):
+            raise BulkOperationError("'filter' must be an object")
+
+        unknown = set(filters) - set(SubscriptionBulkService.FILTERS)
+        if unknown:
+            raise BulkOperationError(f"Unknown filter fields: {', '.join(sorted(unknown))}")
+
+        columns = {
+            'category_id': Subscription.category_id,
+            'payment_method_id': Subscription.payment_method_id,
+            'payer_id': Subscription.payer_user_id,
+            'currency_id': Subscription.currency_id,
+            'cycle': Subscription.cycle
+        }
+        for field, column in columns.items():
+            if field not in filters:
+                continue
+            value = filters[field]
+            if field == 'cycle':
+                if not SubscriptionBulkService._is_int(value) or value not in [1, 2, 3, 4]:
+                    raise BulkOperationError('Invalid cycle filter. Must be 1, 2, 3 or 4')
+            elif value is not None and not SubscriptionBulkService._is_id(value):
+                raise BulkOperationError(f'{field} filter must be an integer or null')
+            query = query.filter(column == value)
+
+        if 'inactive' in filters:
+            if not isinstance(filters['inactive'], bool):
+                raise BulkOperationError('inactive filter must be true or false')
+            query = query.filter(Subscription.inactive == filters['inactive'])
+
+        for field in ('next_payment_before', 'next_payment_after', 'name_contains'):
+            if field in filters and not isinstance(filters[field], str):
+                raise BulkOperationError(f'{field} filter must be a string')
+
+        if 'next_payment_before' in filters:
+            query = query.filter(
+                Subscription.next_payment <= SubscriptionBulkService._parse_date(filters['next_payment_before'])
+            )
+        if 'next_payment_after' in filters:
+            query = query.filter(
+                Subscription.next_payment >= SubscriptionBulkService._parse_date(filters['next_payment_after'])
+            )
+
+        if filters.get('name_contains'):
+            pattern = filters['name_contains'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query = query.filter(Subscription.name.ilike(f'%{pattern}%', escape='\\'))
+
+        return query
+
+    @staticmethod
+    def _parse_date(value):
+        """Parse a YYYY-MM-DD date"""
+        try:
+            return datetime.strptime(str(value), '%Y-%m-%d').date()
+        except ValueError:
+            raise BulkOperationError('Invalid date format. Use YYYY-MM-DD')
+
+    @staticmethod
+    def validate_fields(user_id: int, fields: dict) -> dict:
+        """
+        Validate field updates
+
+        Args:
+            user_id: User ID
+            fields: Field name -> new value
+
+        Returns:
+            Validated values ready for the UPDATE statement
+
+        Raises:
+            BulkOperationError: If a field is unknown or a value is invalid
+        """
+        if not isinstance(fields, dict) or not fields:
+            raise BulkOperationError("'fields' must be a non-empty object")
+
+        unknown = set(fields) - set(SubscriptionBulkService.UPDATABLE_FIELDS)
+        if unknown:
+            raise BulkOperationError(f"Fields can't be updated: {', '.join(sorted(unknown))}")
+
+        values = dict(fields)
+
+        if 'name' in values:
+            if not isinstance(values['name'], str) or not values['name'].strip():
+                raise BulkOperationError('Name must not be empty')
+            if len(values['name']) > SubscriptionBulkService.TEXT_LIMITS['name']:
+                raise BulkOperationError('Name must be at most 255 characters')
+
+        if 'price' in values and (not SubscriptionBulkService._is_number(values['price']) or
+                                  not 0 <= values['price'] < float('inf')):
+            raise BulkOperationError('Price must be a non-negative number')
+
+        if 'cycle' in values and (not SubscriptionBulkService._is_int(values['cycle']) or
+                                  values['cycle'] not in [1, 2, 3, 4]):
+            raise BulkOperationError('Invalid cycle. Must be 1 (days), 2 (weeks), 3 (months), or 4 (years)')
+
+        if 'frequency' in values and (not SubscriptionBulkService._is_int(values['frequency']) or
+                                      values['frequency'] < 1 or values['frequency'] > 366):
+            raise BulkOperationError('Frequency must be between 1 and 366')
+
+        if 'notify_days_before' in values and (not SubscriptionBulkService._is_int(values['notify_days_before']) or
+                                               not 0 <= values['notify_days_before'] <= 365):
+            raise BulkOperationError('notify_days_before must be an integer between 0 and 365')
+
+        for field in ('auto_renew', 'shared'):
+            if field in values and not isinstance(values[field], bool):
+                raise BulkOperationError(f'{field} must be true or false')
+
+        for field, limit in SubscriptionBulkService.TEXT_LIMITS.items():
+            value = values.get(field)
+            if field == 'name' or value is None:
+                continue
+            if not isinstance(value, str):
+                raise BulkOperationError(f'{field} must be a string')
+            if limit and len(value) > limit:
+                raise BulkOperationError(f'{field} must be at most {limit} characters')
+
+        if 'next_payment' in values and values['next_payment'] is not None:
+            values['next_payment'] = SubscriptionBulkService._parse_date(values['next_payment'])
+
+        for field, model in SubscriptionBulkService.LOOKUPS.items():
+            value = values.get(field)
+            if value is None:
+                if field == 'currency_id' and field in values:
+                    raise BulkOperationError('currency_id must not be null')
+                continue
+            if not SubscriptionBulkService._is_id(value):
+                raise BulkOperationError(f'{field} must be an integer')
+            owned = db.session.query(model.id).filter(model.id == value, model.user_id == user_id).first()
+            if not owned:
+                raise BulkOperationError(f'Unknown {field}: {value}')
+
+        return values
+
+    @staticmethod
+    def _is_int(value) -> bool:
+        """True for ints (bools are not accepted as numbers)"""
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    @staticmethod
+    def _is_id(value) -> bool:
+        """True for ints in the range of a database ID"""
+        return SubscriptionBulkService._is_int(value) and 0 < value <= SubscriptionBulkService.MAX_ID
+
+    @staticmethod
+    def _is_number(value) -> bool:
+        """True for ints and floats, excluding bools"""
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    @staticmethod
+    def update_fields(user_id: int, ids: list, values: dict) -> int:
+        """Set the same field values on all matched subscriptions"""
+        record_price_changes(db.session, user_id, ids, values)
+        return db.session.query(Subscription).filter(
+            Subscription.user_id == user_id,
+            Subscription.id.in_(ids)
+        ).update(values, synchronize_session=False)
+
+    @staticmethod
+    def inactivate(user_id: int, ids: list, cancellation_date=None,
+                   replacement_subscription_id: Optional[int] = None) -> int:
+        """Mark all matched subscriptions inactive"""
+        return db.session.query(Subscription).filter(
+            Subscription.user_id == user_id,
+            Subscription.id.in_(ids)
+        ).update({
+            'inactive': True,
+            'cancellation_date': cancellation_date or datetime.now().date(),
+            'replacement_subscription_id': replacement_subscription_id
+        }, synchronize_session=False)
+
+    @staticmethod
+    def renew(user_id: int, ids: list) -> int:
+        """Advance next payment by one billing period on all matched subscriptions"""
+        today = datetime.now().date()
+        rows = db.session.query(
+            Subscription.id, Subscription.next_payment, Subscription.cycle, Subscription.frequency
+        ).filter(
+            Subscription.user_id == user_id,
+            Subscription.id.in_(ids)
+        ).all()
+
+        params = []
+        for subscription_id, next_payment, cycle, frequency in rows:
+            current_payment = next_payment or today
+            new_next_payment = BillingCycleCalculator.calculate_next_payment(
+                datetime.combine(current_payment, datetime.min.time()),
+                cycle,
+                frequency
+            )
+            params.append({'id': subscription_id, 'next_payment': new_next_payment.date()})
+
+        if params:
+            db.session.execute(update(Subscription), params)
+
+        return len(params)
+
+    @staticmethod
+    def delete(user_id: int, ids: list) -> int:
+        """Delete all matched subscriptions, keeping their receipts (detached)"""
+        db.session.query(Receipt).filter(
+            Receipt.subscription_id.in_(ids)
+        ).update({'subscription_id': None}, synchronize_session=False)
+
+        db.session.query(SubscriptionPriceChange).filter(
+            SubscriptionPriceChange.subscription_id.in_(ids)
+        ).delete(synchronize_session=False)
+
+        # Clear references from subscriptions that replaced a deleted one
+        db.session.query(Subscription).filter(
+            Subscription.user_id == user_id,
+            Subscription.replacement_subscription_id.in_(ids)
+        ).update({'replacement_subscription_id': None}, synchronize_session=False)
+
+        return db.session.query(Subscription).filter(
+            Subscription.user_id == user_id,
+            Subscription.id.in_(ids)
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def apply(user_id: int, action: str, data: dict) -> dict:
+        """
+        Resolve targets and run one action in a single transaction
+
+        Args:
+            user_id: User ID
+            action: update, inactivate, renew or delete
+            data: Request body (ids or filter, plus action parameters)
+
+        Returns:
+            Result with succeeded IDs and per-ID failures
+
+        Raises:
+            BulkOperationError: If the request is invalid
+        """
+        if not isinstance(data, dict):
+            raise BulkOperationError('Request body must be an object')
+
+        if action not in SubscriptionBulkService.ACTIONS:
+            raise BulkOperationError(
+                f"Invalid action. Must be one of: {', '.join(SubscriptionBulkService.ACTIONS)}"
+            )
+
+        values = None
+        cancellation_date = None
+        replacement_id = None
+
+        if action == 'update':
+            values = SubscriptionBulkService.validate_fields(user_id, data.get('fields'))
+        elif action == 'inactivate':
+            if data.get('cancellation_date'):
+                cancellation_date = SubscriptionBulkService._parse_date(data['cancellation_date'])
+            replacement_id = data.get('replacement_subscription_id')
+            if replacement_id is not None and not SubscriptionBulkService._is_id(replacement_id):
+                raise BulkOperationError('replacement_subscription_id must be an integer')
+            if replacement_id is not None and not db.session.query(Subscription.id).filter_by(
+                id=replacement_id, user_id=user_id
+            ).first():
+                raise BulkOperationError(f'Unknown replacement_subscription_id: {replacement_id}')
+
+        matched, failed = SubscriptionBulkService.resolve_targets(
+            user_id, data.get('ids'), data.get('filter')
+        )
+
+        affected = 0
+        if matched:
+            try:
+                if action == 'update':
+                    affected = SubscriptionBulkService.update_fields(user_id, matched, values)
+                elif action == 'inactivate':
+                    affected = SubscriptionBulkService.inactivate(user_id, matched, cancellation_date, replacement_id)
+                elif action == 'renew':
+                    affected = SubscriptionBulkService.renew(user_id, matched)
+                else:
+                    affected = SubscriptionBulkService.delete(user_id, matched)
+                bump_data_version(db.session, user_id)
+                record_changes(db.session, user_id, 'subscription')
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Bulk {action} failed: {e}")
+                failed += [{'id': value, 'error': 'Database error'} for value in matched]
+                matched = []
+                affected = 0
+
+        return {
+            'action': action,
+            'matched': len(matched),
+            'affected': affected,
+            'succeeded': matched,
+            'failed': failed
+        }
@@ -0,0 +1,535 @@
+"""
+Subscription Importer
+Bulk import of subscriptions from CSV or NDJSON uploads
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+from app import db
+from app.models.subscription import Subscription
+from app.models.currency import Currency
+from app.models.category import Category
+from app.models.payment_method import PaymentMethod
+from app.models.household import HouseholdMember
+from app.models.user import User
+from app.services.billing_cycle import BillingCycleCalculator
+from app.services.currency_converter import CurrencyConverter
+from app.utils.change_feed import record_changes
+from app.utils.data_version import bump_data_version
+
+
+class ImportFormatError(Exception):
+    """Raised when an upload can't be read in the requested format"""
+    pass
+
+
+class SubscriptionImporter:
+    """
+    Stream-parse an upload and bulk insert subscriptions
+
+    Rows are read one at a time and validated in batches of CHUNK_SIZE.
+    Currencies, categories, payment methods and household members are
+    resolved through lookup maps loaded once per import; unknown
+    currencies, categories and payment methods referenced by valid rows
+    are created once per batch. Each batch is inserted with bulk_insert_mappings and committed
+    on its own, so a failing batch doesn't undo the ones before it.
+    """
+
+    CHUNK_SIZE = 1000
+    MAX_ERRORS = 1000
+    FORMATS = ('csv', 'ndjson')
+
+    CYCLES = {
+        'day': 1, 'days': 1, 'daily': 1,
+        'week': 2, 'weeks': 2, 'weekly': 2,
+        'month': 3, 'months': 3, 'monthly': 3,
+        'year': 4, 'years': 4, 'yearly': 4, 'annual': 4, 'annually': 4
+    }
+
+    TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+    FALSE_VALUES = {'0', 'false', 'no', 'n', 'off', ''}
+
+    # Alternative column names (normalized) -> field name
+    ALIASES = {
+        'currency_code': 'currency',
+        'category_name': 'category',
+        'payment_method_name': 'payment_method',
+        'paid_by': 'payer',
+        'payer_name': 'payer',
+        'billing_cycle': 'cycle',
+        'payment_cycle': 'cycle',
+        'next_payment_date': 'next_payment',
+        'amount': 'price'
+    }
+
+    def __init__(self, user_id: int, create_missing: bool = True):
+        """
+        Initialize importer for a user
+
+        Args:
+            user_id: Owner of the imported subscriptions
+            create_missing: Auto-create unknown currencies, categories
+                and payment methods
+        """
+        self.user_id = user_id
+        self.create_missing = create_missing
+
+        self.total_rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.created = {'currencies': [], 'categories': [], 'payment_methods': []}
+
+        self._load_lookups()
+
+    def _load_lookups(self):
+        """Load the user's currencies, categories, payment methods and payers"""
+        currencies = db.session.query(Currency.id, Currency.code).filter_by(user_id=self.user_id).all()
+        self.currencies = {code.upper(): currency_id for currency_id, code in currencies}
+        self.currency_ids = {currency_id for currency_id, _ in currencies}
+
+        categories = db.session.query(Category.id, Category.name).filter_by(user_id=self.user_id).all()
+        self.categories = {name.strip().lower(): category_id for category_id, name in categories}
+        self.category_ids = {category_id for category_id, _ in categories}
+
+        methods = db.session.query(PaymentMethod.id, PaymentMethod.name).filter_by(user_id=self.user_id).all()
+        self.payment_methods = {name.strip().lower(): method_id for method_id, name in methods}
+        self.payment_method_ids = {method_id for method_id, _ in methods}
+
+        members = db.session.query(HouseholdMember.id, HouseholdMember.name).filter_by(user_id=self.user_id).all()
+        self.payers = {name.strip().lower(): member_id for member_id, name in members}
+        self.payer_ids = {member_id for member_id, _ in members}
+
+        main_currency = db.session.query(User.main_currency).filter_by(id=self.user_id).scalar()
+        self.default_currency_id = main_currency if main_currency in self.currency_ids else None
+
+    @staticmethod
+    def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+        """
+        Guess the upload format from its filename or content type
+
+        Returns:
+            'csv', 'ndjson' or None if unknown
+        """
+        name = (filename or '').lower()
+        if name.endswith('.csv'):
+            return 'csv'
+        if name.endswith(('.ndjson', '.jsonl', '.json')):
+            return 'ndjson'
+
+        content_type = (content_type or '').lower()
+        if 'csv' in content_type:
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type or 'json' in content_type:
+            return 'ndjson'
+
+        return None
+
+    @classmethod
+    def _normalize_key(cls, key: str) -> str:
+        """Normalize a column name (case, spaces, dashes, aliases)"""
+        key = (key or '').strip().lower().replace(' ', '_').replace('-', '_')
+        return cls.ALIASES.get(key, key)
+
+    @classmethod
+    def iter_csv(cls, stream) -> Iterator[tuple]:
+        """
+        Read CSV records one at a time
+
+        Args:
+            stream: Binary file-like object
+
+        Yields:
+            (row number, record dict, error message or None)
+        """
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        try:
+            reader = csv.reader(text)
+            header = next(reader, None)
+            if not header:
+                raise ImportFormatError('CSV upload is empty')
+            keys = [cls._normalize_key(key) for key in header]
+
+            for number, values in enumerate(reader, start=1):
+                if not any(value.strip() for value in values):
+                    continue
+                if len(values) > len(keys):
+                    yield number, None, f'Expected {len(keys)} columns, got {len(values)}'
+                    continue
+                yield number, {key: value.strip() for key, value in zip(keys, values) if key}, None
+        except UnicodeDecodeError:
+            raise ImportFormatError('Upload must be UTF-8 encoded')
+        except csv.Error as e:
+            raise ImportFormatError(f'Invalid CSV: {e}')
+        finally:
+            text.detach()
+
+    @classmethod
+    def iter_ndjson(cls, stream) -> Iterator[tuple]:
+        """
+        Read newline-delimited JSON records one at a time
+
+        Args:
+            stream: Binary file-like object
+
+        Yields:
+            (row number, record dict, error message or None)
+        """
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+        try:
+            for number, line in enumerate(text, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield number, None, 'Invalid JSON'
+                    continue
+                if not isinstance(record, dict):
+                    yield number, None, 'Each line must be a JSON object'
+                    continue
+                yield number, {cls._normalize_key(key): value for key, value in record.items()}, None
+        except UnicodeDecodeError:
+            raise ImportFormatError('Upload must be UTF-8 encoded')
+        finally:
+            text.detach()
+
+    def run(self, stream, fmt: str) -> dict:
+        """
+        Import all records from an upload
+
+        Args:
+            stream: Binary file-like object
+            fmt: 'csv' or 'ndjson'
+
+        Returns:
+            Import report (see report())
+
+        Raises:
+            ImportFormatError: If the format is unsupported or the upload unreadable
+        """
+        if fmt not in self.FORMATS:
+            raise ImportFormatError(f"Unsupported format: {fmt}. Use 'csv' or 'ndjson'")
+
+        records = self.iter_csv(stream) if fmt == 'csv' else self.iter_ndjson(stream)
+
+        batch = []
+        for number, record, error in records:
+            self.total_rows += 1
+            if error:
+                self._add_error(number, [error])
+                continue
+
+            batch.append((number, record))
+            if len(batch) >= self.CHUNK_SIZE:
+                self._import_batch(batch)
+                batch = []
+
+        if batch:
+            self._import_batch(batch)
+
+        return self.report()
+
+    def report(self) -> dict:
+        """Summary of the import with per-row errors"""
+        return {
+            'total_rows': self.total_rows,
+            'imported': self.imported,
+            'failed': self.failed,
+            'created': self.created,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+    def _add_error(self, number: int, messages: list):
+        """Record a failed row"""
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({'row': number, 'errors': messages})
+
+    def _import_batch(self, batch: list):
+        """Validate one batch, create the lookups its valid rows need and insert it"""
+        rows = []
+        for number, record in batch:
+            missing = [] if self.create_missing else None
+            mapping, errors = self._build_mapping(record, missing)
+            if errors:
+                self._add_error(number, errors)
+            else:
+                rows.append((number, mapping, missing or []))
+
+        if any(missing for _, _, missing in rows):
+            rows = self._create_missing_lookups(rows)
+
+        if not rows:
+            return
+
+        mappings = [mapping for _, mapping, _ in rows]
+        try:
+            db.session.bulk_insert_mappings(Subscription, mappings)
+            bump_data_version(db.session, self.user_id)
+            record_changes(db.session, self.user_id, 'subscription')
+            db.session.commit()
+            self.imported += len(mappings)
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Import batch failed: {e}")
+            for number, _, _ in rows:
+                self._add_error(number, ['Database error'])
+
+    def _create_missing_lookups(self, rows: list) -> list:
+        """
+        Create the currencies, categories and payment methods valid rows refer to
+
+        A currency is only created when the rate history has a rate for it;
+        rows using a currency without one are rejected rather than being
+        converted at 1.0.
+
+        Args:
+            rows: (row number, mapping, missing lookups) of validated rows
+
+        Returns:
+            Rows that can be inserted, with their lookup IDs filled in
+        """
+        today = datetime.now().date()
+        rates = {'USD': 1.0}  # rates are relative to USD
+        for _, _, missing in rows:
+            for field, lookup, _ in missing:
+                if field == 'currency' and lookup not in rates:
+                    rates[lookup] = CurrencyConverter.history.rate_at(lookup, today)
+
+        ready = []
+        names = {'currency': {}, 'category': {}, 'payment_method': {}}
+        for number, mapping, missing in rows:
+            unrated = [name for field, lookup, name in missing if field == 'currency' and not rates[lookup]]
+            if unrated:
+                self._add_error(number, [f'Unknown currency: {unrated[0]} (no exchange rate available)'])
+                continue
+            ready.append((number, mapping, missing))
+            for field, lookup, name in missing:
+                names[field].setdefault(lookup, name)
+
+        supported = CurrencyConverter.get_supported_currencies()
+        currencies = {
+            code: Currency(
+                user_id=self.user_id,
+                name=supported.get(code, code),
+                code=code,
+                symbol=CurrencyConverter.get_currency_symbol(code),
+                rate=rates[code]
+            )
+            for code in names['currency']
+        }
+
+        next_order = db.session.query(db.func.max(Category.order)).filter_by(user_id=self.user_id).scalar() or 0
+        categories = {}
+        for key, name in names['category'].items():
+            next_order += 1
+            categories[key] = Category(user_id=self.user_id, name=name[:100], order=next_order)
+
+        next_order = db.session.query(db.func.max(PaymentMethod.order)).filter_by(user_id=self.user_id).scalar() or 0
+        methods = {}
+        for key, name in names['payment_method'].items():
+            next_order += 1
+            methods[key] = PaymentMethod(user_id=self.user_id, name=name[:100], order=next_order)
+
+        created = list(currencies.values()) + list(categories.values()) + list(methods.values())
+        if not created:
+            return ready
+        db.session.add_all(created)
+        db.session.commit()
+
+        for code, currency in currencies.items():
+            self.currencies[code] = currency.id
+            self.currency_ids.add(currency.id)
+            self.created['currencies'].append(code)
+        for key, category in categories.items():
+            self.categories[key] = category.id
+            self.category_ids.add(category.id)
+            self.created['categories'].append(category.name)
+        for key, method in methods.items():
+            self.payment_methods[key] = method.id
+            self.payment_method_ids.add(method.id)
+            self.created['payment_methods'].append(method.name)
+
+        lookups = {'currency': self.currencies, 'category': self.categories, 'payment_method': self.payment_methods}
+        for _, mapping, missing in ready:
+            for field, lookup, _ in missing:
+                mapping[f'{field}_id'] = lookups[field][lookup]
+
+        return ready
+
+    def _build_mapping(self, record: dict, missing: list = None) -> tuple:
+        """
+        Validate a record and convert it to a Subscription mapping
+
+        Args:
+            record: Parsed record
+            missing: If given, unknown currencies, categories and payment
+                methods that can be created are appended to it as
+                (field, lookup key, name) instead of failing the row
+
+        Returns:
+            (mapping or None, list of error messages)
+        """
+        errors = []
+        mapping = {'user_id': self.user_id}
+
+        # Name
+        name = self._text(record.get('name'))
+        if not name:
+            errors.append('Missing required field: name')
+        elif len(name) > 255:
+            errors.append('Name must be at most 255 characters')
+        mapping['name'] = name
+
+        # Price
+        price = self._number(record.get('price'), float)
+        if price is None:
+            errors.append('Missing or invalid price')
+        elif price < 0:
+            errors.append('Price must not be negative')
+        mapping['price'] = price
+
+        # Billing cycle
+        cycle = self._cycle(record.get('cycle'))
+        if cycle is None:
+            errors.append('Invalid cycle. Must be 1 (days), 2 (weeks), 3 (months), or 4 (years)')
+        mapping['cycle'] = cycle
+
+        frequency = self._number(record.get('frequency'), int, default=1)
+        if frequency is None or frequency < 1 or frequency > 366:
+            errors.append('Frequency must be between 1 and 366')
+        mapping['frequency'] = frequency
+
+        # Lookups
+        mapping['currency_id'] = self._resolve(
+            record, 'currency', self.currencies, self.currency_ids, errors,
+            key=lambda value: value.upper(), default=self.default_currency_id, required=True, missing=missing
+        )
+        mapping['category_id'] = self._resolve(
+            record, 'category', self.categories, self.category_ids, errors, missing=missing
+        )
+        mapping['payment_method_id'] = self._resolve(
+            record, 'payment_method', self.payment_methods, self.payment_method_ids, errors, missing=missing
+        )
+        mapping['payer_user_id'] = self._resolve(
+            record, 'payer', self.payers, self.payer_ids, errors, id_field='payer_user_id'
+        )
+
+        # Dates
+        next_payment = self._date(record.get('next_payment'), 'next_payment', errors)
+        if next_payment is None and cycle is not None and frequency and not errors:
+            next_payment = BillingCycleCalculator.calculate_next_payment(
+                datetime.now(), cycle, frequency
+            ).date()
+        mapping['next_payment'] = next_payment
+        mapping['cancellation_date'] = self._date(record.get('cancellation_date'), 'cancellation_date', errors)
+
+        # Flags
+        mapping['auto_renew'] = self._flag(record.get('auto_renew'), True, 'auto_renew', errors)
+        mapping['inactive'] = self._flag(record.get('inactive'), False, 'inactive', errors)
+        mapping['shared'] = self._flag(record.get('shared'), False, 'shared', errors)
+
+        notify_days_before = self._number(record.get('notify_days_before'), int, default=7)
+        if notify_days_before is None or notify_days_before < 0:
+            errors.append('notify_days_before must be a non-negative integer')
+        mapping['notify_days_before'] = notify_days_before
+
+        # Free text
+        for field, limit in (('url', 500), ('logo', 255), ('notes', None)):
+            value = self._text(record.get(field))
+            if value and limit and len(value) > limit:
+                errors.append(f'{field} must be at most {limit} characters')
+            mapping[field] = value or None
+
+        return (None if errors else mapping), errors
+
+    def _resolve(self, record: dict, field: str, by_name: dict, ids: set, errors: list,
+                 key=None, default=None, required: bool = False, id_field: str = None,
+                 missing: list = None) -> Optional[int]:
+        """Resolve a lookup by ID field or by name through the lookup map"""
+        id_field = id_field or f'{field}_id'
+
+        if record.get(id_field) not in (None, ''):
+            value = self._number(record.get(id_field), int)
+            if value not in ids:
+                errors.append(f'Unknown {id_field}: {record.get(id_field)}')
+                return None
+            return value
+
+        name = self._text(record.get(field))
+        if name:
+            lookup = key(name) if key else name.lower()
+            if lookup not in by_name:
+                if missing is not None and (field != 'currency' or (len(name) <= 10 and name.isalpha())):
+                    missing.append((field, lookup, name))
+                    return None
+                errors.append(f"Unknown {field.replace('_', ' ')}: {name}")
+                return None
+            return by_name[lookup]
+
+        if required and default is None:
+            errors.append(f'Missing required field: {field}')
+        return default
+
+    @staticmethod
+    def _text(value) -> Optional[str]:
+        """Coerce a value to a stripped string"""
+        if value is None:
+            return None
+        return str(value).strip()
+
+    @staticmethod
+    def _number(value, cast, default=None):
+        """Parse a number, returning default when empty and None when invalid"""
+        if value is None or value == '':
+            return default
+        if isinstance(value, bool):
+            return None
+        try:
+            if cast is int:
+                number = float(value)
+                return int(number) if number.is_integer() else None
+            return cast(value)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def _cycle(cls, value) -> Optional[int]:
+        """Parse a billing cycle given as 1-4 or a name (monthly, years, ...)"""
+        if isinstance(value, str) and value.strip().lower() in cls.CYCLES:
+            return cls.CYCLES[value.strip().lower()]
+        cycle = cls._number(value, int)
+        return cycle if cycle in (1, 2, 3, 4) else None
+
+    @classmethod
+    def _flag(cls, value, default: bool, field: str, errors: list) -> Optional[bool]:
+        """Parse a boolean flag"""
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text == '':
+            return default
+        if text in cls.TRUE_VALUES:
+            return True
+        if text in cls.FALSE_VALUES:
+            return False
+        errors.append(f'Invalid {field}: {value}')
+        return None
+
+    @staticmethod
+    def _date(value, field: str, errors: list):
+        """Parse a YYYY-MM-DD date"""
+        if value is None or value == '':
+            return None
+        try:
+            return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+        except ValueError:
+            errors.append(f'Invalid {field} date format. Use YYYY-MM-DD')
+            return None
@@ -0,0 +1,154 @@
+"""
+Change Feed
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import event, insert, inspect
+from app.models.change_feed import ChangeFeedEntry
+from app.models.currency import Currency
+from app.models.subscription import Subscription
+from app.models.user import User
+
+
+PENDING_KEY = 'change_feed_pending'
+
+# Currency columns refreshed for every user by the exchange rate job (not user activity)
+RATE_COLUMNS = {'rate', 'last_updated'}
+
+# User columns that change what insights and forecasts compute
+USER_COLUMNS = {'budget': 'budget', 'main_currency': 'currency'}
+
+
+def record_changes(session, user_ids, source: str) -> None:
+    """
+    Append change feed entries for writes that bypass the unit of work
+
+    ORM flushes of subscriptions, currencies and user budgets are recorded
+    automatically; bulk inserts and query updates/deletes must call this.
+
+    Args:
+        session: Database session
+        user_ids: User ID or iterable of user IDs
+        source: subscription, currency or budget
+    """
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+
+    rows = [{'user_id': user_id, 'source': source} for user_id in sorted(set(user_ids))]
+    if rows:
+        session.execute(insert(ChangeFeedEntry), rows)
+
+
+def changed_users(session, after_id: Optional[int], settle_seconds: int = 60) -> tuple:
+    """
+    Users with changes since a watermark
+
+    Entries younger than settle_seconds are left for the next run, so a
+    transaction that took its ID earlier but committed later isn't skipped.
+
+    Args:
+        session: Database session
+        after_id: Watermark (last entry ID processed), None for all entries
+        settle_seconds: Minimum entry age
+
+    Returns:
+        (sorted user IDs, new watermark)
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settle_seconds)
+    query = session.query(ChangeFeedEntry.id, ChangeFeedEntry.user_id).filter(
+        ChangeFeedEntry.created_at <= cutoff
+    )
+    if after_id is not None:
+        query = query.filter(ChangeFeedEntry.id > after_id)
+
+    watermark = after_id
+    user_ids = set()
+    for entry_id, user_id in query:
+        user_ids.add(user_id)
+        watermark = entry_id if watermark is None else max(watermark, entry_id)
+
+    return sorted(user_ids), watermark
+
+
+def prune_change_feed(session, up_to_id: Optional[int], keep_days: int = 7) -> int:
+    """
+    Delete entries every consumer has processed
+
+    Args:
+        session: Database session
+        up_to_id: Lowest watermark of all consumers
+        keep_days: Keep entries at least this long (for debugging and late consumers)
+
+    Returns:
+        Number of entries deleted
+    """
+    if up_to_id is None:
+        return 0
+
+    cutoff = datetime.utcnow() - timedelta(days=keep_days)
+    return session.query(ChangeFeedEntry).filter(
+        ChangeFeedEntry.id <= up_to_id,
+        ChangeFeedEntry.created_at < cutoff
+    ).delete(synchronize_session=False)
+
+
+def _sources(obj, added_or_deleted: bool) -> Iterable[str]:
+    """Change feed sources touched by a pending ORM change"""
+    if isinstance(obj, Subscription):
+        return ('subscription',)
+
+    state = inspect(obj)
+    if isinstance(obj, Currency):
+        if added_or_deleted:
+            return ('currency',)
+        changed = {attr.key for attr in state.mapper.column_attrs if state.attrs[attr.key].history.has_changes()}
+        return ('currency',) if changed - RATE_COLUMNS else ()
+
+    if isinstance(obj, User) and not added_or_deleted:
+        return tuple(
+            source for column, source in USER_COLUMNS.items()
+            if state.attrs[column].history.has_changes()
+        )
+
+    return ()
+
+
+def _collect_changes(session, flush_context, instances):
+    """Remember which users' subscriptions, currencies or budget are about to change"""
+    pending = session.info.setdefault(PENDING_KEY, set())
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, (Subscription, Currency, User)):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+
+        user_id = obj.id if isinstance(obj, User) else obj.user_id
+        if user_id is None:
+            continue
+        for source in _sources(obj, obj in session.new or obj in session.deleted):
+            pending.add((user_id, source))
+
+
+def _append_pending(session, flush_context):
+    """Append the collected changes inside the flush transaction"""
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    session.connection().execute(
+        insert(ChangeFeedEntry.__table__),
+        [{'user_id': user_id, 'source': source} for user_id, source in sorted(pending)]
+    )
+
+
+def register_change_feed_events(session_class) -> None:
+    """
+    Append subscription, currency and budget changes made through the ORM to the change feed
+
+    Args:
+        session_class: Session class used by the app
+    """
+    if not event.contains(session_class, 'before_flush', _collect_changes):
+        event.listen(session_class, 'before_flush', _collect_changes)
+        event.listen(session_class, 'after_flush', _append_pending)
@@ -0,0 +1,104 @@
+"""
+Per-User Data Version
+"""
+from sqlalchemy import event, update
+from app.models.user import User
+
+
+# Tables with a user_id that don't change what the API returns
+UNTRACKED_TABLES = {'user_sessions'}
+
+PENDING_KEY = 'data_version_pending'
+
+
+def get_data_version(session, user_id: int) -> int:
+    """
+    Get a user's data version
+
+    The version is bumped in the same transaction as every write to the
+    user's data, so (user_id, version) identifies the state every
+    user-scoped read endpoint renders.
+
+    Args:
+        session: Database session
+        user_id: User ID
+
+    Returns:
+        Current data version (0 if the user doesn't exist)
+    """
+    return session.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+
+def bump_data_version(session, user_ids) -> None:
+    """
+    Increment the data version of one or more users
+
+    Needed for writes that bypass the unit of work (bulk inserts, query
+    updates/deletes); ORM flushes are tracked automatically.
+
+    Args:
+        session: Database session
+        user_ids: User ID or iterable of user IDs
+    """
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+
+    session.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _collect_user_ids(session, flush_context, instances):
+    """Remember which users own the objects about to be flushed"""
+    pending = session.info.setdefault(PENDING_KEY, set())
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+
+        if isinstance(obj, User):
+            if obj.id is not None:
+                pending.add(obj.id)
+            continue
+
+        if getattr(obj, '__tablename__', None) in UNTRACKED_TABLES:
+            continue
+
+        user_id = getattr(obj, 'user_id', None)
+        if user_id is not None:
+            pending.add(user_id)
+
+
+def _bump_pending(session, flush_context):
+    """Bump the collected users' versions inside the flush transaction"""
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    session.connection().execute(
+        update(User.__table__)
+        .where(User.__table__.c.id.in_(sorted(pending)))
+        .values(
+            data_version=User.__table__.c.data_version + 1,
+            updated_at=User.__table__.c.updated_at
+        )
+    )
+
+
+def register_data_version_events(session_class) -> None:
+    """
+    Track ORM writes to user data and bump the owners' data versions
+
+    Args:
+        session_class: Session class used by the app
+    """
+    if not event.contains(session_class, 'before_flush', _collect_user_ids):
+        event.listen(session_class, 'before_flush', _collect_user_ids)
+        event.listen(session_class, 'after_flush', _bump_pending)
@@ -0,0 +1,189 @@
+"""
+Database Engine Setup
+"""
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+
+READ_ENGINE_KEY = 'subos_read_engine'
+
+# Statements that need the SQLite write lock
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'DROP', 'ALTER')
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads from read-only endpoints to the reader pool
+
+    Requests marked with @read_only (g.db_read_only) query through the
+    read-only engine when one is configured. Flushes, and everything
+    outside read-only requests (writes, the scheduler), use the default
+    writer engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('db_read_only'):
+            engine = current_app.extensions.get(READ_ENGINE_KEY)
+            if engine is not None:
+                return engine
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def get_sqlite_pragmas(config, read_only: bool = False) -> list:
+    """
+    Build the list of PRAGMA statements for the SQLite tuning profile
+
+    Args:
+        config: Flask app config
+        read_only: Build the profile for read-only connections
+
+    Returns:
+        List of (pragma, value) tuples, applied in order
+    """
+    pragmas = [
+        ('busy_timeout', int(config.get('SQLITE_BUSY_TIMEOUT', 5000))),
+        ('mmap_size', int(config.get('SQLITE_MMAP_SIZE', 268435456))),
+        ('cache_size', int(config.get('SQLITE_CACHE_SIZE', -65536))),
+        ('temp_store', config.get('SQLITE_TEMP_STORE', 'MEMORY'))
+    ]
+
+    if read_only:
+        # Journal mode is a property of the database file, set by the writer
+        return [('query_only', 1)] + pragmas
+
+    return [
+        ('journal_mode', config.get('SQLITE_JOURNAL_MODE', 'WAL')),
+        ('synchronous', config.get('SQLITE_SYNCHRONOUS', 'NORMAL'))
+    ] + pragmas
+
+
+def is_file_sqlite(url) -> bool:
+    """Check whether a URL points at a file-backed SQLite database"""
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def get_engine_options(config) -> dict:
+    """
+    Engine options for the default (writer) engine
+
+    File-backed SQLite keeps SQLAlchemy's regular connection pool; only
+    write transactions are serialized, by the database lock (see
+    configure_sqlite_engine), so requests that read, hash passwords or
+    wait on other work don't queue behind each other.
+
+    Server databases (PostgreSQL) get a regular connection pool sized
+    from DATABASE_POOL_*, with pre-ping so connections dropped by the
+    server or a proxy are replaced instead of failing the request.
+
+    Args:
+        config: Flask app config
+
+    Returns:
+        Options for SQLALCHEMY_ENGINE_OPTIONS
+    """
+    from sqlalchemy.engine import make_url
+
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+
+    if url.get_backend_name() != 'sqlite':
+        options.setdefault('pool_size', config.get('DATABASE_POOL_SIZE', 10))
+        options.setdefault('max_overflow', config.get('DATABASE_MAX_OVERFLOW', 20))
+        options.setdefault('pool_timeout', config.get('DATABASE_POOL_TIMEOUT', 30))
+        options.setdefault('pool_recycle', config.get('DATABASE_POOL_RECYCLE', 1800))
+        options.setdefault('pool_pre_ping', config.get('DATABASE_POOL_PRE_PING', True))
+
+    return options
+
+
+def create_read_engine(app, writer_engine):
+    """
+    Create the read-only SQLite connection pool and register it on the app
+
+    Args:
+        app: Flask application instance
+        writer_engine: Default engine (its resolved URL is reused)
+
+    Returns:
+        Read-only engine, or None if the split is disabled or unsupported
+    """
+    pool_size = app.config.get('SQLITE_READ_POOL_SIZE', 0)
+    if pool_size <= 0 or not is_file_sqlite(writer_engine.url):
+        return None
+
+    # Make sure the writer has created the file and switched it to WAL
+    with writer_engine.connect():
+        pass
+
+    database = writer_engine.url.database
+    if database.startswith('file:'):
+        database = database[5:]
+
+    engine = create_engine(
+        f'sqlite:///file:{database}?mode=ro&uri=true',
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={'check_same_thread': False}
+    )
+    configure_sqlite_engine(engine, app.config, read_only=True)
+
+    app.extensions[READ_ENGINE_KEY] = engine
+    return engine
+
+
+def configure_sqlite_engine(engine, config, read_only: bool = False) -> bool:
+    """
+    Apply the SQLite tuning profile on every new connection
+
+    WAL lets readers proceed while a writer commits, busy_timeout makes
+    writers wait for the lock instead of failing immediately, and the
+    mmap/cache/temp_store settings keep hot pages in memory.
+
+    On the writer engine, transactions start at their first write
+    statement with BEGIN IMMEDIATE: reads before it run without holding
+    the write lock, and a transaction that writes takes the lock up front
+    (waiting up to busy_timeout) instead of upgrading a read snapshot,
+    which fails with SQLITE_BUSY without waiting when another writer
+    committed in between.
+
+    Skipped for non-SQLite engines, in-memory databases, or when
+    SQLITE_TUNING is disabled.
+
+    Args:
+        engine: SQLAlchemy engine
+        config: Flask app config
+        read_only: Install the read-only profile (query_only, no journal changes)
+
+    Returns:
+        True if the profile was installed
+    """
+    if not is_file_sqlite(engine.url):
+        return False
+
+    if read_only:
+        pragmas = get_sqlite_pragmas(config, read_only=True)
+    elif config.get('SQLITE_TUNING', True):
+        pragmas = get_sqlite_pragmas(config)
+    else:
+        return False
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+        if not read_only:
+            # Transactions are started by begin_immediate below, not by the driver
+            dbapi_connection.isolation_level = None
+
+    if not read_only:
+        @event.listens_for(engine, 'before_cursor_execute')
+        def begin_immediate(conn, cursor, statement, parameters, context, executemany):
+            if not cursor.connection.in_transaction and statement.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+                cursor.execute('BEGIN IMMEDIATE')
+
+    return True
@@ -1,12 +1,22 @@
 """
 Authentication Decorators
 """
+import hashlib
+from datetime import date
 from functools import wraps
-from flask import request, jsonify, current_app, g
+from flask import request, jsonify, current_app, g, make_response
+from werkzeug.local import LocalProxy
 from app.services.auth_service import AuthService
+from app.services.session_manager import token_denylist
 from app.models.user import User
 
 
+def _load_current_user():
+    """Load the authenticated user row on first access to g.user"""
+    from app import db
+    return db.session.get(User, g.user_id)
+
+
 def require_auth(f):
     """
     Decorator to require authentication for endpoints
@@ -14,7 +24,9 @@ def require_auth(f):
     Expects JWT token in Authorization header:
     Authorization: Bearer <token>
 
-    Sets g.user_id and g.user for use in endpoint
+    Sets g.user_id and g.user for use in endpoint. Verified token claims
+    and user rows are cached, and g.user is only loaded from the database
+    when the endpoint actually accesses it.
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -32,21 +44,33 @@ def require_auth(f):
         token = parts[1]
 
         # Verify token
-        user_id = AuthService.verify_token(token, current_app.config['SECRET_KEY'])
+        claims = AuthService.get_token_claims(token, current_app.config['SECRET_KEY'])
+        user_id = claims.get('user_id') if claims else None
 
         if not user_id:
             return jsonify({'status': 'error', 'message': 'Invalid or expired token'}), 401
 
-        # Get user from database
-        from app import db
-        user = db.session.get(User, user_id)
+        # Check revocation (in-memory, synced incrementally)
+        if token_denylist.is_revoked(claims.get('jti')):
+            AuthService.invalidate_token(token)
+            return jsonify({'status': 'error', 'message': 'Token has been revoked'}), 401
+
+        # Check user exists (cached as a flag), loading the row only on a cache miss
+        user = None
+        if AuthService.user_cache.get(user_id) is None:
+            from app import db
+            user = db.session.get(User, user_id)
+
+            if not user:
+                return jsonify({'status': 'error', 'message': 'User not found'}), 401
 
-        if not user:
-            return jsonify({'status': 'error', 'message': 'User not found'}), 401
+            AuthService.user_cache.set(user_id, True)
 
         # Set user context
         g.user_id = user_id
-        g.user = user
+        g.token = token
+        g.token_jti = claims.get('jti')
+        g.user = user if user is not None else LocalProxy(_load_current_user)
 
         return f(*args, **kwargs)
 
@@ -67,3 +91,75 @@ def require_admin(f):
         return f(*args, **kwargs)
 
     return decorated_function
+
+
+def read_only(f):
+    """
+    Decorator marking an endpoint as a pure read
+
+    Queries made while handling the request are routed to the read-only
+    connection pool (see RoutingSession), so dashboard reads do not use
+    writer connections.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_read_only = True
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def etag(f):
+    """
+    Decorator adding strong ETags and If-None-Match handling
+
+    Must be used after @require_auth. The tag is derived from the user's
+    data version (bumped on every write to their data), the request URL
+    and the current date, so it is known before the endpoint runs: an
+    unchanged refresh costs one integer lookup and returns 304 without
+    querying or serializing anything.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        from app import db
+        from app.utils.data_version import get_data_version
+
+        version = get_data_version(db.session, g.user_id)
+        key = f'{g.user_id}:{version}:{date.today().isoformat()}:{request.full_path}'
+        tag = hashlib.sha1(key.encode()).hexdigest()
+
+        if request.if_none_match.contains(tag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(tag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Authorization')
+        return response
+
+    return decorated_function
+
+
+def stage_uploads(stream_factory):
+    """
+    Decorator choosing where uploaded files are spooled
+
+    Multipart file parts are written in chunks to stream_factory() (see
+    StreamingRequest) instead of Werkzeug's temporary files, so the
+    endpoint can keep the spooled file without copying or buffering it.
+
+    Args:
+        stream_factory: Callable returning a new writable, readable file
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            g.upload_stream_factory = stream_factory
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
@@ -0,0 +1,41 @@
+"""
+Service Name Normalization
+Tokens, compact names and website domains for comparing subscription names
+"""
+import re
+from typing import Optional
+from urllib.parse import urlparse
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+# Tokens too common in subscription names and receipts to identify anything
+STOPWORDS = {
+    'the', 'and', 'inc', 'ltd', 'llc', 'gmbh', 'com', 'www', 'net', 'org',
+    'plan', 'subscription', 'monthly', 'yearly', 'annual', 'receipt', 'invoice'
+}
+
+
+def name_tokens(text: Optional[str]) -> list:
+    """Lowercase alphanumeric tokens"""
+    return TOKEN.findall((text or '').lower())
+
+
+def significant_tokens(text: Optional[str]) -> set:
+    """Tokens that can identify a service (3+ characters, not a stopword)"""
+    return {token for token in name_tokens(text) if len(token) >= 3 and token not in STOPWORDS}
+
+
+def compact_name(text: Optional[str]) -> str:
+    """Name without case, spaces or punctuation ('Disney Plus' -> 'disneyplus')"""
+    return ''.join(name_tokens(text))
+
+
+def url_domain(url: Optional[str]) -> Optional[str]:
+    """Registrable name of a website ('https://www.netflix.com/' -> 'netflix')"""
+    if not url:
+        return None
+    host = urlparse(url if '//' in url else f'//{url}').hostname or ''
+    labels = [label for label in host.split('.') if label and label != 'www']
+    if len(labels) < 2:
+        return None
+    return labels[-2] if len(labels[-2]) >= 3 else None
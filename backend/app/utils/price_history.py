@@ -0,0 +1,90 @@
+"""
+Subscription Price History
+"""
+from sqlalchemy import event, inspect
+from app.models.subscription import Subscription
+from app.models.price_change import SubscriptionPriceChange
+
+
+def record_price_changes(session, user_id: int, ids: list, values: dict) -> int:
+    """
+    Record price history for a query update of subscriptions
+
+    Needed for writes that bypass the unit of work (bulk updates); ORM
+    flushes are tracked automatically. Call before executing the update.
+
+    Args:
+        session: Database session
+        user_id: Owner's user ID
+        ids: Subscription IDs about to be updated
+        values: Column values about to be set
+
+    Returns:
+        Number of changes recorded
+    """
+    if 'price' not in values and 'currency_id' not in values:
+        return 0
+
+    rows = session.query(Subscription.id, Subscription.price, Subscription.currency_id).filter(
+        Subscription.user_id == user_id,
+        Subscription.id.in_(ids)
+    ).all()
+
+    mappings = []
+    for subscription_id, price, currency_id in rows:
+        new_price = values.get('price', price)
+        new_currency_id = values.get('currency_id', currency_id)
+        if new_price != price or new_currency_id != currency_id:
+            mappings.append({
+                'subscription_id': subscription_id,
+                'user_id': user_id,
+                'old_price': price,
+                'old_currency_id': currency_id,
+                'new_price': new_price,
+                'new_currency_id': new_currency_id
+            })
+
+    if mappings:
+        session.bulk_insert_mappings(SubscriptionPriceChange, mappings)
+    return len(mappings)
+
+
+def _record_flushed_changes(session, flush_context, instances):
+    """Add a price change row for every modified subscription price or currency"""
+    for obj in list(session.dirty):
+        if not isinstance(obj, Subscription) or obj.id is None:
+            continue
+
+        state = inspect(obj)
+        price = state.attrs.price.history
+        currency = state.attrs.currency_id.history
+        if not price.has_changes() and not currency.has_changes():
+            continue
+
+        # Without the previous value (attribute set before it was loaded) there is nothing to record
+        old_price = price.deleted[0] if price.deleted else (None if price.has_changes() else obj.price)
+        old_currency_id = currency.deleted[0] if currency.deleted else (
+            None if currency.has_changes() else obj.currency_id
+        )
+        if old_price is None or (old_price == obj.price and old_currency_id == obj.currency_id):
+            continue
+
+        session.add(SubscriptionPriceChange(
+            subscription_id=obj.id,
+            user_id=obj.user_id,
+            old_price=old_price,
+            old_currency_id=old_currency_id,
+            new_price=obj.price,
+            new_currency_id=obj.currency_id
+        ))
+
+
+def register_price_history_events(session_class) -> None:
+    """
+    Record subscription price changes made through the ORM
+
+    Args:
+        session_class: Session class used by the app
+    """
+    if not event.contains(session_class, 'before_flush', _record_flushed_changes):
+        event.listen(session_class, 'before_flush', _record_flushed_changes)
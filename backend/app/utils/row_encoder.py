@@ -0,0 +1,198 @@
+"""
+Row Encoders
+Encode query rows for JSON responses without loading ORM objects
+"""
+from app import db
+from app.models.subscription import Subscription
+from app.models.currency import Currency
+from app.models.category import Category
+from app.models.payment_method import PaymentMethod
+from app.models.household import HouseholdMember
+from app.models.notification import NotificationLog
+
+
+def isoformat(value):
+    """Format a date or datetime"""
+    return value.isoformat()
+
+
+class RowEncoder:
+    """
+    Encode selected columns into the structure of a model's to_dict()
+
+    Rows are selected as plain tuples (no ORM instances, no identity map,
+    no lazy loads) and each becomes a dict through one dict(zip()). Lookup
+    fields are encoded once per referenced row and the same dict is shared
+    by every row pointing at it.
+
+    Subclasses set:
+    - model: Mapped class (must have an id column, listed first in fields)
+    - fields: (key, column) pairs
+    - formatters: key -> function applied to non-null values
+    - lookups: key -> (foreign key column, RowEncoder subclass)
+    """
+
+    model = None
+    fields = ()
+    formatters = {}
+    lookups = {}
+
+    @classmethod
+    def columns(cls) -> list:
+        """Columns to select, in row order"""
+        return [column for _, column in cls.fields] + [fk for fk, _ in cls.lookups.values()]
+
+    @classmethod
+    def encode_rows(cls, rows) -> list:
+        """
+        Encode row tuples selected with columns()
+
+        Args:
+            rows: Row tuples
+
+        Returns:
+            List of dicts
+        """
+        rows = list(rows)
+        keys = [key for key, _ in cls.fields] + list(cls.lookups)
+        formatters = list(cls.formatters.items())
+
+        # Encode each referenced lookup row once
+        lookups = []
+        for index, (key, (_, encoder)) in enumerate(cls.lookups.items(), start=len(cls.fields)):
+            ids = {row[index] for row in rows if row[index] is not None}
+            lookups.append((key, encoder.load(ids)))
+
+        result = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            for key, formatter in formatters:
+                value = item[key]
+                if value is not None:
+                    item[key] = formatter(value)
+            for key, encoded in lookups:
+                item[key] = encoded.get(item[key])
+            result.append(item)
+
+        return result
+
+    @classmethod
+    def encode_query(cls, query) -> list:
+        """
+        Encode the rows of an ORM query over the model
+
+        Args:
+            query: Query with filters and ordering applied
+
+        Returns:
+            List of dicts
+        """
+        return cls.encode_rows(query.with_entities(*cls.columns()).all())
+
+    @classmethod
+    def load(cls, ids) -> dict:
+        """
+        Encode rows by ID
+
+        Args:
+            ids: IDs to load
+
+        Returns:
+            Dictionary of ID -> encoded row
+        """
+        if not ids:
+            return {}
+
+        rows = db.session.query(*cls.columns()).filter(cls.model.id.in_(list(ids))).all()
+        return {item['id']: item for item in cls.encode_rows(rows)}
+
+
+class CurrencyEncoder(RowEncoder):
+    model = Currency
+    fields = (
+        ('id', Currency.id),
+        ('name', Currency.name),
+        ('code', Currency.code),
+        ('symbol', Currency.symbol),
+        ('rate', Currency.rate),
+        ('last_updated', Currency.last_updated)
+    )
+    formatters = {'last_updated': isoformat}
+
+
+class CategoryEncoder(RowEncoder):
+    model = Category
+    fields = (
+        ('id', Category.id),
+        ('name', Category.name),
+        ('order', Category.order)
+    )
+
+
+class PaymentMethodEncoder(RowEncoder):
+    model = PaymentMethod
+    fields = (
+        ('id', PaymentMethod.id),
+        ('name', PaymentMethod.name),
+        ('icon', PaymentMethod.icon),
+        ('order', PaymentMethod.order)
+    )
+
+
+class HouseholdMemberEncoder(RowEncoder):
+    model = HouseholdMember
+    fields = (
+        ('id', HouseholdMember.id),
+        ('name', HouseholdMember.name),
+        ('email', HouseholdMember.email),
+        ('avatar', HouseholdMember.avatar)
+    )
+
+
+class SubscriptionEncoder(RowEncoder):
+    model = Subscription
+    fields = (
+        ('id', Subscription.id),
+        ('name', Subscription.name),
+        ('price', Subscription.price),
+        ('cycle', Subscription.cycle),
+        ('frequency', Subscription.frequency),
+        ('next_payment', Subscription.next_payment),
+        ('auto_renew', Subscription.auto_renew),
+        ('logo', Subscription.logo),
+        ('url', Subscription.url),
+        ('notes', Subscription.notes),
+        ('shared', Subscription.shared),
+        ('inactive', Subscription.inactive),
+        ('cancellation_date', Subscription.cancellation_date),
+        ('notify_days_before', Subscription.notify_days_before),
+        ('created_at', Subscription.created_at),
+        ('updated_at', Subscription.updated_at)
+    )
+    formatters = {
+        'next_payment': isoformat,
+        'cancellation_date': isoformat,
+        'created_at': isoformat,
+        'updated_at': isoformat
+    }
+    lookups = {
+        'currency': (Subscription.currency_id, CurrencyEncoder),
+        'category': (Subscription.category_id, CategoryEncoder),
+        'payer': (Subscription.payer_user_id, HouseholdMemberEncoder),
+        'payment_method': (Subscription.payment_method_id, PaymentMethodEncoder)
+    }
+
+
+class NotificationLogEncoder(RowEncoder):
+    model = NotificationLog
+    fields = (
+        ('id', NotificationLog.id),
+        ('user_id', NotificationLog.user_id),
+        ('subscription_id', NotificationLog.subscription_id),
+        ('channel', NotificationLog.channel),
+        ('notification_type', NotificationLog.notification_type),
+        ('status', NotificationLog.status),
+        ('error_message', NotificationLog.error_message),
+        ('sent_at', NotificationLog.sent_at)
+    )
+    formatters = {'sent_at': isoformat}
@@ -0,0 +1,134 @@
+"""
+JSON Serialization
+Pluggable JSON provider (orjson when installed) and cached JSON columns
+"""
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def dumps(obj) -> str:
+    """Serialize to a JSON string with the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj)
+
+
+def loads(value):
+    """Parse a JSON string or bytes with the fastest available decoder"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+
+    Output matches the default provider (sorted keys, HTTP dates, indented
+    in debug mode) but responses are encoded straight to bytes. Values
+    orjson can't encode (e.g. integers above 64 bits) fall back to the
+    standard library.
+    """
+
+    def _option(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._option()).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._option(indent))
+        except orjson.JSONEncodeError:
+            return super().response(obj)
+
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    'stdlib': DefaultJSONProvider,
+    'orjson': OrjsonProvider
+}
+
+
+def get_json_provider(name: str = 'auto'):
+    """
+    Resolve a JSON provider class
+
+    Args:
+        name: auto (orjson if installed), orjson or stdlib
+
+    Returns:
+        JSONProvider subclass
+
+    Raises:
+        ValueError: If the provider is unknown or orjson is not installed
+    """
+    name = (name or 'auto').lower()
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON provider: {name}. Use 'auto', 'orjson' or 'stdlib'")
+    if name == 'orjson' and orjson is None:
+        raise ValueError('JSON_PROVIDER is orjson but orjson is not installed')
+
+    return JSON_PROVIDERS[name]
+
+
+class ParsedJSON:
+    """
+    Read-only parsed view of a JSON Text column
+
+    The stored string is parsed on first access and cached on the instance
+    until the column holds a different string (assignment or reload), so
+    repeated to_dict() calls don't re-parse. Treat the result as read-only.
+
+        extracted_fields = ParsedJSON('extracted_data', dict)
+    """
+
+    def __init__(self, column: str, empty=dict):
+        self.column = column
+        self.empty = empty
+
+    def __set_name__(self, owner, name):
+        self.cache_key = f'_{name}_parsed'
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        raw = getattr(instance, self.column)
+        if not raw:
+            return self.empty()
+
+        cached = instance.__dict__.get(self.cache_key)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        value = loads(raw)
+        instance.__dict__[self.cache_key] = (raw, value)
+        return value
@@ -0,0 +1,23 @@
+"""
+Upload Handling
+Request class that lets endpoints choose where uploaded files are spooled
+"""
+from flask import Request, g, has_app_context
+
+
+class StreamingRequest(Request):
+    """
+    Request whose multipart file parts go to the endpoint's stream factory
+
+    Werkzeug parses multipart bodies in chunks and writes each file part
+    to the stream returned by _get_file_stream(). Endpoints decorated with
+    @stage_uploads supply that stream; others get Werkzeug's default
+    (in memory up to 500KB, then a temporary file).
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        factory = g.get('upload_stream_factory') if has_app_context() else None
+        if factory is not None:
+            return factory()
+
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
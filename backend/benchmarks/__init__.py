@@ -0,0 +1,7 @@
+"""
+Benchmarks
+
+Standalone scripts, run from the backend directory:
+
+    python -m benchmarks.<name> --help
+"""
@@ -0,0 +1,69 @@
+"""
+Benchmark Helpers
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import create_app, db
+from app.config import config, TestingConfig
+from app.models import Base
+
+
+def make_app(database_url: str = None, **overrides):
+    """
+    Create a testing app backed by a throwaway SQLite file
+
+    Args:
+        database_url: Optional database URL (defaults to a temp SQLite file)
+        **overrides: Config values to set before the app is created
+
+    Returns:
+        Flask application with all tables created
+    """
+    if database_url is None:
+        fd, path = tempfile.mkstemp(suffix='.db', prefix='subos-bench-')
+        os.close(fd)
+        database_url = f'sqlite:///{path}'
+
+    attrs = {'DATABASE_URL': database_url, 'SQLALCHEMY_DATABASE_URI': database_url}
+    attrs.update(overrides)
+    bench_config = type('BenchConfig', (TestingConfig,), attrs)
+
+    # create_app only skips the scheduler for the 'testing' config name
+    original = config['testing']
+    config['testing'] = bench_config
+    try:
+        app = create_app('testing')
+    finally:
+        config['testing'] = original
+
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+
+    return app
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Timer:
+    """Context manager measuring wall time in seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
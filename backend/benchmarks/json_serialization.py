@@ -0,0 +1,141 @@
+"""
+JSON Serialization Benchmark
+
+Seeds N subscriptions (spread over currencies, categories, payment
+methods and household members) and N ML insights with JSON payloads, then
+times:
+
+- encoding the subscription list: ORM objects + to_dict() vs row encoder,
+  each with the stdlib and the orjson provider
+- GET /subscriptions end to end with each provider
+- repeated to_dict() on insights (JSON column parsed once vs every read)
+
+    python -m benchmarks.json_serialization --rows 5000
+"""
+import argparse
+import json
+import random
+from datetime import date, timedelta
+from flask.json.provider import DefaultJSONProvider
+from benchmarks.common import make_app, Timer
+from app import db
+from app.models import User, Subscription, Currency, Category, PaymentMethod, HouseholdMember, MLInsight
+from app.utils.row_encoder import SubscriptionEncoder
+from app.utils.serialization import OrjsonProvider, orjson
+
+
+def seed(app, rows: int) -> int:
+    """Give the benchmark user the given number of subscriptions and insights"""
+    with app.app_context():
+        user = db.session.query(User).filter_by(username='bench').first()
+
+        currencies = [Currency(user_id=user.id, code=code, name=code, symbol=code[0], rate=rate)
+                      for code, rate in [('USD', 1.0), ('EUR', 0.92), ('GBP', 0.79), ('JPY', 149.5)]]
+        categories = [Category(user_id=user.id, name=f'Category {i}', order=i) for i in range(12)]
+        methods = [PaymentMethod(user_id=user.id, name=f'Card {i}', order=i) for i in range(5)]
+        members = [HouseholdMember(user_id=user.id, name=f'Member {i}') for i in range(3)]
+        db.session.add_all(currencies + categories + methods + members)
+        db.session.flush()
+
+        today = date.today()
+        db.session.bulk_insert_mappings(Subscription, [
+            {
+                'user_id': user.id,
+                'name': f'Service {i}',
+                'price': round(random.uniform(1, 50), 2),
+                'currency_id': random.choice(currencies).id,
+                'cycle': random.randint(1, 4),
+                'frequency': 1,
+                'next_payment': today + timedelta(days=random.randint(0, 365)),
+                'category_id': random.choice(categories).id if i % 5 else None,
+                'payment_method_id': random.choice(methods).id,
+                'payer_user_id': random.choice(members).id if i % 2 else None,
+                'notes': 'Benchmark row'
+            }
+            for i in range(rows)
+        ])
+        db.session.bulk_insert_mappings(MLInsight, [
+            {
+                'user_id': user.id,
+                'insight_type': 'anomaly',
+                'title': f'Insight {i}',
+                'description': 'Price changed',
+                'data': json.dumps({'history': [random.uniform(1, 50) for _ in range(24)], 'subscription_id': i})
+            }
+            for i in range(rows)
+        ])
+        db.session.commit()
+        return user.id
+
+
+def timed(label: str, func, repeat: int):
+    """Run func repeat times and print the best time"""
+    best = None
+    for _ in range(repeat):
+        with Timer() as timer:
+            size = func()
+        best = timer.elapsed if best is None else min(best, timer.elapsed)
+    print(f'{label:<44} {best * 1000:8.1f} ms  ({size / 1024:,.0f} KiB)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON serialization of large list responses')
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print('orjson is not installed; only the stdlib provider is measured')
+
+    app = make_app()
+    client = app.test_client()
+    client.post('/api/v1/auth/register', json={
+        'username': 'bench',
+        'email': 'bench@example.com',
+        'password': 'BenchPassw0rd'
+    })
+    response = client.post('/api/v1/auth/login', json={
+        'username': 'bench',
+        'password': 'BenchPassw0rd'
+    })
+    headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+    user_id = seed(app, args.rows)
+
+    providers = [('stdlib', DefaultJSONProvider(app))]
+    if orjson is not None:
+        providers.append(('orjson', OrjsonProvider(app)))
+
+    print(f'rows: {args.rows}')
+
+    with app.test_request_context():
+        query = db.session.query(Subscription).filter_by(user_id=user_id).order_by(Subscription.name)
+
+        def to_dict_rows():
+            db.session.expunge_all()
+            return [sub.to_dict() for sub in query.all()]
+
+        def encoder_rows():
+            return SubscriptionEncoder.encode_query(query)
+
+        assert json.dumps(to_dict_rows(), sort_keys=True) == json.dumps(encoder_rows(), sort_keys=True)
+
+        for name, provider in providers:
+            timed(f'subscriptions to_dict() + {name}',
+                  lambda: len(provider.response({'data': to_dict_rows()}).get_data()), args.repeat)
+            timed(f'subscriptions row encoder + {name}',
+                  lambda: len(provider.response({'data': encoder_rows()}).get_data()), args.repeat)
+
+        insights = db.session.query(MLInsight).filter_by(user_id=user_id).all()
+        timed('insights to_dict(), first read',
+              lambda: len(json.dumps([insight.to_dict() for insight in insights])), 1)
+        timed('insights to_dict(), cached JSON column',
+              lambda: len(json.dumps([insight.to_dict() for insight in insights])), args.repeat)
+
+    for name, provider in providers:
+        app.json = provider
+        timed(f'GET /subscriptions ({name})',
+              lambda: len(client.get('/api/v1/subscriptions', headers=headers).data), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
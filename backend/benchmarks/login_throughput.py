@@ -0,0 +1,102 @@
+"""
+Login Throughput Benchmark
+
+Measures /auth/login throughput and latency at several bcrypt cost
+factors, with the hashing pool enabled, and the latency of a cheap
+endpoint (/health) served concurrently to show whether logins starve
+other requests.
+
+    python -m benchmarks.login_throughput --costs 10 11 12 --threads 8 --seconds 5
+"""
+import argparse
+import threading
+import time
+from benchmarks.common import make_app, percentile
+
+
+def run(cost: int, threads: int, seconds: float, workers: int, queue_depth: int) -> dict:
+    """Run one benchmark round at a given cost factor"""
+    app = make_app(
+        BCRYPT_ROUNDS=cost,
+        PASSWORD_HASH_WORKERS=workers,
+        PASSWORD_HASH_QUEUE_DEPTH=queue_depth
+    )
+
+    client = app.test_client()
+    client.post('/api/v1/auth/register', json={
+        'username': 'bench',
+        'email': 'bench@example.com',
+        'password': 'BenchPassw0rd'
+    })
+
+    latencies, health_latencies = [], []
+    counts = {'ok': 0, 'busy': 0, 'error': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def login_worker():
+        worker_client = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = worker_client.post('/api/v1/auth/login', json={
+                'username': 'bench',
+                'password': 'BenchPassw0rd'
+            })
+            elapsed = time.perf_counter() - start
+            with lock:
+                if response.status_code == 200:
+                    counts['ok'] += 1
+                    latencies.append(elapsed)
+                elif response.status_code == 503:
+                    counts['busy'] += 1
+                else:
+                    counts['error'] += 1
+
+    def health_worker():
+        worker_client = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            worker_client.get('/health')
+            health_latencies.append(time.perf_counter() - start)
+            time.sleep(0.01)
+
+    pool = [threading.Thread(target=login_worker) for _ in range(threads)]
+    pool.append(threading.Thread(target=health_worker))
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    from app.services.password_hasher import password_hasher
+    password_hasher.shutdown()
+
+    return {
+        'cost': cost,
+        'logins_per_sec': counts['ok'] / seconds,
+        'login_p50_ms': percentile(latencies, 50) * 1000,
+        'login_p95_ms': percentile(latencies, 95) * 1000,
+        'rejected_503': counts['busy'],
+        'errors': counts['error'],
+        'health_p95_ms': percentile(health_latencies, 95) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark login throughput by bcrypt cost')
+    parser.add_argument('--costs', type=int, nargs='+', default=[10, 11, 12])
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent login clients')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Duration per cost factor')
+    parser.add_argument('--workers', type=int, default=2, help='Hashing pool processes (0 = inline)')
+    parser.add_argument('--queue-depth', type=int, default=0, help='Pending job limit (0 = 4 x workers)')
+    args = parser.parse_args()
+
+    print(f"{'cost':>4} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'503s':>6} {'errors':>6} {'/health p95 ms':>15}")
+    for cost in args.costs:
+        result = run(cost, args.threads, args.seconds, args.workers, args.queue_depth)
+        print(f"{result['cost']:>4} {result['logins_per_sec']:>9.1f} {result['login_p50_ms']:>8.1f} "
+              f"{result['login_p95_ms']:>8.1f} {result['rejected_503']:>6} {result['errors']:>6} "
+              f"{result['health_p95_ms']:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
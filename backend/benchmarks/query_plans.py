@@ -0,0 +1,188 @@
+"""
+Query Plan Check
+
+Replays the hot read paths (calendar, upcoming renewals, statistics,
+budget, subscription list, notification log) and the scheduler scans
+(overdue payments, cancellation reminders) against a seeded SQLite
+database, runs EXPLAIN QUERY PLAN on every statement they issue and
+exits non-zero if any of them falls back to a full scan of a hot table.
+
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --verbose
+"""
+import argparse
+import re
+import sys
+from datetime import date, timedelta
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from benchmarks.common import make_app
+
+# Tables that grow with users and must always be reached through an index
+HOT_TABLES = ('subscriptions', 'notification_log')
+
+# Endpoints whose queries are checked
+ENDPOINTS = [
+    '/api/v1/calendar',
+    '/api/v1/calendar/upcoming',
+    '/api/v1/calendar/year-view',
+    '/api/v1/statistics/overview',
+    '/api/v1/statistics/by-category',
+    '/api/v1/statistics/by-payment-method',
+    '/api/v1/statistics/upcoming-renewals',
+    '/api/v1/statistics/most-expensive',
+    '/api/v1/budget',
+    '/api/v1/budget/breakdown',
+    '/api/v1/budget/upcoming',
+    '/api/v1/subscriptions',
+    '/api/v1/notifications/log',
+    '/api/v1/notifications/log?channel=email'
+]
+
+# "SCAN subscriptions" without "USING [COVERING] INDEX" is a full table scan
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+
+class StatementRecorder:
+    """Collects every SQL statement executed while active"""
+
+    def __init__(self):
+        self.statements = []
+        self.active = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and not executemany and statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append((statement, parameters))
+
+
+def seed(app, subscriptions: int) -> dict:
+    """Create a user with subscriptions and notification history"""
+    from app import db
+    from app.models import Currency, NotificationLog, Subscription, User
+
+    client = app.test_client()
+    client.post('/api/v1/auth/register', json={
+        'username': 'plans',
+        'email': 'plans@example.com',
+        'password': 'PlansPassw0rd'
+    })
+    response = client.post('/api/v1/auth/login', json={
+        'username': 'plans',
+        'password': 'PlansPassw0rd'
+    })
+    headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    with app.app_context():
+        user = db.session.query(User).filter_by(username='plans').first()
+        currency = db.session.query(Currency).filter_by(user_id=user.id).first()
+        today = date.today()
+        for i in range(subscriptions):
+            db.session.add(Subscription(
+                user_id=user.id,
+                name=f'Service {i}',
+                price=5 + i % 20,
+                currency_id=currency.id,
+                cycle=1 + i % 4,
+                frequency=1,
+                next_payment=today + timedelta(days=i % 400 - 30),
+                cancellation_date=today + timedelta(days=7) if i % 10 == 0 else None,
+                inactive=i % 7 == 0
+            ))
+            db.session.add(NotificationLog(
+                user_id=user.id,
+                channel='email' if i % 2 else 'telegram',
+                notification_type='payment_reminder',
+                status='sent'
+            ))
+        db.session.commit()
+
+    return headers
+
+
+def run_scheduler_scans(app):
+    """Run the scheduler jobs that scan subscriptions across all users"""
+    from app.services.notification_scheduler import NotificationScheduler
+
+    scheduler = NotificationScheduler()
+    scheduler.app = app
+    scheduler.send_overdue_notifications()
+    scheduler.send_cancellation_reminders()
+
+
+def explain(app, statements: list) -> list:
+    """
+    Run EXPLAIN QUERY PLAN for each statement
+
+    Returns:
+        List of (statement, plan detail lines, full-scanned hot tables)
+    """
+    from app import db
+
+    results = []
+    seen = set()
+    with app.app_context():
+        connection = db.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            for statement, parameters in statements:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                cursor.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)
+                details = [row[3] for row in cursor.fetchall()]
+                scanned = []
+                for detail in details:
+                    match = FULL_SCAN.match(detail)
+                    if match and match.group(1) in HOT_TABLES:
+                        scanned.append(match.group(1))
+                results.append((statement, details, scanned))
+        finally:
+            connection.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fail if hot queries do full table scans')
+    parser.add_argument('--subscriptions', type=int, default=200)
+    parser.add_argument('--verbose', action='store_true', help='Print every plan')
+    args = parser.parse_args()
+
+    app = make_app()
+    headers = seed(app, args.subscriptions)
+
+    recorder = StatementRecorder()
+    event.listen(Engine, 'before_cursor_execute', recorder)
+    try:
+        recorder.active = True
+        client = app.test_client()
+        for endpoint in ENDPOINTS:
+            response = client.get(endpoint, headers=headers)
+            if response.status_code != 200:
+                print(f'GET {endpoint} returned {response.status_code}')
+                return 2
+        run_scheduler_scans(app)
+        recorder.active = False
+    finally:
+        event.remove(Engine, 'before_cursor_execute', recorder)
+
+    failures = 0
+    for statement, details, scanned in explain(app, recorder.statements):
+        if scanned or args.verbose:
+            print(' '.join(statement.split()))
+            for detail in details:
+                print(f'    {detail}')
+            print()
+        if scanned:
+            failures += 1
+
+    checked = len(set(statement for statement, _ in recorder.statements))
+    if failures:
+        print(f'❌ {failures} of {checked} queries do a full scan of {", ".join(HOT_TABLES)}')
+        return 1
+
+    print(f'✅ {checked} queries checked, no full scans of {", ".join(HOT_TABLES)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
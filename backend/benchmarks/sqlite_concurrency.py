@@ -0,0 +1,143 @@
+"""
+SQLite Concurrency Benchmark
+
+Runs dashboard readers (GET /statistics/overview) against writers doing
+per-row commits (like the scheduler) on a file-backed SQLite database,
+with and without the SQLite tuning profile (WAL, synchronous=NORMAL,
+busy_timeout, mmap, cache_size, temp_store) and the read/write split.
+
+    python -m benchmarks.sqlite_concurrency --readers 4 --writers 2 --seconds 5
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+from benchmarks.common import make_app, percentile
+
+
+def seed(app, subscriptions: int) -> dict:
+    """Create a user with subscriptions and return auth headers"""
+    from app import db
+    from app.models import Currency, Subscription, User
+
+    client = app.test_client()
+    client.post('/api/v1/auth/register', json={
+        'username': 'bench',
+        'email': 'bench@example.com',
+        'password': 'BenchPassw0rd'
+    })
+    response = client.post('/api/v1/auth/login', json={
+        'username': 'bench',
+        'password': 'BenchPassw0rd'
+    })
+    headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    with app.app_context():
+        user = db.session.query(User).filter_by(username='bench').first()
+        currency = db.session.query(Currency).filter_by(user_id=user.id).first()
+        today = date.today()
+        for i in range(subscriptions):
+            db.session.add(Subscription(
+                user_id=user.id,
+                name=f'Service {i}',
+                price=round(random.uniform(1, 50), 2),
+                currency_id=currency.id,
+                cycle=random.choice([1, 2, 3, 4]),
+                frequency=1,
+                next_payment=today + timedelta(days=random.randint(0, 365))
+            ))
+        db.session.commit()
+
+    return headers
+
+
+PROFILES = [
+    ('default', {'SQLITE_TUNING': False, 'SQLITE_READ_POOL_SIZE': 0}),
+    ('tuned', {'SQLITE_TUNING': True, 'SQLITE_READ_POOL_SIZE': 0}),
+    ('split', {'SQLITE_TUNING': True, 'SQLITE_READ_POOL_SIZE': 4})
+]
+
+
+def run(profile: str, overrides: dict, readers: int, writers: int, seconds: float,
+        subscriptions: int) -> dict:
+    """Run one benchmark round"""
+    from app import db
+    from app.models import Subscription
+
+    app = make_app(**overrides)
+    headers = seed(app, subscriptions)
+
+    with app.app_context():
+        journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+        ids = [row[0] for row in db.session.query(Subscription.id).all()]
+
+    counts = {'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+    read_latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = client.get('/api/v1/statistics/overview', headers=headers).status_code == 200
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    counts['reads'] += 1
+                    read_latencies.append(elapsed)
+                else:
+                    counts['read_errors'] += 1
+
+    def writer():
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                try:
+                    subscription = db.session.get(Subscription, random.choice(ids))
+                    subscription.next_payment = date.today() + timedelta(days=random.randint(0, 365))
+                    db.session.commit()
+                    key = 'writes'
+                except Exception:
+                    db.session.rollback()
+                    key = 'write_errors'
+                with lock:
+                    counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'profile': profile,
+        'journal_mode': journal_mode,
+        'reads_per_sec': counts['reads'] / seconds,
+        'writes_per_sec': counts['writes'] / seconds,
+        'read_p95_ms': percentile(read_latencies, 95) * 1000,
+        'errors': counts['read_errors'] + counts['write_errors']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SQLite read/write concurrency')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--subscriptions', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'profile':>8} {'journal':>8} {'reads/s':>8} {'writes/s':>9} {'read p95 ms':>12} {'errors':>7}")
+    for profile, overrides in PROFILES:
+        result = run(profile, overrides, args.readers, args.writers, args.seconds, args.subscriptions)
+        print(f"{result['profile']:>8} {result['journal_mode']:>8} {result['reads_per_sec']:>8.1f} "
+              f"{result['writes_per_sec']:>9.1f} {result['read_p95_ms']:>12.1f} {result['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Subscription Import Benchmark
+
+Generates a CSV export with N rows (spread over a few currencies,
+categories and payment methods, some of them new) and times
+POST /subscriptions/import. Exchange rates for the currencies are
+seeded first, so every row is expected to import; exits with status 1
+if any row fails.
+
+    python -m benchmarks.subscription_import --rows 10000
+"""
+import argparse
+import random
+import sys
+from datetime import date
+from benchmarks.common import make_app, Timer
+
+# Rates relative to USD for the non-USD currencies in the upload
+RATES = {'EUR': 0.92, 'GBP': 0.79, 'JPY': 150.0}
+
+
+def build_csv(rows: int) -> bytes:
+    """Build a CSV upload with the given number of rows"""
+    lines = ['name,price,currency,cycle,frequency,next_payment,category,payment_method,notes']
+    for i in range(rows):
+        lines.append(','.join([
+            f'Service {i}',
+            f'{random.uniform(1, 50):.2f}',
+            random.choice(['USD', *RATES]),
+            random.choice(['daily', 'weekly', 'monthly', 'yearly']),
+            str(random.randint(1, 3)),
+            f'2026-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}',
+            f'Category {i % 25}',
+            f'Card {i % 6}',
+            'Imported'
+        ]))
+    return '\n'.join(lines).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk subscription import')
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        from app.services.currency_converter import CurrencyConverter
+        CurrencyConverter.import_rate_history(
+            [(code, date.today(), rate) for code, rate in RATES.items()], source='benchmark'
+        )
+
+    client = app.test_client()
+    client.post('/api/v1/auth/register', json={
+        'username': 'bench',
+        'email': 'bench@example.com',
+        'password': 'BenchPassw0rd'
+    })
+    response = client.post('/api/v1/auth/login', json={
+        'username': 'bench',
+        'password': 'BenchPassw0rd'
+    })
+    headers = {
+        'Authorization': f"Bearer {response.get_json()['token']}",
+        'Content-Type': 'text/csv'
+    }
+
+    body = build_csv(args.rows)
+    with Timer() as timer:
+        response = client.post('/api/v1/subscriptions/import', headers=headers, data=body)
+
+    report = response.get_json()['data']
+    print(f"rows: {report['total_rows']}  imported: {report['imported']}  failed: {report['failed']}")
+    print(f"time: {timer.elapsed:.2f}s  ({report['total_rows'] / timer.elapsed:,.0f} rows/s)")
+
+    if report['failed']:
+        print(f"❌ {report['failed']} row(s) failed, first: {report['errors'][0]}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Test Fixtures
+"""
+import sys
+from pathlib import Path
+import pytest
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.common import make_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Testing app with a throwaway database and upload folder"""
+    app = make_app(UPLOAD_FOLDER=tmp_path / 'uploads')
+    yield app
+
+    from app.services.receipts import ocr_pool
+    ocr_pool.shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register and log in a user"""
+    credentials = {'username': 'testuser', 'password': 'TestPassw0rd'}
+    client.post('/api/v1/auth/register', json={**credentials, 'email': 'testuser@example.com'})
+    token = client.post('/api/v1/auth/login', json=credentials).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
@@ -0,0 +1,48 @@
+"""
+Spending Forecast Tests
+"""
+from datetime import date, datetime
+from app import db
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.insights.forecast import SpendingForecast
+
+TODAY = date(2026, 10, 19)
+
+
+def add_subscription(app, client, headers, next_payment: date, cycle: int = 3) -> int:
+    response = client.post('/api/v1/subscriptions/import', headers={**headers, 'Content-Type': 'text/csv'},
+                           data=f'name,price,currency,cycle,next_payment\nPlan,10,USD,{cycle},{next_payment}'.encode())
+    assert response.get_json()['data']['imported'] == 1
+
+    with app.app_context():
+        # Created well before TODAY, so every payment in the forecast counts
+        db.session.query(Subscription).update({'created_at': datetime(2025, 1, 1)})
+        db.session.commit()
+        return db.session.query(User.id).filter_by(username='testuser').scalar()
+
+
+def payments_by_month(app, user_id: int, months: int) -> dict:
+    with app.app_context():
+        result = SpendingForecast(today=TODAY).forecast(user_id, months)
+    return {month['month']: month['payments'] for month in result['months']}
+
+
+def test_no_payments_between_today_and_next_payment(app, client, auth_headers):
+    user_id = add_subscription(app, client, auth_headers, date(2027, 1, 31))
+
+    assert payments_by_month(app, user_id, 6) == {
+        '2026-10': 0, '2026-11': 0, '2026-12': 0, '2027-01': 1, '2027-02': 1, '2027-03': 1
+    }
+
+
+def test_payment_made_earlier_this_month_counts(app, client, auth_headers):
+    user_id = add_subscription(app, client, auth_headers, date(2026, 11, 5))
+
+    assert payments_by_month(app, user_id, 3) == {'2026-10': 1, '2026-11': 1, '2026-12': 1}
+
+
+def test_yearly_payment_later_this_month(app, client, auth_headers):
+    user_id = add_subscription(app, client, auth_headers, date(2026, 10, 25), cycle=4)
+
+    assert payments_by_month(app, user_id, 3) == {'2026-10': 1, '2026-11': 0, '2026-12': 0}
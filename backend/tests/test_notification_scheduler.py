@@ -0,0 +1,45 @@
+"""
+Notification Scheduler Tests
+"""
+import pytest
+from app import db
+from app.models.scheduler_job import SchedulerJob
+from app.services.currency_converter import CurrencyConverter
+from app.services.notification_scheduler import NotificationScheduler
+
+
+@pytest.fixture
+def scheduler(app):
+    """Scheduler bound to the app, without starting APScheduler"""
+    instance = NotificationScheduler()
+    instance.app = app
+    instance.node_id = 'test-node'
+    instance.rate_provider = object()
+    return instance
+
+
+def job_result(app, job_id: str) -> tuple:
+    with app.app_context():
+        job = db.session.get(SchedulerJob, job_id)
+        return job.last_status, job.last_error
+
+
+@pytest.mark.parametrize('updated, status, error', [
+    (True, 'success', None),
+    (False, 'failed', 'Failed to update currency exchange rates'),
+])
+def test_job_result_is_recorded(app, scheduler, monkeypatch, updated, status, error):
+    monkeypatch.setattr(CurrencyConverter, 'update_exchange_rates', staticmethod(lambda provider=None: updated))
+
+    scheduler.run_claimed('currency_updates', scheduler.update_currency_rates)
+
+    assert job_result(app, 'currency_updates') == (status, error)
+
+
+def test_job_exception_is_recorded(app, scheduler):
+    def broken():
+        raise ValueError('boom')
+
+    scheduler.run_claimed('broken_job', broken)
+
+    assert job_result(app, 'broken_job') == ('failed', 'boom')
@@ -0,0 +1,75 @@
+"""
+Receipt Storage Tests
+"""
+import io
+import os
+import sys
+import pytest
+from app import db
+from app.models.receipt import Receipt
+import app.services.receipts.ocr_pool  # noqa: F401 (the package re-exports the pool instance under this name)
+
+
+@pytest.fixture(autouse=True)
+def fake_ocr(monkeypatch):
+    """Skip Tesseract"""
+    monkeypatch.setattr(
+        sys.modules['app.services.receipts.ocr_pool'], 'run_ocr',
+        lambda path, extension, options: {'text': 'receipt', 'confidence': 0.9, 'provider': 'tesseract', 'pages': 1}
+    )
+
+
+def create_subscription(client, headers, name: str) -> int:
+    response = client.post('/api/v1/subscriptions/import', headers={**headers, 'Content-Type': 'text/csv'},
+                           data=f'name,price,currency,cycle\n{name},5,USD,3'.encode())
+    assert response.get_json()['data']['imported'] == 1
+    subscriptions = client.get('/api/v1/subscriptions', headers=headers).get_json()['data']
+    return next(subscription['id'] for subscription in subscriptions if subscription['name'] == name)
+
+
+def upload_receipt(client, headers, subscription_id: int, content: bytes) -> int:
+    response = client.post('/api/v1/ocr/upload', headers=headers, data={
+        'receipt': (io.BytesIO(content), 'receipt.png'),
+        'subscription_id': str(subscription_id)
+    })
+    assert response.status_code in (201, 202)
+    return response.get_json()['data']['id']
+
+
+def stored_receipt(app, receipt_id: int):
+    """(subscription_id, absolute file path) of a receipt"""
+    with app.app_context():
+        receipt = db.session.get(Receipt, receipt_id)
+        assert receipt is not None
+        return receipt.subscription_id, os.path.join(app.config['UPLOAD_FOLDER'], receipt.file_path)
+
+
+def test_deleting_subscription_keeps_receipt_and_file(app, client, auth_headers):
+    subscription_id = create_subscription(client, auth_headers, 'Netflix')
+    receipt_id = upload_receipt(client, auth_headers, subscription_id, b'netflix receipt')
+
+    response = client.delete(f'/api/v1/subscriptions/{subscription_id}', headers=auth_headers)
+    assert response.status_code == 200
+
+    subscription, path = stored_receipt(app, receipt_id)
+    assert subscription is None
+    assert os.path.exists(path)
+
+    receipt = client.get(f'/api/v1/ocr/receipts/{receipt_id}', headers=auth_headers)
+    assert receipt.status_code == 200
+
+
+def test_bulk_delete_keeps_receipts_and_files(app, client, auth_headers):
+    ids = [create_subscription(client, auth_headers, name) for name in ('Spotify', 'Hulu')]
+    receipt_ids = [upload_receipt(client, auth_headers, subscription_id, f'receipt {subscription_id}'.encode())
+                   for subscription_id in ids]
+
+    response = client.post('/api/v1/subscriptions/bulk-action', headers=auth_headers,
+                           json={'action': 'delete', 'ids': ids})
+    assert response.status_code == 200
+    assert response.get_json()['data']['affected'] == 2
+
+    for receipt_id in receipt_ids:
+        subscription, path = stored_receipt(app, receipt_id)
+        assert subscription is None
+        assert os.path.exists(path)
@@ -0,0 +1,33 @@
+"""
+Statistics Tests
+"""
+from datetime import datetime, timedelta
+from app import db
+from app.models.currency import Currency
+from app.models.user import User
+from app.services.currency_converter import CurrencyConverter
+
+
+def test_trends_use_each_months_exchange_rates(app, client, auth_headers):
+    today = datetime.now().date()
+    with app.app_context():
+        CurrencyConverter.import_rate_history([
+            ('EUR', today - timedelta(days=400), 0.5),
+            ('EUR', today - timedelta(days=20), 1.0),
+        ])
+
+    response = client.post('/api/v1/subscriptions/import', headers={**auth_headers, 'Content-Type': 'text/csv'},
+                           data=b'name,price,currency,cycle\nStreaming,10,EUR,3')
+    assert response.get_json()['data']['imported'] == 1
+
+    with app.app_context():
+        user = db.session.query(User).filter_by(username='testuser').one()
+        usd = db.session.query(Currency).filter_by(user_id=user.id, code='USD').one()
+        user.main_currency = usd.id
+        db.session.commit()
+
+    response = client.get('/api/v1/statistics/trends?months=2', headers=auth_headers)
+    assert response.status_code == 200
+
+    # 10 EUR at 0.5 EUR per USD last month, at 1.0 this month
+    assert [month['monthly_cost'] for month in response.get_json()['data']['data']] == [20.0, 10.0]
@@ -0,0 +1,44 @@
+"""
+Bulk Subscription Operation Tests
+"""
+import pytest
+
+
+@pytest.fixture
+def subscriptions(client, auth_headers):
+    """Import a few subscriptions, returns name -> ID"""
+    client.post('/api/v1/subscriptions/import', headers={**auth_headers, 'Content-Type': 'text/csv'},
+                data=b'name,price,currency,cycle\n100% Fun,5,USD,3\nA_B,5,USD,3\nAxB,5,USD,4')
+    data = client.get('/api/v1/subscriptions', headers=auth_headers).get_json()['data']
+    return {subscription['name']: subscription['id'] for subscription in data}
+
+
+def bulk_update(client, headers, filters: dict):
+    return client.patch('/api/v1/subscriptions/bulk', headers=headers,
+                        json={'filter': filters, 'fields': {'notes': 'bulk'}})
+
+
+@pytest.mark.parametrize('filters', [
+    {'category_id': [1]},
+    {'currency_id': {'id': 1}},
+    {'currency_id': 2 ** 70},
+    {'cycle': True},
+    {'cycle': [3]},
+    {'inactive': 'no'},
+    {'name_contains': ['a']},
+    {'next_payment_before': ['2026-01-01']},
+])
+def test_invalid_filter_values_are_rejected(client, auth_headers, subscriptions, filters):
+    response = bulk_update(client, auth_headers, filters)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('name_contains, expected', [
+    ('%', ['100% Fun']),
+    ('_', ['A_B']),
+    ('a_b', ['A_B']),
+])
+def test_name_contains_matches_wildcards_literally(client, auth_headers, subscriptions, name_contains, expected):
+    response = bulk_update(client, auth_headers, {'name_contains': name_contains})
+    assert response.status_code == 200
+    assert response.get_json()['data']['succeeded'] == [subscriptions[name] for name in expected]